@@ -0,0 +1,105 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Package check benchmark of KIAUH. It compares the subprocesses needed to
+check a set of system packages with the former one dpkg-query call per
+package against check_package_install(), which queries all of them at once.
+It fails if check_package_install() needs more than one process per check.
+Run it from the root of the repository on a dpkg based system with:
+
+    python -m benchmarks.bench_dpkg [--packages 40] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+from subprocess import DEVNULL, PIPE, run
+from typing import Callable, List, Set, Tuple
+
+# puts the application root on the path
+import kiauh  # noqa: F401
+
+# isort: split
+from utils.sys_utils import check_package_install
+
+from benchmarks.process_count import count_processes
+
+DEFAULT_PACKAGES = 40
+DEFAULT_ROUNDS = 5
+# packages which are not installed, or unknown to dpkg altogether
+MISSING_PACKAGES = {"kiauh-missing-a", "kiauh-missing-b", "kiauh-missing-c"}
+
+
+def installed_packages(count: int) -> Set[str]:
+    command = ["dpkg-query", "--show", "--showformat=${Package}\n"]
+    output = subprocess.check_output(command, text=True, stderr=DEVNULL)
+    return set(output.split()[:count])
+
+
+def legacy_check_package_install(packages: Set[str]) -> List[str]:
+    # the former implementation, one dpkg-query call per package
+    not_installed = []
+    for package in packages:
+        command = ["dpkg-query", "-f'${Status}'", "--show", package]
+        result = run(command, stdout=PIPE, stderr=DEVNULL, text=True)
+        if "installed" not in result.stdout.strip("'").split():
+            not_installed.append(package)
+    return not_installed
+
+
+def measure(
+    packages: Set[str], rounds: int, check: Callable[[Set[str]], List[str]]
+) -> Tuple[float, float]:
+    """
+    Check a set of packages a number of times
+    :param packages: Packages to check
+    :param rounds: Number of rounds
+    :param check: Function checking the packages
+    :return: Time in ms and processes per check
+    """
+    with count_processes() as count:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            check(packages)
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000 / rounds, count.processes / rounds
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--packages", type=int, default=DEFAULT_PACKAGES)
+    arg_parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    args = arg_parser.parse_args()
+
+    packages = installed_packages(args.packages) | MISSING_PACKAGES
+    # both approaches must report the same packages as missing
+    legacy = legacy_check_package_install(packages)
+    assert sorted(check_package_install(packages)) == sorted(legacy)
+
+    results = [
+        ("per-package", *measure(packages, args.rounds, legacy_check_package_install)),
+        ("single query", *measure(packages, args.rounds, check_package_install)),
+    ]
+
+    print(f"{len(packages)} packages, {len(legacy)} of them not installed\n")
+    print(f"{'':<16}{'ms/check':>10}{'processes/check':>17}")
+    for name, ms, processes in results:
+        print(f"{name:<16}{ms:>10.2f}{processes:>17.1f}")
+
+    if results[1][2] > 1:
+        print("\ncheck_package_install needs more than one process per check")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
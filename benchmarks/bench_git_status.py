@@ -0,0 +1,140 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Git status benchmark of KIAUH. It compares the subprocesses needed to read
+branch, origin and the described local and remote commit of a repository
+with the former per-field git helpers against get_repo_info(), which reads
+the .git directory from disk and describes both commits in one git call.
+It fails if get_repo_info() needs more than one process per repository.
+Run it from the root of the repository with:
+
+    python -m benchmarks.bench_git_status [--repos 4] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from subprocess import DEVNULL, check_output
+from typing import Callable, List, Tuple
+
+# puts the application root on the path
+import kiauh  # noqa: F401
+
+# isort: split
+from utils.git_utils import get_repo_info
+
+from benchmarks.process_count import count_processes
+
+DEFAULT_REPOS = 4
+DEFAULT_ROUNDS = 5
+
+
+def git(cwd: Path, *args: str) -> None:
+    identity = ["-c", "user.name=kiauh", "-c", "user.email=kiauh@localhost"]
+    subprocess.run(
+        ["git", *identity, *args], cwd=cwd, check=True, stdout=DEVNULL, stderr=DEVNULL
+    )
+
+
+def create_repos(root: Path, count: int) -> List[Path]:
+    """
+    Create repositories with a tag and an upstream branch on a local origin
+    :param root: Directory to create the repositories in
+    :param count: Number of repositories
+    :return: List of the cloned repositories
+    """
+    repos = []
+    for i in range(count):
+        origin = root.joinpath(f"origin-{i}.git")
+        repo = root.joinpath(f"repo-{i}")
+        git(root, "init", "-q", "--bare", "-b", "master", origin.as_posix())
+        git(root, "clone", "-q", origin.as_posix(), repo.as_posix())
+        git(repo, "commit", "-q", "--allow-empty", "-m", "initial")
+        git(repo, "tag", "v1.0.0")
+        git(repo, "commit", "-q", "--allow-empty", "-m", "second")
+        git(repo, "push", "-q", "origin", "master", "--tags")
+        repos.append(repo)
+    return repos
+
+
+def legacy_repo_status(repo: Path) -> Tuple[str, ...]:
+    # the former helpers, one git call (or shell pipeline) per field
+    def output(cmd: List[str] | str) -> str:
+        shell = isinstance(cmd, str)
+        return check_output(cmd, shell=shell, text=True, cwd=repo, stderr=DEVNULL)
+
+    branch = output(["git", "branch", "--show-current"]).strip()
+    # get_repo_name and get_repo_url both read the origin url
+    name = output(["git", "config", "--get", "remote.origin.url"]).strip()
+    url = output(["git", "config", "--get", "remote.origin.url"]).strip()
+    local = output("git describe HEAD --always --tags | cut -d '-' -f 1,2")
+    # get_remote_commit looked up the branch on its own
+    branch = output(["git", "branch", "--show-current"]).strip()
+    remote = output(
+        f"git describe 'origin/{branch}' --always --tags | cut -d '-' -f 1,2"
+    )
+    return branch, name, url, local.strip(), remote.strip()
+
+
+def measure(
+    repos: List[Path], rounds: int, probe: Callable[[Path], object]
+) -> Tuple[float, float, float]:
+    """
+    Probe every repository a number of times
+    :param repos: Repositories to probe
+    :param rounds: Number of rounds
+    :param probe: Function probing a single repository
+    :return: Time in ms, Popen calls and processes per repository
+    """
+    with count_processes() as count:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for repo in repos:
+                probe(repo)
+        elapsed = time.perf_counter() - start
+    probes = rounds * len(repos)
+    return elapsed * 1000 / probes, count.calls / probes, count.processes / probes
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--repos", type=int, default=DEFAULT_REPOS)
+    arg_parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repos = create_repos(Path(tmp), args.repos)
+        # both approaches must report the same state
+        info = get_repo_info(repos[0])
+        legacy = legacy_repo_status(repos[0])
+        assert (info.branch, info.local_commit) == (legacy[0], legacy[3])
+        assert info.remote_commit == legacy[4]
+
+        results = [
+            ("per-field helpers", *measure(repos, args.rounds, legacy_repo_status)),
+            ("get_repo_info", *measure(repos, args.rounds, get_repo_info)),
+        ]
+
+    print(f"{'':<20}{'ms/repo':>10}{'popen/repo':>12}{'processes/repo':>16}")
+    for name, ms, calls, processes in results:
+        print(f"{name:<20}{ms:>10.2f}{calls:>12.1f}{processes:>16.1f}")
+
+    if results[1][3] > 1:
+        print("\nget_repo_info needs more than one process per repository")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
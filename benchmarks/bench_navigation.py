@@ -0,0 +1,214 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Navigation benchmark of the KIAUH menu loop. It drives random keypresses
+through three cross-linked menus, including going back and failing options,
+and records the depth of the navigation stack, the call depth at input time
+and the RSS of the process. It fails if any of them grows with the number of
+keypresses. Run it from the root of the repository on Linux with:
+
+    python -m benchmarks.bench_navigation [--keys 100000] [--seed 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Dict, List, Type
+
+# puts the application root on the path
+import kiauh  # noqa: F401
+
+# isort: split
+from core.menus import FooterType, Option, base_menu
+from core.menus.base_menu import BaseMenu
+
+DEFAULT_KEYS = 100_000
+DEFAULT_SEED = 1
+RSS_SAMPLES = 50
+# max. growth of the peak RSS between the first and the second half of the run
+RSS_TOLERANCE_KIB = 4096
+# every menu holds some memory, so leaked menus show up in the RSS
+PAYLOAD_SIZE = 10_000
+
+
+class CountingSink(io.TextIOBase):
+    """Discards everything written to it, but counts the writes and failures"""
+
+    def __init__(self) -> None:
+        self.writes = 0
+        self.failures = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        self.failures += s.count("unexpected error")
+        return len(s)
+
+
+class BenchMenu(BaseMenu):
+    resumes = 0
+
+    def __init__(self, previous_menu: Type[BaseMenu] | None = None) -> None:
+        super().__init__()
+        self.previous_menu = previous_menu
+        self.payload = [0] * PAYLOAD_SIZE
+
+    def set_previous_menu(self, previous_menu: Type[BaseMenu] | None) -> None:
+        self.previous_menu = previous_menu
+
+    def on_resume(self) -> None:
+        BenchMenu.resumes += 1
+
+    def print_menu(self) -> None:
+        print(type(self).__name__)
+
+    def fail(self, **kwargs) -> None:
+        raise RuntimeError("failing option")
+
+
+class RootMenu(BenchMenu):
+    footer_type = FooterType.QUIT
+
+    def set_options(self) -> None:
+        self.options = {
+            "1": Option(method=lambda **kwargs: SubMenu(RootMenu).run()),
+            "2": Option(method=lambda **kwargs: LeafMenu(RootMenu).run()),
+        }
+
+
+class SubMenu(BenchMenu):
+    def set_options(self) -> None:
+        self.options = {
+            "1": Option(method=lambda **kwargs: LeafMenu(SubMenu).run()),
+            "2": Option(method=self.fail),
+        }
+
+
+class LeafMenu(BenchMenu):
+    def set_options(self) -> None:
+        self.options = {
+            "1": Option(method=lambda **kwargs: RootMenu().run()),
+            "2": Option(method=lambda **kwargs: SubMenu(LeafMenu).run()),
+        }
+
+
+# every menu is on the navigation stack at most once
+MAX_STACK_DEPTH = len(BenchMenu.__subclasses__())
+
+
+def get_rss() -> int:
+    # resident set size in KiB, the second field of statm is given in pages
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * 4
+
+
+def get_call_depth() -> int:
+    depth = 0
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+@dataclass
+class Navigation:
+    """Samples taken while navigating, see navigate()"""
+
+    keys: int = 0
+    stack_depths: List[int] = field(default_factory=list)
+    call_depths: List[int] = field(default_factory=list)
+    rss: List[int] = field(default_factory=list)
+    failures: int = 0
+    elapsed: float = 0.0
+
+
+def navigate(keys: int, seed: int = DEFAULT_SEED) -> Navigation:
+    """
+    Drive random keypresses through the bench menus, starting at the RootMenu
+    :param keys: Number of keypresses before quitting
+    :param seed: Seed of the random keypresses
+    :return: Depth of the navigation stack and call depth at every keypress,
+        the RSS sampled RSS_SAMPLES times and the number of failing options
+    """
+    rnd = random.Random(seed)
+    sample_every = max(keys // RSS_SAMPLES, 1)
+    navigation = Navigation()
+
+    def select(label: str, options: Dict[str, Option]) -> str:
+        if navigation.keys >= keys:
+            return "q"
+        if navigation.keys % sample_every == 0:
+            gc.collect()
+            navigation.rss.append(get_rss())
+        navigation.keys += 1
+        navigation.stack_depths.append(len(BaseMenu.navigation))
+        navigation.call_depths.append(get_call_depth())
+        return rnd.choice([key for key in options if key != "q"])
+
+    get_selection_input = base_menu.get_selection_input
+    base_menu.get_selection_input = select
+    sink = CountingSink()
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(sink):
+            RootMenu().run()
+    except SystemExit:
+        pass
+    finally:
+        base_menu.get_selection_input = get_selection_input
+    navigation.elapsed = time.perf_counter() - start
+    navigation.failures = sink.failures
+    return navigation
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--keys", type=int, default=DEFAULT_KEYS)
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = arg_parser.parse_args()
+
+    run = navigate(args.keys, args.seed)
+    keys, elapsed = run.keys, run.elapsed
+    stack_depths, call_depths, rss = run.stack_depths, run.call_depths, run.rss
+
+    print(f"{keys} keypresses in {elapsed:.1f}s, {elapsed * 1e6 / keys:.0f} µs each")
+    print(f"failing options: {run.failures}, resumed menus: {BenchMenu.resumes}")
+    print(f"navigation stack depth: {min(stack_depths)} - {max(stack_depths)}")
+    print(f"call depth at input:    {min(call_depths)} - {max(call_depths)}")
+    # the RSS of a single sample is noisy, so the peaks of both halves of the
+    # run are compared, the first sample is taken before the menus warmed up
+    half = len(rss) // 2
+    first, second = max(rss[1:half]), max(rss[half:])
+    print(f"peak RSS: {first} KiB in the first half, {second} KiB in the second")
+
+    failures = []
+    if max(stack_depths) > MAX_STACK_DEPTH:
+        failures.append("the navigation stack grows")
+    if min(call_depths) != max(call_depths):
+        failures.append("the call depth grows")
+    if second - first > RSS_TOLERANCE_KIB:
+        failures.append("the RSS grows")
+    for failure in failures:
+        print(f"\n{failure} with the number of keypresses")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
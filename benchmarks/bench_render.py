@@ -0,0 +1,137 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Render benchmark of the KIAUH menus. It draws a menu frame the way it was
+drawn before the ScreenRenderer, i.e. `clear -x` in a subprocess followed by
+the prints of the menu to a line buffered terminal, and compares it to a
+frame composed and written by the ScreenRenderer, and to an unchanged frame
+which is skipped. It fails if the renderer needs more than one write per
+frame. Run it from the root of the repository with:
+
+    python -m benchmarks.bench_render [--frames 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Callable, List, Tuple
+
+# puts the application root on the path
+import kiauh  # noqa: F401
+
+# isort: split
+from core.menus.base_menu import print_back_footer, print_header
+from core.menus.remove_menu import RemoveMenu
+from core.menus.renderer import ScreenRenderer
+
+DEFAULT_FRAMES = 200
+
+
+class CountingTerminal(io.RawIOBase):
+    """Discards everything written to it, but counts the writes and bytes"""
+
+    # part of the buffer protocol of TextIOWrapper
+    name = "<terminal>"
+
+    def __init__(self) -> None:
+        self.writes = 0
+        self.bytes = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.writes += 1
+        self.bytes += len(b)
+        return len(b)
+
+
+def open_terminal() -> Tuple[CountingTerminal, io.TextIOWrapper]:
+    # stdout of an interactive terminal is line buffered
+    raw = CountingTerminal()
+    return raw, io.TextIOWrapper(raw, encoding="utf-8", line_buffering=True)
+
+
+def measure(frames: int, render: Callable[[], None]) -> Tuple[float, float, float]:
+    """
+    Render a number of frames to a counting terminal
+    :param frames: Number of frames to render
+    :param render: Function rendering a single frame to stdout
+    :return: Time in ms, number of writes and number of bytes per frame
+    """
+    raw, terminal = open_terminal()
+    with redirect_stdout(terminal):
+        start = time.perf_counter()
+        for _ in range(frames):
+            render()
+        terminal.flush()
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000 / frames, raw.writes / frames, raw.bytes / frames
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    args = arg_parser.parse_args()
+
+    menu = RemoveMenu()
+
+    def draw(header: bool = True) -> None:
+        if header:
+            print_header()
+        menu.print_menu()
+        print_back_footer()
+
+    def legacy() -> None:
+        subprocess.call(
+            "clear -x",
+            shell=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        draw()
+
+    renderer = ScreenRenderer()
+    header = False
+
+    def changed() -> None:
+        # toggling the header changes every frame, so each one clears the screen
+        nonlocal header
+        header = not header
+        renderer.render(renderer.compose(lambda: draw(header)))
+
+    def unchanged() -> None:
+        renderer.render(renderer.compose(draw))
+
+    results: List[Tuple[str, float, float, float]] = [
+        ("clear -x + prints", *measure(args.frames, legacy)),
+        ("renderer", *measure(args.frames, changed)),
+        ("renderer, unchanged", *measure(args.frames, unchanged)),
+    ]
+
+    print(f"{'':<22}{'ms/frame':>10}{'writes/frame':>14}{'bytes/frame':>13}")
+    for name, ms, writes, size in results:
+        print(f"{name:<22}{ms:>10.3f}{writes:>14.1f}{size:>13.0f}")
+
+    if results[1][2] > 1 or results[2][2] > 1:
+        print("\nthe renderer needs more than one write per frame")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
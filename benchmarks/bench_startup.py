@@ -0,0 +1,141 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Startup benchmark of KIAUH based on the output of `python -X importtime`. It
+measures the time it takes to import everything needed to show the main menu
+and fails if a module is imported at startup which must only be imported on
+demand, or if the import time regressed by more than the threshold compared
+to the baseline. Run it from the root of the repository with:
+
+    python -m benchmarks.bench_startup [--rounds 5] [--threshold 0.25]
+                                       [--baseline FILE] [--update-baseline]
+
+Without an existing baseline, the result of the run becomes the baseline.
+Timings depend on the machine, so the baseline file is not versioned.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+ENTRY_MODULE = "kiauh.main"
+DEFAULT_ROUNDS = 5
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BASELINE = Path(__file__).parent.joinpath("startup_baseline.json")
+HISTORY_SIZE = 20
+TOP_MODULES = 10
+
+# modules only needed once a menu option or a message is selected or shown
+DEFERRED_MODULES = [
+    "babel",
+    "components.klipper.services",
+    "components.klipper_firmware",
+    "components.moonraker.services",
+    "core.menus.advanced_menu",
+    "core.menus.backup_menu",
+    "core.menus.install_menu",
+    "core.menus.remove_menu",
+    "core.menus.settings_menu",
+    "core.menus.update_menu",
+    "extensions.extensions_menu",
+    "kiauh.extensions",
+]
+
+
+def measure() -> Tuple[float, Dict[str, float]]:
+    """
+    Import the entry module in a fresh interpreter
+    :return: Total import time in ms and the cumulative time of every module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        columns = line.split("|")
+        if len(columns) != 3 or not columns[1].strip().isdigit():
+            continue
+        modules[columns[2].strip()] = int(columns[1]) / 1000
+    return modules[ENTRY_MODULE], modules
+
+
+def find_deferred(modules: Dict[str, float]) -> List[str]:
+    return [
+        name
+        for name in modules
+        for prefix in DEFERRED_MODULES
+        if name == prefix or name.startswith(f"{prefix}.")
+    ]
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    arg_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    arg_parser.add_argument("--update-baseline", action="store_true")
+    args = arg_parser.parse_args()
+
+    baseline: Dict[str, float] = {}
+    history: List[Dict[str, Any]] = []
+    if args.baseline.exists():
+        data = json.loads(args.baseline.read_text())
+        baseline, history = data["baseline"], data["history"]
+
+    # the first round writes the bytecode caches and is not counted
+    measure()
+    rounds = [measure() for _ in range(args.rounds)]
+    total, modules = min(rounds, key=lambda r: r[0])
+    results = {"import_ms": total, "modules": len(modules)}
+
+    print(f"imported {len(modules)} modules in {total:.1f} ms, slowest:")
+    own = [m for m in modules.items() if m[0] != ENTRY_MODULE]
+    for name, ms in sorted(own, key=lambda m: m[1], reverse=True)[:TOP_MODULES]:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    failures: List[str] = [
+        f"{name} is imported at startup" for name in find_deferred(modules)
+    ]
+    base = baseline.get("import_ms")
+    if base:
+        change = (total - base) / base
+        print(f"baseline: {base:.1f} ms, change: {change:+.0%}")
+        if change > args.threshold and not args.update_baseline:
+            failures.append(f"import time regressed by {change:+.0%}")
+
+    history = [*history, {"time": time.time(), "results": results}]
+    history = history[-HISTORY_SIZE:]
+    if args.update_baseline or not baseline:
+        baseline = results
+        print(f"\nbaseline updated: {args.baseline}")
+    data = {"baseline": baseline, "history": history}
+    args.baseline.write_text(json.dumps(data, indent=2))
+
+    if failures:
+        print(f"\n{len(failures)} startup regression(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
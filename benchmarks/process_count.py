@@ -0,0 +1,48 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+
+@dataclass
+class ProcessCount:
+    """
+    Number of subprocesses started while counting
+    :param calls: Number of Popen calls, e.g. by run() or check_output()
+    :param processes: Number of processes, a shell pipeline counts the shell
+        and every command of the pipeline
+    """
+
+    calls: int = 0
+    processes: int = 0
+
+
+@contextmanager
+def count_processes() -> Iterator[ProcessCount]:
+    """Count the subprocesses started while the context is active"""
+    count = ProcessCount()
+    popen_init = subprocess.Popen.__init__
+
+    def counting_init(self: subprocess.Popen, args: Any, *a: Any, **kw: Any) -> None:
+        count.calls += 1
+        if kw.get("shell") and isinstance(args, str):
+            count.processes += 2 + args.count("|")
+        else:
+            count.processes += 1
+        popen_init(self, args, *a, **kw)
+
+    subprocess.Popen.__init__ = counting_init  # type: ignore[method-assign]
+    try:
+        yield count
+    finally:
+        subprocess.Popen.__init__ = popen_init  # type: ignore[method-assign]
@@ -27,6 +27,7 @@ from components.crowsnest import (
 )
 from components.klipper.klipper import Klipper
 from core.backup_manager.backup_manager import BackupManager
+from core.decorators import invalidates_status
 from core.logger import DialogType, Logger
 from core.settings.kiauh_settings import KiauhSettings
 from core.types.component_status import ComponentStatus
@@ -46,6 +47,7 @@ from utils.sys_utils import (
 )
 
 
+@invalidates_status
 def install_crowsnest() -> None:
     # Step 1: Clone crowsnest repo
     git_clone_wrapper(CROWSNEST_REPO, CROWSNEST_DIR, "master")
@@ -116,6 +118,7 @@ def configure_multi_instance() -> None:
         Logger.print_error("Generating .config failed, installation aborted")
 
 
+@invalidates_status
 def update_crowsnest() -> None:
     try:
         cmd_sysctl_service(CROWSNEST_SERVICE_NAME, "stop")
@@ -156,6 +159,7 @@ def get_crowsnest_status() -> ComponentStatus:
     return get_install_status(CROWSNEST_DIR, files=files)
 
 
+@invalidates_status
 def remove_crowsnest() -> None:
     if not CROWSNEST_DIR.exists():
         Logger.print_info("Crowsnest does not seem to be installed! Skipping ...")
@@ -26,7 +26,7 @@ from components.klipper import (
 from core.constants import CURRENT_USER
 from core.instance_manager.base_instance import BaseInstance
 from core.logger import Logger
-from utils.fs_utils import create_folders, get_data_dir
+from utils.fs_utils import create_folders
 from utils.sys_utils import get_service_file_path
 
 
@@ -50,7 +50,7 @@ class Klipper:
         self.base.log_file_name = self.log_file_name
 
         self.service_file_path: Path = get_service_file_path(Klipper, self.suffix)
-        self.data_dir: Path = get_data_dir(Klipper, self.suffix)
+        self.data_dir: Path = self.base.data_dir
         self.cfg_file: Path = self.base.cfg_dir.joinpath(KLIPPER_CFG_NAME)
         self.env_file: Path = self.base.sysd_dir.joinpath(KLIPPER_ENV_FILE_NAME)
         self.serial: Path = self.base.comms_dir.joinpath(KLIPPER_SERIAL_NAME)
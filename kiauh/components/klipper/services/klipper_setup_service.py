@@ -40,6 +40,7 @@ from components.moonraker.services.moonraker_instance_service import (
 from components.webui_client.client_utils import (
     get_existing_clients,
 )
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import DialogType, Logger
 from core.services.message_service import Message, MessageService
@@ -101,6 +102,7 @@ class KlipperSetupService:
         self.misvc.load_instances()
         self.moonraker_list = self.misvc.get_all_instances()
 
+    @invalidates_status
     def install(self) -> None:
         self.__refresh_state()
 
@@ -145,6 +147,7 @@ class KlipperSetupService:
             Logger.print_error("Klipper installation failed!")
             return
 
+    @invalidates_status
     def update(self) -> None:
         Logger.print_dialog(
             DialogType.WARNING,
@@ -169,6 +172,7 @@ class KlipperSetupService:
         install_python_requirements(KLIPPER_ENV_DIR, KLIPPER_REQ_FILE)
         InstanceManager.start_all(self.klipper_list)
 
+    @invalidates_status
     def remove(
         self,
         remove_service: bool,
@@ -273,7 +277,7 @@ class KlipperSetupService:
         repo = self.settings.klipper.repositories
         # pull the first repo defined in kiauh.cfg or fallback to the official Klipper repo
         repo, branch = (repo[0].url, repo[0].branch) if repo else default_repo
-        git_clone_wrapper(repo, KLIPPER_DIR, branch)
+        git_clone_wrapper(repo, KLIPPER_DIR, branch, use_cache=True)
 
         try:
             install_klipper_packages()
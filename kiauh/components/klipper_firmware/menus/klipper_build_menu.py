@@ -11,7 +11,7 @@ from __future__ import annotations
 import textwrap
 from pathlib import Path
 from shutil import copyfile
-from typing import List, Set, Type
+from typing import Callable, List, Set, Type
 
 from components.klipper import KLIPPER_DIR, KLIPPER_KCONFIGS_DIR
 from components.klipper_firmware.firmware_utils import (
@@ -35,11 +35,16 @@ from utils.sys_utils import (
 # noinspection PyUnusedLocal
 # noinspection PyMethodMayBeStatic
 class KlipperKConfigMenu(BaseMenu):
-    def __init__(self, previous_menu: Type[BaseMenu] | None = None):
+    def __init__(
+        self,
+        previous_menu: Type[BaseMenu] | None = None,
+        next_menu: Callable[[], BaseMenu] | None = None,
+    ):
         super().__init__()
         self.title = "Firmware Config Menu"
         self.title_color = Color.CYAN
         self.previous_menu: Type[BaseMenu] | None = previous_menu
+        self.next_menu: Callable[[], BaseMenu] | None = next_menu
         self.flash_options = FlashOptions()
         self.kconfigs_dirname = KLIPPER_KCONFIGS_DIR
         self.kconfig_default = KLIPPER_DIR.joinpath(".config")
@@ -53,6 +58,7 @@ class KlipperKConfigMenu(BaseMenu):
             super().run()
         else:
             self.flash_options.selected_kconfig = self.kconfig
+            self.goto_next_menu()
 
     def set_previous_menu(self, previous_menu: Type[BaseMenu] | None) -> None:
         from core.menus.advanced_menu import AdvancedMenu
@@ -120,6 +126,13 @@ class KlipperKConfigMenu(BaseMenu):
         if not Path(selection).is_file() and selection != self.kconfig_default:
             raise Exception("opt_data does not exists")
         self.kconfig = selection
+        self.flash_options.selected_kconfig = selection
+        self.navigation.close(self)
+        self.goto_next_menu()
+
+    def goto_next_menu(self) -> None:
+        if self.next_menu is not None:
+            self.next_menu().run()
 
 
 # noinspection PyUnusedLocal
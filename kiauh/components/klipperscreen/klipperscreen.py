@@ -27,6 +27,7 @@ from components.klipperscreen import (
 from components.moonraker.moonraker import Moonraker
 from core.backup_manager.backup_manager import BackupManager
 from core.constants import SYSTEMD
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import DialogType, Logger
 from core.settings.kiauh_settings import KiauhSettings
@@ -51,6 +52,7 @@ from utils.sys_utils import (
 )
 
 
+@invalidates_status
 def install_klipperscreen() -> None:
     Logger.print_status("Installing KlipperScreen ...")
 
@@ -112,6 +114,7 @@ def patch_klipperscreen_update_manager(instances: List[Moonraker]) -> None:
     )
 
 
+@invalidates_status
 def update_klipperscreen() -> None:
     if not KLIPPERSCREEN_DIR.exists():
         Logger.print_info("KlipperScreen does not seem to be installed! Skipping ...")
@@ -146,6 +149,7 @@ def get_klipperscreen_status() -> ComponentStatus:
     )
 
 
+@invalidates_status
 def remove_klipperscreen() -> None:
     Logger.print_status("Removing KlipperScreen ...")
     try:
@@ -140,7 +140,7 @@ class Moonraker:
             return None
 
         scp = SimpleConfigParser()
-        scp.read_file(self.cfg_file)
+        scp.read_file(self.cfg_file, lazy=True)
         port: int | None = scp.getint("server", "port", fallback=None)
 
         return port
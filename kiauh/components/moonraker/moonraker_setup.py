@@ -184,7 +184,7 @@ def setup_moonraker_prerequesites() -> None:
     repo = settings.moonraker.repo_url
     branch = settings.moonraker.branch
 
-    git_clone_wrapper(repo, MOONRAKER_DIR, branch)
+    git_clone_wrapper(repo, MOONRAKER_DIR, branch, use_cache=True)
 
     # install moonraker dependencies and create python virtualenv
     install_moonraker_packages()
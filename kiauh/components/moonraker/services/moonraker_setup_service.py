@@ -43,6 +43,7 @@ from components.webui_client.client_utils import (
     get_existing_clients,
 )
 from components.webui_client.mainsail_data import MainsailData
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import DialogType, Logger
 from core.services.message_service import Message, MessageService
@@ -111,6 +112,7 @@ class MoonrakerSetupService:
         self.misvc.load_instances()
         self.moonraker_list = self.misvc.get_all_instances()
 
+    @invalidates_status
     def install(self) -> None:
         self.__refresh_state()
 
@@ -162,6 +164,7 @@ class MoonrakerSetupService:
             Logger.print_error(f"Error while installing Moonraker: {e}")
             return
 
+    @invalidates_status
     def update(self) -> None:
         Logger.print_dialog(
             DialogType.WARNING,
@@ -186,6 +189,7 @@ class MoonrakerSetupService:
         install_python_requirements(MOONRAKER_ENV_DIR, MOONRAKER_REQ_FILE)
         InstanceManager.start_all(self.moonraker_list)
 
+    @invalidates_status
     def remove(
         self,
         remove_service: bool,
@@ -311,7 +315,7 @@ class MoonrakerSetupService:
         repo = self.settings.moonraker.repositories
         # pull the first repo defined in kiauh.cfg or fallback to the official Moonraker repo
         repo, branch = (repo[0].url, repo[0].branch) if repo else default_repo
-        git_clone_wrapper(repo, MOONRAKER_DIR, branch)
+        git_clone_wrapper(repo, MOONRAKER_DIR, branch, use_cache=True)
 
         try:
             install_moonraker_packages()
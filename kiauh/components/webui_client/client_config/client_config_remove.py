@@ -13,6 +13,7 @@ from typing import List
 from components.klipper.klipper import Klipper
 from components.moonraker.moonraker import Moonraker
 from components.webui_client.base_data import BaseWebClientConfig
+from core.decorators import invalidates_status
 from core.logger import Logger
 from core.services.message_service import Message
 from core.types.color import Color
@@ -22,6 +23,7 @@ from utils.instance_type import InstanceType
 from utils.instance_utils import get_instances
 
 
+@invalidates_status
 def run_client_config_removal(
     client_config: BaseWebClientConfig,
     kl_instances: List[Klipper],
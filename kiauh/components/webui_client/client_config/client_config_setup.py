@@ -23,6 +23,7 @@ from components.webui_client.client_utils import (
     backup_client_config_data,
     detect_client_cfg_conflict,
 )
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import Logger
 from core.settings.kiauh_settings import KiauhSettings
@@ -34,6 +35,7 @@ from utils.input_utils import get_confirm
 from utils.instance_utils import get_instances
 
 
+@invalidates_status
 def install_client_config(client_data: BaseWebClient, cfg_backup=True) -> None:
     client_config: BaseWebClientConfig = client_data.client_config
     display_name = client_config.display_name
@@ -91,6 +93,7 @@ def download_client_config(client_config: BaseWebClientConfig) -> None:
         raise
 
 
+@invalidates_status
 def update_client_config(client: BaseWebClient) -> None:
     client_config: BaseWebClientConfig = client.client_config
 
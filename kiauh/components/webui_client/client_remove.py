@@ -18,6 +18,7 @@ from components.webui_client.client_config.client_config_remove import (
 )
 from core.backup_manager.backup_manager import BackupManager
 from core.constants import NGINX_SITES_AVAILABLE, NGINX_SITES_ENABLED
+from core.decorators import invalidates_status
 from core.logger import Logger
 from core.services.message_service import Message
 from core.types.color import Color
@@ -29,6 +30,7 @@ from utils.fs_utils import (
 from utils.instance_utils import get_instances
 
 
+@invalidates_status
 def run_client_removal(
     client: BaseWebClient,
     remove_client: bool,
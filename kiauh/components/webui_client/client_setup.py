@@ -8,7 +8,6 @@
 # ======================================================================= #
 import shutil
 import tempfile
-from pathlib import Path
 from typing import List
 
 from components.klipper.klipper import Klipper
@@ -33,24 +32,27 @@ from components.webui_client.client_utils import (
     detect_client_cfg_conflict,
     enable_mainsail_remotemode,
     get_client_port_selection,
+    get_release_asset,
     symlink_webui_nginx_log,
 )
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import DialogType, Logger
 from core.settings.kiauh_settings import KiauhSettings
 from core.types.color import Color
 from utils.common import backup_printer_config_dir, check_install_dependencies
 from utils.config_utils import add_config_section
-from utils.fs_utils import unzip
+from utils.fs_utils import unzip_update
 from utils.input_utils import get_confirm
 from utils.instance_utils import get_instances
 from utils.sys_utils import (
     cmd_sysctl_service,
-    download_file,
+    download_to_buffer,
     get_ipv4_addr,
 )
 
 
+@invalidates_status
 def install_client(
     client: BaseWebClient,
     settings: KiauhSettings,
@@ -150,25 +152,27 @@ def install_client(
 
 
 def download_client(client: BaseWebClient) -> None:
-    zipfile = f"{client.name.lower()}.zip"
-    target = Path().home().joinpath(zipfile)
+    # the release asset provides the size and checksum to verify the download
+    asset = get_release_asset(client) or {}
+    url = asset.get("browser_download_url", client.download_url)
+    # GitHub reports digests as '<algorithm>:<hex digest>'
+    digest: str = asset.get("digest") or ""
+    sha256 = digest.split(":", 1)[1] if digest.startswith("sha256:") else None
     try:
-        Logger.print_status(
-            f"Downloading {client.display_name} from {client.download_url} ..."
-        )
-        download_file(client.download_url, target, True)
-        Logger.print_ok("Download complete!")
+        Logger.print_status(f"Downloading {client.display_name} from {url} ...")
+        with download_to_buffer(url, asset.get("size"), sha256, True) as archive:
+            Logger.print_ok("Download complete!")
 
-        Logger.print_status(f"Extracting {zipfile} ...")
-        unzip(target, client.client_dir)
-        target.unlink(missing_ok=True)
-        Logger.print_ok("OK!")
+            Logger.print_status(f"Extracting {client.name}.zip ...")
+            written, removed = unzip_update(archive, client.client_dir)
+        Logger.print_ok(f"OK! {written} files written, {removed} files removed.")
 
     except Exception:
         Logger.print_error(f"Downloading {client.display_name} failed!")
         raise
 
 
+@invalidates_status
 def update_client(client: BaseWebClient) -> None:
     Logger.print_status(f"Updating {client.display_name} ...")
     if not client.client_dir.exists():
@@ -13,7 +13,7 @@ import re
 import shutil
 from pathlib import Path
 from subprocess import PIPE, CalledProcessError, run
-from typing import List, get_args
+from typing import Any, Dict, List, get_args
 
 from components.klipper.klipper import Klipper
 from components.webui_client import MODULE_PATH
@@ -31,13 +31,13 @@ from core.constants import (
     NGINX_SITES_ENABLED,
 )
 from core.logger import Logger
+from core.services.github_api import GitHubApiClient, GitHubApiError
+from core.services.status_cache import StatusCache
 from core.settings.kiauh_settings import KiauhSettings, WebUiSettings
-from core.submodules.simple_config_parser.src.simple_config_parser.simple_config_parser import (
-    SimpleConfigParser,
-)
 from core.types.color import Color
 from core.types.component_status import ComponentStatus
 from utils.common import get_install_status
+from utils.config_includes import MergedConfig
 from utils.fs_utils import create_symlink, remove_file
 from utils.git_utils import (
     get_latest_remote_tag,
@@ -55,6 +55,24 @@ def get_client_status(
         NGINX_CONFD.joinpath("upstreams.conf"),
         NGINX_CONFD.joinpath("common_vars.conf"),
     ]
+    paths = [
+        client.client_dir,
+        client.client_dir.joinpath("release_info.json"),
+        client.client_dir.joinpath(".version"),
+        *files,
+    ]
+    comp_status: ComponentStatus = StatusCache().get_or_compute(
+        f"client_status:{client.name}",
+        paths,
+        lambda: _get_local_client_status(client, files),
+    )
+    comp_status.remote = get_remote_client_version(client) if fetch_remote else None
+    return comp_status
+
+
+def _get_local_client_status(
+    client: BaseWebClient, files: List[Path]
+) -> ComponentStatus:
     comp_status: ComponentStatus = get_install_status(client.client_dir, files=files)
 
     # if the client dir does not exist, set the status to not
@@ -63,7 +81,6 @@ def get_client_status(
         comp_status.status = 0
 
     comp_status.local = get_local_client_version(client)
-    comp_status.remote = get_remote_client_version(client) if fetch_remote else None
     return comp_status
 
 
@@ -87,10 +104,10 @@ def get_current_client_config() -> str:
     mainsail_includes, fluidd_includes = [], []
     klipper_instances: List[Klipper] = get_instances(Klipper)
     for instance in klipper_instances:
-        scp = SimpleConfigParser()
-        scp.read_file(instance.cfg_file)
-        includes_mainsail = scp.has_section(mainsail.client_config.config_section)
-        includes_fluidd = scp.has_section(fluidd.client_config.config_section)
+        # the include might as well be part of a file included by printer.cfg
+        merged = MergedConfig(instance.cfg_file)
+        includes_mainsail = merged.has_section(mainsail.client_config.config_section)
+        includes_fluidd = merged.has_section(fluidd.client_config.config_section)
 
         if includes_mainsail:
             mainsail_includes.append(instance)
@@ -244,6 +261,37 @@ def get_download_url(base_url: str, client: BaseWebClient) -> str:
         return stable_url
 
 
+def get_release_asset(client: BaseWebClient) -> Dict[str, Any] | None:
+    """
+    Get the GitHub release asset matching the download url of a client. It
+    provides the size and the SHA-256 digest to verify the download with.
+    :param client: The client to get the release asset for
+    :return: The asset as returned by the GitHub API or None if unavailable
+    """
+    url = client.download_url or ""
+    match = re.search(r"/download/([^/]+)/[^/]+$", url)
+    if match is None:
+        return None
+
+    if url.endswith(f"/latest/download/{client.name}.zip"):
+        path = f"/repos/{client.repo_path}/releases/latest"
+    else:
+        path = f"/repos/{client.repo_path}/releases/tags/{match.group(1)}"
+
+    try:
+        release = GitHubApiClient().get_json(path)
+    except GitHubApiError:
+        return None
+
+    assets: List[Dict[str, Any]] = []
+    if isinstance(release, dict):
+        assets = release.get("assets", [])
+    for asset in assets:
+        if asset.get("name") == f"{client.name}.zip":
+            return asset
+    return None
+
+
 #################################################
 ## NGINX RELATED FUNCTIONS
 #################################################
@@ -24,6 +24,7 @@ CURRENT_USER = pwd.getpwuid(os.getuid())[0]
 
 # dirs
 SYSTEMD = Path("/etc/systemd/system")
+KIAUH_CACHE_DIR = Path.home().joinpath(".kiauh")
 PRINTER_DATA_BACKUP_DIR = BACKUP_ROOT_DIR.joinpath("printer-data-backups")
 NGINX_SITES_AVAILABLE = Path("/etc/nginx/sites-available")
 NGINX_SITES_ENABLED = Path("/etc/nginx/sites-enabled")
@@ -8,9 +8,13 @@
 # ======================================================================= #
 from __future__ import annotations
 
+import functools
 import warnings
 from typing import Callable
 
+from core.services.status_cache import StatusCache
+from core.services.status_refresher import StatusRefresher
+
 
 def deprecated(info: str = "", replaced_by: Callable | None = None) -> Callable:
     def decorator(func) -> Callable:
@@ -22,3 +26,23 @@ def deprecated(info: str = "", replaced_by: Callable | None = None) -> Callable:
         return wrapper
 
     return decorator
+
+
+def invalidates_status(func: Callable) -> Callable:
+    """
+    Marks a routine which installs, updates or removes components. No status
+    probes are started while the routine runs. Cached component status data
+    is invalidated and refreshed once the routine returns or fails.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        refresher = StatusRefresher()
+        with refresher.paused():
+            try:
+                return func(*args, **kwargs)
+            finally:
+                StatusCache().invalidate()
+                refresher.refresh()
+
+    return wrapper
@@ -14,7 +14,12 @@ from typing import List
 
 from core.logger import Logger
 from utils.instance_type import InstanceType
-from utils.sys_utils import cmd_sysctl_service
+from utils.sys_utils import (
+    SysCtlBatchAction,
+    SysCtlResult,
+    cmd_sysctl_service,
+    cmd_sysctl_services,
+)
 
 
 class InstanceManager:
@@ -64,19 +69,46 @@ class InstanceManager:
             raise
 
     @staticmethod
-    def start_all(instances: List[InstanceType]) -> None:
-        for instance in instances:
-            InstanceManager.start(instance)
+    def start_all(
+        instances: List[InstanceType], no_block: bool = False
+    ) -> List[SysCtlResult]:
+        return InstanceManager.__run_all(instances, "start", no_block)
 
     @staticmethod
-    def stop_all(instances: List[InstanceType]) -> None:
-        for instance in instances:
-            InstanceManager.stop(instance)
+    def stop_all(
+        instances: List[InstanceType], no_block: bool = False
+    ) -> List[SysCtlResult]:
+        return InstanceManager.__run_all(instances, "stop", no_block)
 
     @staticmethod
-    def restart_all(instances: List[InstanceType]) -> None:
-        for instance in instances:
-            InstanceManager.restart(instance)
+    def restart_all(
+        instances: List[InstanceType], no_block: bool = False
+    ) -> List[SysCtlResult]:
+        return InstanceManager.__run_all(instances, "restart", no_block)
+
+    @staticmethod
+    def __run_all(
+        instances: List[InstanceType], action: SysCtlBatchAction, no_block: bool
+    ) -> List[SysCtlResult]:
+        """
+        Run an action for all instances with a single systemctl call. Unlike
+        the single instance methods, it doesn't stop at the first failing
+        instance, every instance receives the action. The errors of the
+        failed ones are printed by cmd_sysctl_services.
+        :param instances: The instances to run the action for
+        :param action: Either "start", "stop" or "restart"
+        :param no_block: Whether to enqueue the jobs and wait for the instances
+            to reach their target state, see cmd_sysctl_services
+        :return: List of the results of all instances
+        :raises CalledProcessError: If the action failed for any instance
+        """
+        names = [instance.service_file_path.name for instance in instances]
+        results: List[SysCtlResult] = cmd_sysctl_services(names, action, no_block)
+        failed = [r for r in results if not r.success]
+        if failed:
+            cmd = ["systemctl", action, *[r.unit for r in failed]]
+            raise CalledProcessError(1, cmd, stderr=failed[0].error)
+        return results
 
     @staticmethod
     def remove(instance: InstanceType) -> None:
@@ -9,8 +9,10 @@
 from __future__ import annotations
 
 import textwrap
+import threading
+from contextlib import contextmanager
 from enum import Enum
-from typing import List
+from typing import Iterator, List
 
 from core.types.color import Color
 
@@ -33,8 +35,31 @@ BORDER_TITLE: str = "┠──────────────────
 BORDER_LEFT: str = "┃"
 BORDER_RIGHT: str = "┃"
 
+# marks threads whose messages are discarded, see Logger.silenced()
+_silenced = threading.local()
+
 
 class Logger:
+    @staticmethod
+    @contextmanager
+    def silenced() -> Iterator[None]:
+        """
+        Discard all messages of the current thread while the context is active,
+        e.g. of status probes running in the background while a menu is shown.
+        Messages of other threads are printed as usual.
+        """
+        previous = Logger.is_silenced()
+        _silenced.active = True
+        try:
+            yield
+        finally:
+            _silenced.active = previous
+
+    @staticmethod
+    def is_silenced() -> bool:
+        active: bool = getattr(_silenced, "active", False)
+        return active
+
     @staticmethod
     def print_info(msg, prefix=True, start="", end="\n") -> None:
         message = f"[INFO] {msg}" if prefix else msg
@@ -62,6 +87,8 @@ class Logger:
 
     @staticmethod
     def __print(color: Color, start: str, message: str, end: str) -> None:
+        if Logger.is_silenced():
+            return
         print(Color.apply(f"{start}{message}", color), end=end)
 
     @staticmethod
@@ -88,6 +115,9 @@ class Logger:
         :param margin_top: The number of empty lines to print before the dialog.
         :param margin_bottom: The number of empty lines to print after the dialog.
         """
+        if Logger.is_silenced():
+            return
+
         color = Logger._get_dialog_color(title, custom_color)
         dialog_title = Logger._get_dialog_title(title, custom_title)
 
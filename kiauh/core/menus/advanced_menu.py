@@ -81,17 +81,22 @@ class AdvancedMenu(BaseMenu):
         rollback_repository(MOONRAKER_DIR, Moonraker)
 
     def build(self, **kwargs) -> None:
-        KlipperKConfigMenu().run()
-        KlipperBuildFirmwareMenu(previous_menu=self.__class__).run()
+        KlipperKConfigMenu(
+            next_menu=lambda: KlipperBuildFirmwareMenu(previous_menu=self.__class__)
+        ).run()
 
     def flash(self, **kwargs) -> None:
-        KlipperKConfigMenu().run()
-        KlipperFlashMethodMenu(previous_menu=self.__class__).run()
+        KlipperKConfigMenu(
+            next_menu=lambda: KlipperFlashMethodMenu(previous_menu=self.__class__)
+        ).run()
 
     def build_flash(self, **kwargs) -> None:
-        KlipperKConfigMenu().run()
-        KlipperBuildFirmwareMenu(previous_menu=KlipperFlashMethodMenu).run()
-        KlipperFlashMethodMenu(previous_menu=self.__class__).run()
+        # the flash menu is opened as soon as the build finished
+        KlipperKConfigMenu(
+            next_menu=lambda: KlipperBuildFirmwareMenu(
+                previous_menu=KlipperFlashMethodMenu
+            )
+        ).run()
 
     def get_id(self, **kwargs) -> None:
         KlipperSelectMcuConnectionMenu(
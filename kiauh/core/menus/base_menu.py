@@ -9,7 +9,6 @@
 
 from __future__ import annotations
 
-import subprocess
 import sys
 import textwrap
 import traceback
@@ -19,6 +18,8 @@ from typing import Dict, Type
 
 from core.logger import Logger
 from core.menus import FooterType, Option
+from core.menus.navigation import NavigationStack
+from core.menus.renderer import CLEAR_SCREEN, ScreenRenderer
 from core.services.message_service import MessageService
 from core.spinner import Spinner
 from core.types.color import Color
@@ -26,7 +27,8 @@ from utils.input_utils import get_selection_input
 
 
 def clear() -> None:
-    subprocess.call("clear -x", shell=True)
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
 
 
 def print_header() -> None:
@@ -123,8 +125,12 @@ class BaseMenu(metaclass=PostInitCaller):
     previous_menu: Type[BaseMenu] | None = None
     help_menu: Type[BaseMenu] | None = None
     footer_type: FooterType = FooterType.BACK
+    # whether the menu was displayed, i.e. a later display resumes it
+    __displayed: bool = False
 
     message_service = MessageService()
+    navigation = NavigationStack()
+    renderer = ScreenRenderer()
 
     def __init__(self, **kwargs) -> None:
         if type(self) is BaseMenu:
@@ -149,7 +155,10 @@ class BaseMenu(metaclass=PostInitCaller):
     def __go_back(self, **kwargs) -> None:
         if self.previous_menu is None:
             return
-        self.previous_menu().run()
+        # return to the open instance of the previous menu if there is one
+        if not self.navigation.go_back_to(self.previous_menu):
+            self.navigation.close(self)
+            self.previous_menu().run()
 
     def __go_to_help(self, **kwargs) -> None:
         if self.help_menu is None:
@@ -172,6 +181,14 @@ class BaseMenu(metaclass=PostInitCaller):
     def print_menu(self) -> None:
         raise NotImplementedError
 
+    def on_resume(self) -> None:
+        """
+        Called before the menu is displayed again, after all menus opened
+        from it were closed. Menus which load their state on construction
+        must reload it here, as it might have been changed by those menus.
+        """
+        pass
+
     def is_loading(self, state: bool) -> None:
         if not self.spinner and state:
             self.spinner = Spinner(self.loading_msg)
@@ -210,6 +227,10 @@ class BaseMenu(metaclass=PostInitCaller):
             raise NotImplementedError("FooterType not correctly implemented!")
 
     def __display_menu(self) -> None:
+        self.__displayed = True
+        self.renderer.render(self.renderer.compose(self.__draw_menu))
+
+    def __draw_menu(self) -> None:
         self.message_service.display_message()
 
         if self.header:
@@ -220,20 +241,50 @@ class BaseMenu(metaclass=PostInitCaller):
         self.__print_footer()
 
     def run(self) -> None:
-        """Start the menu lifecycle. When this function returns, the lifecycle of the menu ends."""
-        try:
-            self.__display_menu()
-            option = get_selection_input(self.input_label_txt, self.options)
-            selected_option: Option = self.options.get(option)
-
-            selected_option.method(
-                opt_index=selected_option.opt_index,
-                opt_data=selected_option.opt_data,
-            )
+        """
+        Open the menu. If another menu is already running, the menu is put on top
+        of the navigation stack and shown as soon as the current option returned.
+        Otherwise, this call runs the menu loop until all menus are closed.
+        """
+        self.navigation.open(self)
+        if self.navigation.active:
+            return
 
-            self.run()
+        self.navigation.active = True
+        try:
+            current: BaseMenu | None = None
+            while self.navigation.top is not None:
+                menu = self.navigation.top
+                # a menu shown before is back on top once the menus above closed
+                resumed = menu is not current and menu.__displayed
+                current = menu
+                self.__run_menu(menu, resumed)
+        finally:
+            self.navigation.active = False
+            self.navigation.clear()
+
+    def __run_menu(self, menu: BaseMenu, resumed: bool) -> None:
+        try:
+            if resumed:
+                menu.on_resume()
+            menu.__display_menu()
+            # the menu may have opened another menu while being displayed
+            if self.navigation.top is not menu:
+                return
+            with self.renderer.track_output():
+                option = get_selection_input(menu.input_label_txt, menu.options)
+                selected_option: Option = menu.options.get(option)
+
+                selected_option.method(
+                    opt_index=selected_option.opt_index,
+                    opt_data=selected_option.opt_data,
+                )
 
         except Exception as e:
+            # the error must stay on the screen below the next frame
+            self.renderer.invalidate()
             Logger.print_error(
                 f"An unexpected error occured:\n{e}\n{traceback.format_exc()}"
             )
+            # an error ends the lifecycle of the menu it occurred in
+            self.navigation.close(menu)
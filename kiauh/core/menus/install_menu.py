@@ -22,10 +22,16 @@ from components.webui_client.client_setup import install_client
 from components.webui_client.fluidd_data import FluiddData
 from components.webui_client.mainsail_data import MainsailData
 from components.webui_client.menus.client_install_menu import ClientInstallMenu
+from core.logger import Logger
 from core.menus import Option
 from core.menus.base_menu import BaseMenu
 from core.settings.kiauh_settings import KiauhSettings
 from core.types.color import Color
+from procedures.install_planner import run_install_plan
+from translate.i18n import _
+from utils.input_utils import get_string_input
+
+INSTALL_STEP_KEYS = ("1", "2", "3", "4", "5", "6", "7", "8")
 
 
 # noinspection PyUnusedLocal
@@ -54,6 +60,7 @@ class InstallMenu(BaseMenu):
             "6": Option(method=self.install_fluidd_config),
             "7": Option(method=self.install_klipperscreen),
             "8": Option(method=self.install_crowsnest),
+            "a": Option(method=self.install_multiple),
         }
 
     def print_menu(self) -> None:
@@ -66,8 +73,8 @@ class InstallMenu(BaseMenu):
             ║                           │ Webcam Streamer:          ║
             ║ Webinterface:             │  8) [Crowsnest]           ║
             ║  3) [Mainsail]            │                           ║
-            ║  4) [Fluidd]              │                           ║
-            ║                           │                           ║
+            ║  4) [Fluidd]              │ Multiple Components:      ║
+            ║                           │  a) [Select multiple]     ║
             ║ Client-Config:            │                           ║
             ║  5) [Mainsail-Config]     │                           ║
             ║  6) [Fluidd-Config]       │                           ║
@@ -107,3 +114,14 @@ class InstallMenu(BaseMenu):
 
     def install_crowsnest(self, **kwargs) -> None:
         install_crowsnest()
+
+    def install_multiple(self, **kwargs) -> None:
+        question = _("Components to install (e.g. 1,2,3,5)")
+        while True:
+            _input = get_string_input(question, allow_special_chars=True)
+            selection = [s.strip() for s in _input.split(",")]
+            if all(s in INSTALL_STEP_KEYS for s in selection):
+                break
+            Logger.print_error(_("Invalid selection! Use the options 1 to 8."))
+
+        run_install_plan(selection)
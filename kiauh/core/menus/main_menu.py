@@ -10,12 +10,11 @@ from __future__ import annotations
 
 import sys
 import textwrap
-from typing import Callable, Type
+from typing import Type
 
 from components.crowsnest.crowsnest import get_crowsnest_status
 from components.klipper.klipper_utils import get_klipper_status
 from components.klipperscreen.klipperscreen import get_klipperscreen_status
-from components.log_uploads.menus.log_upload_menu import LogUploadMenu
 from components.moonraker.utils.utils import get_moonraker_status
 from components.webui_client.client_utils import (
     get_client_status,
@@ -25,24 +24,24 @@ from components.webui_client.fluidd_data import FluiddData
 from components.webui_client.mainsail_data import MainsailData
 from core.logger import Logger
 from core.menus import FooterType
-from core.menus.advanced_menu import AdvancedMenu
-from core.menus.backup_menu import BackupMenu
 from core.menus.base_menu import BaseMenu, Option
-from core.menus.install_menu import InstallMenu
-from core.menus.remove_menu import RemoveMenu
-from core.menus.settings_menu import SettingsMenu
-from core.menus.update_menu import UpdateMenu
+from core.services.status_refresher import StatusRefresher, format_age
 from core.types.color import Color
 from core.types.component_status import ComponentStatus, StatusMap, StatusText
-from extensions.extensions_menu import ExtensionsMenu
 from utils.common import get_kiauh_version, trunc_string
 
+# max. seconds to wait for status probes when the menu is opened, renders show
+# the latest results without waiting
+RENDER_TIMEOUT: float = 3.0
+STATUS_PROBES = ["kl", "mr", "ms", "fl", "ks", "cn", "cc"]
+
 
 # noinspection PyUnusedLocal
 # noinspection PyMethodMayBeStatic
 class MainMenu(BaseMenu):
     def __init__(self) -> None:
         super().__init__()
+        self.loading_msg = "Loading main menu, please wait"
 
         self.header: bool = True
         self.title = "Main Menu"
@@ -54,7 +53,11 @@ class MainMenu(BaseMenu):
         self.mr_status, self.mr_owner, self.mr_repo = "", "", ""
         self.ms_status, self.fl_status, self.ks_status = "", "", ""
         self.cn_status, self.cc_status = "", ""
+        self.status_age = ""
+        self.status_refresher = StatusRefresher()
+        self._register_status_probes()
         self._init_status()
+        self._wait_for_status()
 
     def set_previous_menu(self, previous_menu: Type[BaseMenu] | None) -> None:
         """MainMenu does not have a previous menu"""
@@ -78,21 +81,49 @@ class MainMenu(BaseMenu):
             setattr(
                 self,
                 f"{var}_status",
-                Color.apply("Not installed", Color.RED),
+                Color.apply("Loading ...", Color.YELLOW),
             )
+        for var in ["kl", "mr"]:
+            setattr(self, f"{var}_owner", Color.apply("-", Color.CYAN))
+            setattr(self, f"{var}_repo", Color.apply("-", Color.CYAN))
+
+    def _register_status_probes(self) -> None:
+        refresher = self.status_refresher
+        refresher.register("kl", get_klipper_status)
+        refresher.register("mr", get_moonraker_status)
+        refresher.register("ms", get_client_status, MainsailData())
+        refresher.register("fl", get_client_status, FluiddData())
+        refresher.register("ks", get_klipperscreen_status)
+        refresher.register("cn", get_crowsnest_status)
+        refresher.register("cc", get_current_client_config)
+
+    def _wait_for_status(self) -> None:
+        # waiting while the menu is rendered would leave the screen blank, and
+        # snapshots of an earlier visit of the menu are shown right away
+        refresher = self.status_refresher
+        if not refresher.wait(STATUS_PROBES, timeout=0):
+            self.is_loading(True)
+            refresher.wait(STATUS_PROBES, timeout=RENDER_TIMEOUT)
+            self.is_loading(False)
 
     def _fetch_status(self) -> None:
         self.version = get_kiauh_version()
-        self._get_component_status("kl", get_klipper_status)
-        self._get_component_status("mr", get_moonraker_status)
-        self._get_component_status("ms", get_client_status, MainsailData())
-        self._get_component_status("fl", get_client_status, FluiddData())
-        self._get_component_status("ks", get_klipperscreen_status)
-        self._get_component_status("cn", get_crowsnest_status)
-        self.cc_status = get_current_client_config()
-
-    def _get_component_status(self, name: str, status_fn: Callable, *args) -> None:
-        status_data: ComponentStatus = status_fn(*args)
+        refresher = self.status_refresher
+        for name in STATUS_PROBES:
+            snapshot = refresher.get(name)
+            if snapshot is None:
+                continue
+            if name == "cc":
+                self.cc_status = snapshot.value
+            else:
+                self._set_component_status(name, snapshot.value)
+
+        age = format_age(refresher.get_age(STATUS_PROBES))
+        if refresher.is_stale(STATUS_PROBES):
+            age = f"{age}, refreshing ..."
+        self.status_age = Color.apply(f"Status: {age}", Color.WHITE)
+
+    def _set_component_status(self, name: str, status_data: ComponentStatus) -> None:
         code: int = status_data.status
         status: StatusText = StatusMap[code]
         owner: str = trunc_string(status_data.owner, 23)
@@ -126,6 +157,7 @@ class MainMenu(BaseMenu):
         footer2 = f"Changelog: {link}"
         pad1 = 32
         pad2 = 26
+        pad3 = 43
         menu = textwrap.dedent(
             f"""
             ╟──────────────────┬────────────────────────────────────╢
@@ -143,6 +175,7 @@ class MainMenu(BaseMenu):
             ║  E) [Extensions] │                                    ║
             ║                  │   KlipperScreen: {self.ks_status:<{pad2}} ║
             ║                  │       Crowsnest: {self.cn_status:<{pad2}} ║
+            ║                  │ {self.status_age:>{pad3}} ║
             ╟──────────────────┼────────────────────────────────────╢
             ║ {footer1:^25} │ {footer2:^43} ║
             ╟──────────────────┴────────────────────────────────────╢
@@ -154,26 +187,44 @@ class MainMenu(BaseMenu):
         Logger.print_ok("###### Happy printing!", False)
         sys.exit(0)
 
+    # submenus are imported on first use, importing them and all the components
+    # they depend on up front would delay the first render of the main menu
     def log_upload_menu(self, **kwargs) -> None:
+        from components.log_uploads.menus.log_upload_menu import LogUploadMenu
+
         LogUploadMenu().run()
 
     def install_menu(self, **kwargs) -> None:
+        from core.menus.install_menu import InstallMenu
+
         InstallMenu(previous_menu=self.__class__).run()
 
     def update_menu(self, **kwargs) -> None:
+        from core.menus.update_menu import UpdateMenu
+
         UpdateMenu(previous_menu=self.__class__).run()
 
     def remove_menu(self, **kwargs) -> None:
+        from core.menus.remove_menu import RemoveMenu
+
         RemoveMenu(previous_menu=self.__class__).run()
 
     def advanced_menu(self, **kwargs) -> None:
+        from core.menus.advanced_menu import AdvancedMenu
+
         AdvancedMenu(previous_menu=self.__class__).run()
 
     def backup_menu(self, **kwargs) -> None:
+        from core.menus.backup_menu import BackupMenu
+
         BackupMenu(previous_menu=self.__class__).run()
 
     def settings_menu(self, **kwargs) -> None:
+        from core.menus.settings_menu import SettingsMenu
+
         SettingsMenu(previous_menu=self.__class__).run()
 
     def extension_menu(self, **kwargs) -> None:
+        from extensions.extensions_menu import ExtensionsMenu
+
         ExtensionsMenu(previous_menu=self.__class__).run()
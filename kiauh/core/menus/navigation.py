@@ -0,0 +1,78 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Type
+
+if TYPE_CHECKING:
+    from core.menus.base_menu import BaseMenu
+
+
+class NavigationStack:
+    """
+    Stack of the open menus, the menu on top is the one being displayed. A menu
+    class is open at most once: opening a menu whose class is already on the
+    stack replaces that instance and closes all menus above it. The depth of
+    the stack is therefore bounded by the number of menu classes, no matter
+    how long the user navigates back and forth.
+    """
+
+    def __init__(self) -> None:
+        self.active: bool = False
+        self.__menus: List[BaseMenu] = []
+
+    def __len__(self) -> int:
+        return len(self.__menus)
+
+    @property
+    def top(self) -> BaseMenu | None:
+        return self.__menus[-1] if self.__menus else None
+
+    def open(self, menu: BaseMenu) -> None:
+        """
+        Put a menu on top of the stack
+        :param menu: The menu to open
+        :return: None
+        """
+        index = self.__find(type(menu))
+        if index is not None:
+            del self.__menus[index:]
+        self.__menus.append(menu)
+
+    def go_back_to(self, menu_type: Type[BaseMenu]) -> bool:
+        """
+        Close all menus above the open instance of the given menu class
+        :param menu_type: The class of the menu to go back to
+        :return: False if no menu of the given class is open
+        """
+        index = self.__find(menu_type)
+        if index is None:
+            return False
+        del self.__menus[index + 1 :]
+        return True
+
+    def close(self, menu: BaseMenu) -> None:
+        """
+        Close a menu and all menus above it
+        :param menu: The menu to close
+        :return: None
+        """
+        for index, open_menu in enumerate(self.__menus):
+            if open_menu is menu:
+                del self.__menus[index:]
+                return
+
+    def clear(self) -> None:
+        self.__menus.clear()
+
+    def __find(self, menu_type: Type[BaseMenu]) -> int | None:
+        for index in range(len(self.__menus) - 1, -1, -1):
+            if type(self.__menus[index]) is menu_type:
+                return index
+        return None
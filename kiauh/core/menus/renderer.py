@@ -0,0 +1,169 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import io
+import shutil
+import sys
+import threading
+from contextlib import contextmanager, redirect_stdout
+from typing import Any, Callable, Iterator, List, TextIO, Tuple
+
+# same as `clear -x`, moves the cursor home and clears the screen but keeps
+# the scrollback buffer
+CLEAR_SCREEN = "\033[H\033[2J"
+# clears the screen from the cursor to the end
+ERASE_BELOW = "\033[J"
+# audit events of started processes, which write to the terminal directly
+# instead of through sys.stdout
+PROCESS_EVENTS = frozenset({"subprocess.Popen", "os.system", "os.posix_spawn"})
+
+
+class _OutputTracker:
+    """
+    Wraps a stream and tracks whether anything was written to it, or whether
+    the thread which created the tracker started a process
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.thread = threading.get_ident()
+        self.written = False
+
+    def write(self, text: str) -> int:
+        # transient output like the spinner overwrites its own line and
+        # erases itself, it doesn't leave anything worth keeping on screen
+        if text and not text.startswith("\r"):
+            self.written = True
+        return self.stream.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+class _ThreadRedirect:
+    """
+    Redirects the writes of the thread which created it to a buffer, writes
+    of other threads, e.g. of status probes, still go to the wrapped stream
+    """
+
+    def __init__(self, stream: TextIO | _OutputTracker, buffer: TextIO) -> None:
+        self.stream = stream
+        self.buffer = buffer
+        self.thread = threading.get_ident()
+
+    def write(self, text: str) -> int:
+        if threading.get_ident() == self.thread:
+            return self.buffer.write(text)
+        return self.stream.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+# trackers of the active track_output() contexts
+_process_trackers: List[_OutputTracker] = []
+_audit_hook_added = False
+
+
+def _on_audit_event(event: str, args: Tuple[Any, ...]) -> None:
+    if event not in PROCESS_EVENTS:
+        return
+    thread = threading.get_ident()
+    for tracker in _process_trackers:
+        if tracker.thread == thread:
+            tracker.written = True
+
+
+class ScreenRenderer:
+    """
+    Renders menus as frames. A frame is composed in a buffer and written to
+    stdout at once, instead of line by line. The screen is only cleared
+    before a frame if nothing but the frame and the input prompt was written
+    to it since the last frame, so the output of routines, e.g. errors or
+    the log of an installation, is never wiped. A frame equal to the one on
+    the screen is not written again, only the prompt below it is erased.
+    """
+
+    def __init__(self) -> None:
+        # whether the screen only shows the last frame and the input prompt
+        self.__clean: bool = False
+        # the frame on the screen, only set if it starts at the top
+        self.__frame: str | None = None
+
+    def compose(self, draw: Callable[[], None]) -> str:
+        """
+        Compose a frame from everything the given function prints. Only the
+        output of the calling thread is part of the frame, output of other
+        threads is written to the screen and keeps it from being cleared.
+        :param draw: Function printing the content of the frame
+        :return: The composed frame
+        """
+        buffer = io.StringIO()
+        others = _OutputTracker(sys.stdout)
+        with redirect_stdout(_ThreadRedirect(others, buffer)):
+            draw()
+        if others.written:
+            self.invalidate()
+        return buffer.getvalue()
+
+    def render(self, frame: str) -> bool:
+        """
+        Write a frame to stdout
+        :param frame: The composed frame
+        :return: False if the frame is already on the screen and not written
+        """
+        stream = sys.stdout
+        rows = frame.count("\n")
+        # the prompt below the frame must fit on the screen as well
+        fits = rows < shutil.get_terminal_size().lines
+
+        rendered = True
+        if not self.__clean:
+            output, self.__frame = frame, None
+        elif frame != self.__frame or not fits:
+            output, self.__frame = f"{CLEAR_SCREEN}{frame}", frame
+        else:
+            # move the cursor to the prompt in the row below the frame
+            output, rendered = f"\033[{rows + 1};1H{ERASE_BELOW}", False
+
+        stream.write(output)
+        stream.flush()
+        # never send escape sequences to a pipe or a file
+        self.__clean = stream.isatty()
+        return rendered
+
+    def invalidate(self) -> None:
+        """Keep everything on the screen which was written after the last frame"""
+        self.__clean = False
+        self.__frame = None
+
+    @contextmanager
+    def track_output(self) -> Iterator[None]:
+        """
+        Track the output written to stdout while the context is active, e.g.
+        while the selected option of a menu runs. The screen is only cleared
+        before the next frame if nothing was written. Processes write to the
+        terminal directly, so starting any process counts as output as well.
+        """
+        global _audit_hook_added
+        if not _audit_hook_added:
+            # audit hooks can't be removed, it is only added once
+            sys.addaudithook(_on_audit_event)
+            _audit_hook_added = True
+
+        tracker = _OutputTracker(sys.stdout)
+        _process_trackers.append(tracker)
+        try:
+            with redirect_stdout(tracker):
+                yield
+        finally:
+            _process_trackers.remove(tracker)
+            if tracker.written:
+                self.invalidate()
@@ -35,11 +35,10 @@ class SettingsMenu(BaseMenu):
         self.fluidd_unstable: bool | None = None
         self.auto_backups_enabled: bool | None = None
 
-        na: str = "Not available!"
-        self.kl_repo_url: str = Color.apply(na, Color.RED)
-        self.kl_branch: str = Color.apply(na, Color.RED)
-        self.mr_repo_url: str = Color.apply(na, Color.RED)
-        self.mr_branch: str = Color.apply(na, Color.RED)
+        self.kl_repo_url: str = ""
+        self.kl_branch: str = ""
+        self.mr_repo_url: str = ""
+        self.mr_branch: str = ""
 
         self._load_settings()
 
@@ -48,6 +47,10 @@ class SettingsMenu(BaseMenu):
 
         self.previous_menu = previous_menu if previous_menu is not None else MainMenu
 
+    def on_resume(self) -> None:
+        # the repo select menu switches the repositories
+        self._load_settings()
+
     def set_options(self) -> None:
         self.options = {
             "1": Option(method=self.switch_klipper_repo),
@@ -100,6 +103,9 @@ class SettingsMenu(BaseMenu):
         def trim_repo_url(repo: str) -> str:
             return repo.replace(".git", "").replace("https://", "").replace("git@", "")
 
+        na: str = Color.apply("Not available!", Color.RED)
+        self.kl_repo_url, self.kl_branch = na, na
+        self.mr_repo_url, self.mr_branch = na, na
         if not klipper_status.repo == "-":
             url = trim_repo_url(klipper_status.repo_url)
             self.kl_repo_url = Color.apply(url, Color.CYAN)
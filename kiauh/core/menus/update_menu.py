@@ -9,7 +9,7 @@
 from __future__ import annotations
 
 import textwrap
-from typing import Callable, List, Type
+from typing import Any, Callable, Dict, List, Type
 
 from components.crowsnest.crowsnest import get_crowsnest_status, update_crowsnest
 from components.klipper.klipper_utils import (
@@ -29,12 +29,19 @@ from components.webui_client.client_setup import update_client
 from components.webui_client.client_utils import (
     get_client_config_status,
     get_client_status,
+    get_remote_client_version,
 )
 from components.webui_client.fluidd_data import FluiddData
 from components.webui_client.mainsail_data import MainsailData
 from core.logger import DialogType, Logger
 from core.menus import Option
 from core.menus.base_menu import BaseMenu
+from core.services.status_collector import PROBE_TIMEOUT
+from core.services.status_refresher import (
+    REMOTE_INTERVAL,
+    StatusRefresher,
+    format_age,
+)
 from core.types.color import Color
 from core.types.component_status import ComponentStatus
 from utils.input_utils import get_confirm
@@ -44,6 +51,12 @@ from utils.sys_utils import (
     upgrade_system_packages,
 )
 
+# max. seconds to wait for status probes which never finished so far before
+# the menu is rendered, results of slower probes are shown on the next render
+RENDER_TIMEOUT: float = 5.0
+# the remote versions of the clients are probed separately on a long interval
+REMOTE_PROBES = ["mainsail", "fluidd"]
+
 
 # noinspection PyUnusedLocal
 # noinspection PyMethodMayBeStatic
@@ -51,7 +64,6 @@ class UpdateMenu(BaseMenu):
     def __init__(self, previous_menu: Type[BaseMenu] | None = None) -> None:
         super().__init__()
         self.loading_msg = "Loading update menu, please wait"
-        self.is_loading(True)
 
         self.title = "Update Menu"
         self.title_color = Color.GREEN
@@ -71,7 +83,9 @@ class UpdateMenu(BaseMenu):
 
         self.mainsail_data = MainsailData()
         self.fluidd_data = FluiddData()
-        self.status_data = {
+        self.status_refresher = StatusRefresher()
+        self.status_age = ""
+        self.status_data: Dict[str, Dict[str, Any]] = {
             "klipper": {
                 "display_name": "Klipper",
                 "installed": False,
@@ -122,8 +136,8 @@ class UpdateMenu(BaseMenu):
             },
         }
 
+        self._init_status_strings()
         self._fetch_update_status()
-        self.is_loading(False)
 
     def set_previous_menu(self, previous_menu: Type[BaseMenu] | None) -> None:
         from core.menus.main_menu import MainMenu
@@ -145,6 +159,9 @@ class UpdateMenu(BaseMenu):
         }
 
     def print_menu(self) -> None:
+        # pick up results of probes that finished after the last render
+        self._read_status()
+
         sysupgrades: str = "No upgrades available."
         padding = 29
         if self.package_count > 0:
@@ -175,6 +192,7 @@ class UpdateMenu(BaseMenu):
             ║  8) Crowsnest         │ {self.crowsnest_local:<22} │ {self.crowsnest_remote:<22} ║
             ║                       ├───────────────┴───────────────╢
             ║  9) System            │ {sysupgrades:^{padding}} ║
+            ║                       │ {self.status_age:^38} ║
             ╟───────────────────────┴───────────────────────────────╢
             """
         )[1:]
@@ -237,23 +255,85 @@ class UpdateMenu(BaseMenu):
     def upgrade_system_packages(self, **kwargs) -> None:
         self._run_system_updates()
 
+    def _init_status_strings(self) -> None:
+        # placeholders for components whose status probe is still pending
+        loading = Color.apply("...", Color.YELLOW)
+        for name in self.status_data:
+            setattr(self, f"{name}_local", loading)
+            setattr(self, f"{name}_remote", loading)
+
+    def _get_probe_names(self) -> List[str]:
+        remote = [f"{name}_remote" for name in REMOTE_PROBES]
+        return [*self.status_data, *remote, "system"]
+
     def _fetch_update_status(self) -> None:
-        self._set_status_data("klipper", get_klipper_status)
-        self._set_status_data("moonraker", get_moonraker_status)
-        self._set_status_data("mainsail", get_client_status, self.mainsail_data, True)
-        self._set_status_data(
+        refresher = self.status_refresher
+        # apt-get might ask for the sudo password, so the package lists are
+        # only updated in the foreground when the menu opens, never by a probe
+        if update_system_package_lists(silent=True):
+            refresher.refresh(names=["system"])
+
+        refresher.register("klipper", get_klipper_status)
+        refresher.register("moonraker", get_moonraker_status)
+        refresher.register("mainsail", get_client_status, self.mainsail_data)
+        refresher.register(
             "mainsail_config", get_client_config_status, self.mainsail_data
         )
-        self._set_status_data("fluidd", get_client_status, self.fluidd_data, True)
-        self._set_status_data(
-            "fluidd_config", get_client_config_status, self.fluidd_data
+        refresher.register("fluidd", get_client_status, self.fluidd_data)
+        refresher.register("fluidd_config", get_client_config_status, self.fluidd_data)
+        refresher.register("klipperscreen", get_klipperscreen_status)
+        refresher.register("crowsnest", get_crowsnest_status)
+        refresher.register(
+            "mainsail_remote",
+            get_remote_client_version,
+            self.mainsail_data,
+            interval=REMOTE_INTERVAL,
         )
-        self._set_status_data("klipperscreen", get_klipperscreen_status)
-        self._set_status_data("crowsnest", get_crowsnest_status)
-
-        update_system_package_lists(silent=True)
-        self.packages = get_upgradable_packages()
-        self.package_count = len(self.packages)
+        refresher.register(
+            "fluidd_remote",
+            get_remote_client_version,
+            self.fluidd_data,
+            interval=REMOTE_INTERVAL,
+        )
+        refresher.register("system", get_upgradable_packages, interval=REMOTE_INTERVAL)
+
+        # snapshots of an earlier visit of the menu are shown right away
+        names = self._get_probe_names()
+        if not refresher.wait(names, timeout=0):
+            self.is_loading(True)
+            refresher.wait(names, timeout=RENDER_TIMEOUT)
+            self.is_loading(False)
+        self._read_status()
+
+    def _read_status(self) -> None:
+        refresher = self.status_refresher
+        names = self._get_probe_names()
+        for name in names:
+            snapshot = refresher.get(name)
+            if snapshot is not None:
+                self._on_status_result(name, snapshot.value)
+
+        age = format_age(refresher.get_age(names))
+        if refresher.is_stale(names):
+            age = f"{age}, refreshing ..."
+        self.status_age = Color.apply(f"Status: {age}", Color.WHITE)
+
+    def _on_status_result(self, name: str, result: Any) -> None:
+        # the type of the result depends on the probe
+        if name == "system":
+            self._set_packages(result)
+        elif name.endswith("_remote"):
+            self._set_remote_version(name[: -len("_remote")], result)
+        else:
+            self._set_status_data(name, result)
+
+    def _set_packages(self, packages: List[str]) -> None:
+        self.packages = packages
+        self.package_count = len(packages)
+
+    def _set_remote_version(self, name: str, version: str | None) -> None:
+        self.status_data[name]["remote"] = version
+        self._set_status_string(name)
 
     def _format_local_status(self, local_version, remote_version) -> str:
         color = Color.RED
@@ -264,14 +344,14 @@ class UpdateMenu(BaseMenu):
         elif local_version != remote_version:
             color = Color.YELLOW
 
-        return Color.apply(local_version or "-", color)
-
-    def _set_status_data(self, name: str, status_fn: Callable, *args) -> None:
-        comp_status: ComponentStatus = status_fn(*args)
+        local_txt: str = Color.apply(local_version or "-", color)
+        return local_txt
 
+    def _set_status_data(self, name: str, comp_status: ComponentStatus) -> None:
         self.status_data[name]["installed"] = True if comp_status.status == 2 else False
         self.status_data[name]["local"] = comp_status.local
-        self.status_data[name]["remote"] = comp_status.remote
+        if name not in REMOTE_PROBES:
+            self.status_data[name]["remote"] = comp_status.remote
 
         self._set_status_string(name)
 
@@ -287,13 +367,26 @@ class UpdateMenu(BaseMenu):
         setattr(self, f"{name}_remote", remote_txt)
 
     def _check_is_installed(self, name: str) -> bool:
-        return self.status_data[name]["installed"]
+        return bool(self.status_data[name]["installed"])
 
     def _is_update_available(self, name: str) -> bool:
-        return self.status_data[name]["local"] != self.status_data[name]["remote"]
+        return bool(self.status_data[name]["local"] != self.status_data[name]["remote"])
+
+    def _wait_for_status(self, names: List[str]) -> bool:
+        # updates must never act on a status that is still being fetched
+        fresh: bool = self.status_refresher.wait(
+            names, timeout=PROBE_TIMEOUT, fresh=True
+        )
+        self._read_status()
+        return fresh
 
     def _run_update_routine(self, name: str, update_fn: Callable, *args) -> None:
+        remote = [f"{name}_remote"] if name in REMOTE_PROBES else []
         display_name = self.status_data[name]["display_name"]
+        if not self._wait_for_status([name, *remote]):
+            Logger.print_warn(f"Status of {display_name} unavailable! Skipped ...")
+            return
+
         is_installed = self._check_is_installed(name)
         is_update_available = self._is_update_available(name)
 
@@ -307,6 +400,9 @@ class UpdateMenu(BaseMenu):
         update_fn(*args)
 
     def _run_system_updates(self) -> None:
+        if not self._wait_for_status(["system"]):
+            Logger.print_warn("Status of system packages unavailable! Skipped ...")
+            return
         if not self.packages:
             Logger.print_info("No system upgrades available!")
             return
@@ -321,7 +417,12 @@ class UpdateMenu(BaseMenu):
             if not get_confirm("Continue?"):
                 return
             Logger.print_status("Upgrading system packages ...")
-            upgrade_system_packages(self.packages)
+            with self.status_refresher.paused():
+                try:
+                    upgrade_system_packages(self.packages)
+                finally:
+                    # the package lists are only probed on the remote interval
+                    self.status_refresher.refresh(include_remote=True)
         except Exception as e:
             Logger.print_error(f"Error upgrading system packages:\n{e}")
             raise
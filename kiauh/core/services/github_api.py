@@ -0,0 +1,201 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
+from json import JSONDecodeError
+from typing import Any, Dict, Tuple
+
+from core.constants import KIAUH_CACHE_DIR
+from core.singleton import Singleton
+from utils.fs_utils import write_json_cache
+
+GITHUB_API_HOST = "api.github.com"
+GITHUB_CACHE_FILE = KIAUH_CACHE_DIR.joinpath("github_api_cache.json")
+
+# cached responses younger than this are served without asking GitHub at all
+MAX_AGE: int = 60
+REQUEST_TIMEOUT: int = 10
+
+
+class GitHubApiError(Exception):
+    """Raised when the GitHub API can't be reached and no cached data exists"""
+
+    def __init__(self, path: str, reason: str):
+        msg = f"GitHub API request '{path}' failed: {reason}"
+        super().__init__(msg)
+
+
+class GitHubApiClient(metaclass=Singleton):
+    """
+    Shared client for the GitHub REST API. Responses are kept on disk together
+    with their ETag and Last-Modified headers and revalidated with conditional
+    requests, which do not count against the rate limit when answered with
+    304 Not Modified. Connections are kept alive per thread. If the rate limit
+    is exhausted, the last known response is served until it resets.
+    """
+
+    def __init__(self) -> None:
+        self.host: str = GITHUB_API_HOST
+        self.port: int | None = None
+        self.use_tls: bool = True
+        self.cache_file = GITHUB_CACHE_FILE
+        self.__lock = threading.RLock()
+        self.__local = threading.local()
+        self.__cache: Dict[str, Any] | None = None
+
+    def get_json(self, path: str) -> Any:
+        """
+        GET a JSON document from the GitHub API
+        :param path: Path of the API endpoint, e.g. `/repos/<owner>/<name>/tags`
+        :return: The decoded JSON document
+        :raises GitHubApiError: If neither GitHub nor the cache can answer
+        """
+        entry = self.__get_entry(path)
+        now = time.time()
+
+        if entry is not None and now - entry["fetched_at"] < MAX_AGE:
+            return entry["body"]
+
+        if self.__is_rate_limited(now):
+            if entry is not None:
+                return entry["body"]
+            raise GitHubApiError(path, "rate limit exceeded")
+
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "kiauh",
+        }
+        if entry is not None and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            status, response_headers, body = self.__request(path, headers)
+        except (OSError, HTTPException) as e:
+            if entry is not None:
+                return entry["body"]
+            raise GitHubApiError(path, str(e)) from e
+
+        self.__update_rate_limit(response_headers)
+
+        if status == 304 and entry is not None:
+            entry["fetched_at"] = now
+            self.__save()
+            return entry["body"]
+
+        if status == 200:
+            try:
+                data = json.loads(body)
+            except JSONDecodeError as e:
+                raise GitHubApiError(path, f"invalid response: {e}") from e
+            self.__set_entry(
+                path,
+                {
+                    "etag": response_headers.get("etag"),
+                    "last_modified": response_headers.get("last-modified"),
+                    "fetched_at": now,
+                    "body": data,
+                },
+            )
+            return data
+
+        # serve stale data on rate limiting and server errors
+        if entry is not None:
+            return entry["body"]
+        raise GitHubApiError(path, f"HTTP status code {status}")
+
+    def __request(
+        self, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        # a kept-alive connection might have been closed by the server in the
+        # meantime, so the request is retried once on a fresh connection. Other
+        # errors like timeouts are not retried, that would double the timeout.
+        reused = getattr(self.__local, "conn", None) is not None
+        try:
+            return self.__send(self.__get_connection(), path, headers)
+        except ConnectionError:
+            if not reused:
+                raise
+            return self.__send(self.__get_connection(fresh=True), path, headers)
+
+    def __send(
+        self, conn: HTTPConnection, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        try:
+            conn.request("GET", path, headers=headers)
+            response: HTTPResponse = conn.getresponse()
+            body = response.read()
+        except (OSError, HTTPException):
+            conn.close()
+            raise
+
+        response_headers = {k.lower(): v for k, v in response.getheaders()}
+        if response_headers.get("connection", "").lower() == "close":
+            conn.close()
+        return response.status, response_headers, body
+
+    def __get_connection(self, fresh: bool = False) -> HTTPConnection:
+        conn: HTTPConnection | None = getattr(self.__local, "conn", None)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            conn_cls = HTTPSConnection if self.use_tls else HTTPConnection
+            conn = conn_cls(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            self.__local.conn = conn
+        return conn
+
+    def __is_rate_limited(self, now: float) -> bool:
+        rate_limit = self.__get_cache().get("rate_limit", {})
+        remaining = rate_limit.get("remaining")
+        reset = rate_limit.get("reset", 0)
+        return remaining is not None and remaining <= 0 and now < reset
+
+    def __update_rate_limit(self, headers: Dict[str, str]) -> None:
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            rate_limit = {"remaining": int(remaining), "reset": float(reset)}
+        except ValueError:
+            return
+        with self.__lock:
+            self.__get_cache()["rate_limit"] = rate_limit
+            self.__save()
+
+    def __get_entry(self, path: str) -> Dict[str, Any] | None:
+        with self.__lock:
+            responses: Dict[str, Dict[str, Any]]
+            responses = self.__get_cache().setdefault("responses", {})
+            return responses.get(path)
+
+    def __set_entry(self, path: str, entry: Dict[str, Any]) -> None:
+        with self.__lock:
+            self.__get_cache().setdefault("responses", {})[path] = entry
+            self.__save()
+
+    def __get_cache(self) -> Dict[str, Any]:
+        with self.__lock:
+            if self.__cache is None:
+                try:
+                    with open(self.cache_file, "r") as f:
+                        cache = json.load(f)
+                    self.__cache = cache if isinstance(cache, dict) else {}
+                except (OSError, JSONDecodeError):
+                    self.__cache = {}
+            return self.__cache
+
+    def __save(self) -> None:
+        with self.__lock:
+            write_json_cache(self.cache_file, self.__cache)
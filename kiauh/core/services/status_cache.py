@@ -0,0 +1,111 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, replace
+from json import JSONDecodeError
+from pathlib import Path
+from threading import RLock
+from typing import Callable, Dict, List
+
+from core.constants import KIAUH_CACHE_DIR
+from core.singleton import Singleton
+from core.types.component_status import ComponentStatus
+
+STATUS_CACHE_FILE = KIAUH_CACHE_DIR.joinpath("status_cache.json")
+
+Fingerprint = List[List]
+
+
+class StatusCache(metaclass=Singleton):
+    """
+    Caches ComponentStatus results in memory and in a small JSON file, so they
+    survive menu changes and restarts. Every entry is stored together with a
+    fingerprint of the mtimes of the files it was derived from, and is only
+    served as long as none of them changed. Routines that install, update or
+    remove components invalidate the whole cache.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = RLock()
+        self.__entries: Dict[str, Dict] | None = None
+
+    def get_or_compute(
+        self, key: str, paths: List[Path], compute: Callable[[], ComponentStatus]
+    ) -> ComponentStatus:
+        """
+        Return the cached status for the given key if none of the given paths
+        changed since it was stored, otherwise compute and store a new one.
+        :param key: Unique key of the cached status
+        :param paths: Files and directories the status is derived from
+        :param compute: Callable computing the status on a cache miss
+        :return: A copy of the cached or the newly computed status
+        """
+        fingerprint = get_fingerprint(paths)
+        with self.__lock:
+            entry = self.__get_entries().get(key)
+            if entry is not None and entry["fingerprint"] == fingerprint:
+                return ComponentStatus(**entry["status"])
+
+        status = compute()
+        with self.__lock:
+            self.__get_entries()[key] = {
+                "fingerprint": fingerprint,
+                "status": asdict(status),
+            }
+            self.__save()
+
+        return replace(status)
+
+    def invalidate(self) -> None:
+        """Drop all cached entries from memory and disk"""
+        with self.__lock:
+            self.__entries = {}
+            try:
+                STATUS_CACHE_FILE.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def __get_entries(self) -> Dict[str, Dict]:
+        if self.__entries is None:
+            self.__entries = self.__load()
+        return self.__entries
+
+    def __load(self) -> Dict[str, Dict]:
+        try:
+            with open(STATUS_CACHE_FILE, "r") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, JSONDecodeError):
+            return {}
+
+    def __save(self) -> None:
+        # fs_utils imports this module through core.decorators
+        from utils.fs_utils import write_json_cache
+
+        write_json_cache(STATUS_CACHE_FILE, self.__entries)
+
+
+def get_fingerprint(paths: List[Path]) -> Fingerprint:
+    """
+    Build a JSON serializable fingerprint of the given paths. Missing paths
+    are part of the fingerprint as well, so their creation is detected.
+    :param paths: Files and directories to fingerprint
+    :return: List of [path, mtime in ns or None] pairs
+    """
+    fingerprint: Fingerprint = []
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        fingerprint.append([path.as_posix(), mtime])
+    return fingerprint
@@ -0,0 +1,196 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from queue import SimpleQueue
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.logger import Logger
+from core.types.component_status import ComponentStatus
+
+StatusProbe = Callable[..., Any]
+StatusCallback = Callable[[str, Any], None]
+
+# most probes are bound by git subprocesses and GitHub API requests,
+# so a handful of workers is plenty even on a Pi Zero
+MAX_WORKERS: int = 6
+# a probe running longer than this is abandoned and its result discarded
+PROBE_TIMEOUT: float = 30.0
+
+_Task = Tuple[Future, StatusProbe, Tuple[Any, ...]]
+
+
+class _ProbePool:
+    """
+    Minimal thread pool shared by all status collectors. Unlike the workers
+    of a ThreadPoolExecutor, which are joined when the interpreter exits, its
+    workers are daemon threads, so a hung git or network probe never keeps
+    KIAUH from exiting.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self.__lock = Lock()
+        self.__tasks: SimpleQueue[_Task] = SimpleQueue()
+        self.__workers: List[Thread] = []
+
+    def submit(self, probe: StatusProbe, *args: Any) -> Future:
+        future: Future = Future()
+        self.__tasks.put((future, probe, args))
+        with self.__lock:
+            if len(self.__workers) < self.max_workers:
+                worker = Thread(
+                    target=self.__work,
+                    name=f"kiauh-status-{len(self.__workers)}",
+                    daemon=True,
+                )
+                worker.start()
+                self.__workers.append(worker)
+        return future
+
+    def __work(self) -> None:
+        while True:
+            future, probe, args = self.__tasks.get()
+            # cancelled futures are skipped
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(probe(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+_pool = _ProbePool(MAX_WORKERS)
+
+
+class StatusCollector:
+    """
+    Runs component status probes concurrently in a bounded thread pool, which
+    is shared by all collectors. Results are handed to a callback as soon as
+    each probe finishes, so menus are able to render partial results instead
+    of waiting for the slowest probe. Messages logged by probes are discarded.
+    """
+
+    def __init__(self, probe_timeout: float = PROBE_TIMEOUT) -> None:
+        self.probe_timeout = probe_timeout
+        self._lock = Lock()
+        self._pending: Dict[Future, str] = {}
+        # runs of probes which exceeded the probe timeout, but still block a worker
+        self._abandoned: Dict[str, Future] = {}
+        self._started: Dict[str, float] = {}
+        self._results: Dict[str, Any] = {}
+
+    def submit(self, name: str, probe: StatusProbe, *args: Any) -> bool:
+        """
+        Schedule a status probe. If a probe with the same name is still
+        pending, or its abandoned run did not return yet, it is not scheduled
+        a second time, so a hung probe blocks one worker at most.
+        :param name: Unique name of the probe, passed back to the callback
+        :param probe: Callable returning the status, usually a ComponentStatus
+        :param args: Arguments passed to the probe
+        :return: True if the probe was scheduled, False if it is still pending
+            or abandoned
+        """
+        with self._lock:
+            if name in self._pending.values() or self._is_abandoned(name):
+                return False
+            self._abandoned.pop(name, None)
+            self._started.pop(name, None)
+            future = _pool.submit(self._run_probe, name, probe, *args)
+            self._pending[future] = name
+            return True
+
+    def collect(self, callback: StatusCallback, timeout: float | None = None) -> bool:
+        """
+        Wait for pending probes and pass every finished result to the callback.
+        Probes raising an exception or exceeding the probe timeout are dropped.
+        :param callback: Called with the name and result of each finished probe
+        :param timeout: Max. seconds to wait, None waits for all probes to finish
+        :return: True if no probes are pending anymore, False otherwise
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._pending:
+            self._drop_expired()
+            if not self._pending:
+                break
+
+            wait_time = self._next_wait_time(deadline)
+            done, _ = wait(
+                list(self._pending), timeout=wait_time, return_when=FIRST_COMPLETED
+            )
+
+            for future in done:
+                with self._lock:
+                    name = self._pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    continue
+                self._results[name] = result
+                callback(name, result)
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        return not self._pending
+
+    def get(self, name: str) -> ComponentStatus | Any | None:
+        """Return the last collected result of a probe or None"""
+        return self._results.get(name)
+
+    def is_pending(self, name: str) -> bool:
+        return name in self._pending.values()
+
+    def get_pending(self) -> List[str]:
+        return list(self._pending.values())
+
+    def is_abandoned(self, name: str) -> bool:
+        """Whether an abandoned run of a probe still blocks a worker"""
+        with self._lock:
+            return self._is_abandoned(name)
+
+    def _is_abandoned(self, name: str) -> bool:
+        future = self._abandoned.get(name)
+        return future is not None and not future.done()
+
+    def _run_probe(self, name: str, probe: StatusProbe, *args: Any) -> Any:
+        with self._lock:
+            self._started[name] = time.monotonic()
+        # probes run while menus are shown, their messages would end up in
+        # the middle of whatever is on the screen
+        with Logger.silenced():
+            return probe(*args)
+
+    def _drop_expired(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for future, name in list(self._pending.items()):
+                started = self._started.get(name)
+                if started is not None and now - started > self.probe_timeout:
+                    # running threads can't be interrupted, so we only stop
+                    # waiting for them and let the result go to waste
+                    future.cancel()
+                    del self._pending[future]
+                    self._abandoned[name] = future
+
+    def _next_wait_time(self, deadline: float | None) -> float | None:
+        now = time.monotonic()
+        wait_times: List[float] = []
+        if deadline is not None:
+            wait_times.append(max(deadline - now, 0))
+        with self._lock:
+            for name in self._pending.values():
+                started = self._started.get(name)
+                if started is not None:
+                    wait_times.append(max(started + self.probe_timeout - now, 0))
+        return min(wait_times) if wait_times else None
@@ -0,0 +1,263 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Condition, Event, Thread
+from typing import Any, Dict, Iterator, List, Tuple
+
+from core.services.status_collector import StatusCollector, StatusProbe
+from core.singleton import Singleton
+
+# local state like installed files and git refs is cheap to probe
+LOCAL_INTERVAL: float = 15.0
+# remote versions and upgradable system packages need network requests
+REMOTE_INTERVAL: float = 900.0
+# max. seconds the refresher thread waits for running probes in one go,
+# so refresh requests and newly registered probes are picked up quickly
+MAX_WAIT: float = 0.5
+
+
+@dataclass
+class StatusSnapshot:
+    """
+    Latest result of a status probe
+    :param value: The result, usually a ComponentStatus
+    :param updated: Unix timestamp of the moment the result was stored
+    :param stale: Whether a refresh was requested since the result was stored
+    """
+
+    value: Any
+    updated: float
+    stale: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated
+
+
+@dataclass
+class _ProbeEntry:
+    probe: StatusProbe
+    args: Tuple[Any, ...]
+    interval: float
+    next_run: float = 0.0
+    # increased by every refresh, results of probes which were started for an
+    # older generation are outdated and discarded
+    generation: int = 0
+    started_generation: int = 0
+
+
+class StatusRefresher(metaclass=Singleton):
+    """
+    Keeps snapshots of registered status probes current in a background
+    thread. Every probe runs again once its interval passed, or immediately
+    after a refresh was requested, e.g. by a routine which installed, updated
+    or removed a component. Menus read the latest snapshots without blocking
+    and only wait for probes which never finished so far.
+    """
+
+    def __init__(self) -> None:
+        self.__condition = Condition()
+        self.__wake = Event()
+        self.__probes: Dict[str, _ProbeEntry] = {}
+        self.__snapshots: Dict[str, StatusSnapshot] = {}
+        self.__paused = 0
+        self.__collector = StatusCollector()
+        self.__thread: Thread | None = None
+
+    def register(
+        self,
+        name: str,
+        probe: StatusProbe,
+        *args: Any,
+        interval: float = LOCAL_INTERVAL,
+    ) -> None:
+        """
+        Register a status probe. A probe registered under a name which is
+        already known replaces the former probe, but keeps its snapshot.
+        :param name: Unique name of the probe
+        :param probe: Callable returning the status, usually a ComponentStatus
+        :param args: Arguments passed to the probe
+        :param interval: Seconds between two runs of the probe
+        :return: None
+        """
+        with self.__condition:
+            new_entry = _ProbeEntry(probe, args, interval)
+            entry = self.__probes.get(name)
+            if entry is not None:
+                new_entry.next_run = entry.next_run
+                new_entry.generation = entry.generation
+                new_entry.started_generation = entry.started_generation
+            self.__probes[name] = new_entry
+            if self.__thread is None:
+                self.__thread = Thread(
+                    target=self.__run, name="kiauh-status-refresher", daemon=True
+                )
+                self.__thread.start()
+        self.__wake.set()
+
+    def get(self, name: str) -> StatusSnapshot | None:
+        """Return the latest snapshot of a probe or None, without blocking"""
+        with self.__condition:
+            return self.__snapshots.get(name)
+
+    def wait(
+        self, names: List[str], timeout: float | None = None, fresh: bool = False
+    ) -> bool:
+        """
+        Wait until all given probes have a snapshot
+        :param names: Names of the probes to wait for
+        :param timeout: Max. seconds to wait, None waits without a limit
+        :param fresh: Whether to wait for snapshots which are not stale as well
+        :return: True if all snapshots are available, False on a timeout
+        """
+
+        def available() -> bool:
+            snapshots = [self.__snapshots.get(name) for name in names]
+            return all(s is not None and not (fresh and s.stale) for s in snapshots)
+
+        with self.__condition:
+            return self.__condition.wait_for(available, timeout)
+
+    def refresh(
+        self, include_remote: bool = False, names: List[str] | None = None
+    ) -> None:
+        """
+        Mark snapshots as stale and run their probes as soon as possible
+        :param include_remote: Whether to refresh probes with a longer interval
+            than LOCAL_INTERVAL as well, e.g. probes requesting remote versions
+        :param names: Only refresh the given probes, regardless of their interval
+        :return: None
+        """
+        with self.__condition:
+            for name, entry in self.__probes.items():
+                if names is not None:
+                    if name not in names:
+                        continue
+                elif entry.interval > LOCAL_INTERVAL and not include_remote:
+                    continue
+                entry.next_run = 0.0
+                entry.generation += 1
+                snapshot = self.__snapshots.get(name)
+                if snapshot is not None:
+                    snapshot.stale = True
+        self.__wake.set()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """
+        Don't start any probes while the context is active, e.g. during an
+        installation which must not be interfered with by probes. Probes
+        which are already running finish nonetheless.
+        """
+        with self.__condition:
+            self.__paused += 1
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__paused -= 1
+            self.__wake.set()
+
+    def get_age(self, names: List[str]) -> float | None:
+        """Return the age of the oldest snapshot of the given probes"""
+        with self.__condition:
+            snapshots = [self.__snapshots.get(name) for name in names]
+        ages = [s.age for s in snapshots if s is not None]
+        return max(ages) if ages else None
+
+    def is_stale(self, names: List[str]) -> bool:
+        """Whether any of the given probes has no or a stale snapshot"""
+        with self.__condition:
+            snapshots = [self.__snapshots.get(name) for name in names]
+        return any(s is None or s.stale for s in snapshots)
+
+    def __run(self) -> None:
+        while True:
+            self.__submit_due()
+            wait_time = self.__next_wait_time()
+            if self.__collector.get_pending():
+                self.__collector.collect(self.__store, min(wait_time, MAX_WAIT))
+            else:
+                self.__wake.wait(wait_time)
+                self.__wake.clear()
+
+    def __submit_due(self) -> None:
+        now = time.monotonic()
+        with self.__condition:
+            if self.__paused:
+                return
+            due = [
+                (name, entry.generation)
+                for name, entry in self.__probes.items()
+                if entry.next_run <= now
+            ]
+        for name, generation in due:
+            with self.__condition:
+                entry = self.__probes[name]
+                probe, args = entry.probe, entry.args
+            if not self.__collector.submit(name, probe, *args):
+                # a probe which is still running stays due, so it runs again
+                # once its outdated result arrived, while a hung probe is only
+                # tried again after its interval
+                if self.__collector.is_abandoned(name):
+                    with self.__condition:
+                        entry = self.__probes[name]
+                        entry.next_run = now + entry.interval
+                continue
+            with self.__condition:
+                entry = self.__probes[name]
+                entry.started_generation = generation
+                # a refresh requested meanwhile must not be postponed
+                if entry.generation == generation:
+                    entry.next_run = now + entry.interval
+
+    def __next_wait_time(self) -> float:
+        now = time.monotonic()
+        with self.__condition:
+            if self.__paused:
+                return REMOTE_INTERVAL
+            # running probes are submitted again once they finished
+            next_runs = [
+                entry.next_run
+                for name, entry in self.__probes.items()
+                if not self.__collector.is_pending(name)
+            ]
+        if not next_runs:
+            return REMOTE_INTERVAL
+        return max(min(next_runs) - now, 0.0)
+
+    def __store(self, name: str, result: Any) -> None:
+        with self.__condition:
+            entry = self.__probes.get(name)
+            # the probe started before the latest refresh, its result is stale
+            if entry is not None and entry.started_generation != entry.generation:
+                return
+            self.__snapshots[name] = StatusSnapshot(result, time.time())
+            self.__condition.notify_all()
+
+
+def format_age(age: float | None) -> str:
+    """
+    Format the age of a snapshot for display in a menu
+    :param age: Age in seconds or None if there is no snapshot yet
+    :return: Human readable age, e.g. "just now", "42s ago" or "5m ago"
+    """
+    if age is None:
+        return "never"
+    if age < 5:
+        return "just now"
+    if age < 60:
+        return f"{int(age)}s ago"
+    if age < 3600:
+        return f"{int(age // 60)}m ago"
+    return f"{int(age // 3600)}h ago"
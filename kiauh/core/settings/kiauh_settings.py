@@ -18,6 +18,7 @@ from core.submodules.simple_config_parser.src.simple_config_parser.simple_config
     NoSectionError,
     SimpleConfigParser,
 )
+from utils.git_utils import CLONE_STRATEGIES, DEFAULT_CLONE_STRATEGY
 from utils.input_utils import get_confirm
 from utils.sys_utils import kill
 
@@ -46,6 +47,8 @@ class InvalidValueError(Exception):
 @dataclass
 class AppSettings:
     backup_before_update: bool | None = field(default=None)
+    clone_strategy: str | None = field(default=None)
+    use_git_cache: bool | None = field(default=None)
 
 
 @dataclass
@@ -126,7 +129,10 @@ class KiauhSettings:
             self.__kill()
 
         cfg = CUSTOM_CFG if CUSTOM_CFG.exists() else DEFAULT_CFG
-        self.config.read_file(cfg)
+        # validation only queries a few options, so the file is read lazily. a
+        # new parser is required, lazy reading only applies to an empty one.
+        self.config = SimpleConfigParser()
+        self.config.read_file(cfg, lazy=True)
 
         needs_migration = self._check_deprecated_repo_config()
         if needs_migration:
@@ -144,6 +150,10 @@ class KiauhSettings:
 
         try:
             self._validate_bool("kiauh", "backup_before_update")
+            self._validate_optional_choice(
+                "kiauh", "clone_strategy", list(CLONE_STRATEGIES)
+            )
+            self._validate_optional_bool("kiauh", "use_git_cache")
 
             self._validate_repositories("klipper", "repositories")
             self._validate_repositories("moonraker", "repositories")
@@ -175,6 +185,19 @@ class KiauhSettings:
         self._v_section, self._v_option = (section, option)
         int(self.config.getint(section, option))
 
+    def _validate_optional_bool(self, section: str, option: str) -> None:
+        if self.config.has_option(section, option):
+            self._validate_bool(section, option)
+
+    def _validate_optional_choice(
+        self, section: str, option: str, choices: List[str]
+    ) -> None:
+        self._v_section, self._v_option = (section, option)
+        if not self.config.has_option(section, option):
+            return
+        if self.config.getval(section, option) not in choices:
+            raise ValueError
+
     def _validate_str(self, section: str, option: str) -> None:
         self._v_section, self._v_option = (section, option)
         v = self.config.getval(section, option)
@@ -207,6 +230,13 @@ class KiauhSettings:
         self.kiauh.backup_before_update = self.config.getboolean(
             "kiauh", "backup_before_update"
         )
+        # optional options, config files of older versions don't define them
+        self.kiauh.clone_strategy = self.config.getval(
+            "kiauh", "clone_strategy", DEFAULT_CLONE_STRATEGY
+        )
+        self.kiauh.use_git_cache = self.config.getboolean(
+            "kiauh", "use_git_cache", False
+        )
 
         kl_repos = self.config.getval("klipper", "repositories")
         self.klipper.repositories = self.__set_repo_state(kl_repos)
@@ -246,6 +276,12 @@ class KiauhSettings:
                 "backup_before_update",
                 str(self.kiauh.backup_before_update),
             )
+        if self.kiauh.clone_strategy is not None:
+            self.config.set_option("kiauh", "clone_strategy", self.kiauh.clone_strategy)
+        if self.kiauh.use_git_cache is not None:
+            self.config.set_option(
+                "kiauh", "use_git_cache", str(self.kiauh.use_git_cache)
+            )
 
         # Handle repositories
         if self.klipper.repositories is not None:
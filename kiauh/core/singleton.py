@@ -0,0 +1,30 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+from typing import Any, Dict, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class Singleton(type):
+    """
+    Metaclass of classes with a single instance. The first call of such a
+    class creates and initializes the instance, every further call returns
+    it without running __init__ again.
+    """
+
+    __instances: Dict[type, Any] = {}
+
+    def __call__(cls: Type[T], *args: Any, **kwargs: Any) -> T:
+        instances = Singleton.__instances
+        if cls not in instances:
+            instances[cls] = super().__call__(*args, **kwargs)  # type: ignore[misc]
+        instance: T = instances[cls]
+        return instance
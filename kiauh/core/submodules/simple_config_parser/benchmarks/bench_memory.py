@@ -0,0 +1,87 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Memory benchmark for the parse tree of the SimpleConfigParser. It compares the
+slotted elements of the parser with the plain dicts it used to store per line.
+Run it from the root of the repository with:
+
+    python -m benchmarks.bench_memory [sections]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+from benchmarks.bench_parser import DEFAULT_SECTIONS, generate_config
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+
+
+def to_dict_tree(parser: SimpleConfigParser) -> Dict:
+    """Build the former representation of the config, with one dict per line"""
+    tree: Dict = {}
+    for name, section in parser.config.items():
+        if name.startswith("#_"):
+            tree[name] = list(section)
+            continue
+        tree[name] = {
+            "header": section["header"],
+            "elements": [
+                {
+                    key: list(value) if isinstance(value, list) else value
+                    for key, value in element.items()
+                }
+                for element in section["elements"]
+            ],
+        }
+    return tree
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Return the amount of memory still allocated by the result of build"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECTIONS
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cfg_file = Path(tmp_dir).joinpath("printer.cfg")
+        cfg_file.write_text(generate_config(sections))
+        line_count = len(cfg_file.read_text().splitlines())
+        print(f"config with {sections} sections and {line_count} lines\n")
+
+        def parse() -> SimpleConfigParser:
+            parser = SimpleConfigParser()
+            parser.read_file(cfg_file)
+            return parser
+
+        # the dict tree keeps the line strings of the parser it was built from,
+        # only the parser itself is released again
+        dict_tree = measure(lambda: to_dict_tree(parse()))
+        slotted_tree = measure(parse)
+
+        for name, size in (("dict elements", dict_tree), ("slotted", slotted_tree)):
+            print(
+                f"{name:<16} {size / 1024:>10.1f} KiB"
+                f" {size / line_count:>8.1f} bytes/line"
+            )
+        print(f"\nreduction: {(1 - slotted_tree / dict_tree) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
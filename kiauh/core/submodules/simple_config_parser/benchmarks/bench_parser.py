@@ -0,0 +1,141 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Benchmarks for the SimpleConfigParser on large, generated Klipper configs.
+Run them from the root of the repository with:
+
+    python -m benchmarks.bench_parser [sections]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+
+DEFAULT_SECTIONS = 1000
+ROUNDS = 5
+ASSETS_DIR = Path(__file__).parent.parent.joinpath("tests/assets")
+ASSETS_SCALE = 100
+
+
+def generate_config(sections: int) -> str:
+    """Generate a Klipper style config with steppers, macros and comments"""
+    lines: List[str] = ["# generated benchmark config\n", "\n"]
+    for i in range(sections):
+        if i % 2 == 0:
+            lines += [
+                f"[stepper_{i}]\n",
+                f"step_pin: PF{i % 16}\n",
+                f"dir_pin: !PF{(i + 1) % 16}\n",
+                "enable_pin: !PD7 # inline comment\n",
+                "microsteps: 16\n",
+                "rotation_distance: 40\n",
+                "endstop_pin: ^PE5\n",
+                "position_max: 235\n",
+                "homing_speed: 50\n",
+            ]
+        else:
+            # the option after the gcode block ends it, otherwise the parser
+            # would treat the following blank line as part of the block
+            lines += [
+                f"[gcode_macro MACRO_{i}]\n",
+                "; a comment between options\n",
+                "gcode:\n",
+                "    {% if printer.toolhead.homed_axes != 'xyz' %}\n",
+                "    G28\n",
+                "    {% endif %}\n",
+                *[f"    G1 X{n} Y{n} F6000\n" for n in range(10)],
+                "description: generated macro\n",
+            ]
+        lines.append("\n")
+    return "".join(lines)
+
+
+def generate_assets_config(scale: int) -> str:
+    """Concatenate the config files of the test assets the given number of times"""
+    content = "".join(f.read_text() for f in sorted(ASSETS_DIR.rglob("*.cfg")))
+    return content * scale
+
+
+def bench(name: str, func: Callable[[], object], rounds: int = ROUNDS) -> None:
+    """Print the best wall time of several rounds of the given function"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    print(f"{name:<32} {min(timings) * 1000:>10.2f} ms")
+
+
+def main() -> None:
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECTIONS
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cfg_file = Path(tmp_dir).joinpath("printer.cfg")
+        out_file = Path(tmp_dir).joinpath("written.cfg")
+        cfg_file.write_text(generate_config(sections))
+        line_count = len(cfg_file.read_text().splitlines())
+        print(f"config with {sections} sections and {line_count} lines\n")
+
+        def parse() -> SimpleConfigParser:
+            parser = SimpleConfigParser()
+            parser.read_file(cfg_file)
+            return parser
+
+        parser = parse()
+        section_names = parser.get_sections()
+        options = [(s, o) for s in section_names for o in parser.get_options(s)]
+
+        def lookup() -> None:
+            for section, option in options:
+                if parser.has_option(section, option):
+                    parser.getval(section, option)
+
+        def set_options() -> None:
+            p = parse()
+            for section in section_names:
+                for n in range(5):
+                    p.set_option(section, f"new_option_{n}", "value")
+                p.set_option(section, "microsteps", "32")
+
+        def add_sections() -> None:
+            p = parse()
+            for n in range(sections // 10):
+                p.add_section(f"include extra_{n}.cfg")
+
+        def lazy_query() -> None:
+            p = SimpleConfigParser()
+            p.read_file(cfg_file, lazy=True)
+            if p.has_section(section_names[-1]):
+                p.getval(section_names[-1], "description")
+
+        assets_file = Path(tmp_dir).joinpath("assets.cfg")
+        assets_file.write_text(generate_assets_config(ASSETS_SCALE))
+
+        def parse_assets() -> None:
+            SimpleConfigParser().read_file(assets_file)
+
+        bench("read_file", parse)
+        bench(f"read_file (test assets x{ASSETS_SCALE})", parse_assets)
+        bench(f"has_option + getval ({len(options)}x)", lookup)
+        bench("read_file (lazy) + getval", lazy_query)
+        bench("read_file + set_option", set_options)
+        bench("read_file + add_section", add_sections)
+        bench("write_file", lambda: parser.write_file(out_file))
+
+        if out_file.read_text() != cfg_file.read_text():
+            print("\nWARNING: written config differs from the original!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Benchmark suite for the SimpleConfigParser on generated configs from 1k to 200k
+lines. The results are compared against a baseline stored in a JSON file and
+the suite exits with status 1 if any of them regressed by more than the
+threshold. Run it from the root of the repository with:
+
+    python -m benchmarks.bench_suite [--sizes 1000 10000] [--threshold 0.25]
+                                     [--baseline FILE] [--update-baseline]
+
+Without an existing baseline, the results of the run become the baseline.
+Timings depend on the machine, so the baseline file is not versioned.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.config_generator import generate_config
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000, 200_000]
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BASELINE = Path(__file__).parent.joinpath("baseline.json")
+HISTORY_SIZE = 20
+ROUNDS = 5
+
+Results = Dict[str, Dict[str, float]]
+
+
+def bench(func: Callable[[], object], rounds: int = ROUNDS) -> float:
+    """Return the best wall time of several rounds of the given function in ms"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def run_size(lines: int, tmp_dir: Path) -> Dict[str, float]:
+    """Run all benchmarks on a generated config with the given number of lines"""
+    cfg_file = tmp_dir.joinpath(f"printer_{lines}.cfg")
+    out_file = tmp_dir.joinpath(f"written_{lines}.cfg")
+    content = generate_config(lines)
+    cfg_file.write_text(content)
+
+    def parse() -> SimpleConfigParser:
+        parser = SimpleConfigParser()
+        parser.read_file(cfg_file)
+        return parser
+
+    parser = parse()
+    sections = parser.get_sections()
+    options = [(s, o) for s in sections for o in parser.get_options(s)]
+
+    def getval() -> None:
+        for section, option in options:
+            parser.getval(section, option)
+
+    def set_option() -> None:
+        for section in sections:
+            parser.set_option(section, "bench_option", "value")
+
+    def remove_section() -> None:
+        p = parse()
+        for section in sections[::2]:
+            p.remove_section(section)
+
+    results = {
+        "read_file": bench(parse),
+        "getval": bench(getval),
+        "write_file": bench(lambda: parser.write_file(out_file)),
+        "set_option": bench(set_option),
+        # includes parsing the file, removing sections alone is too fast
+        "read_file + remove_section": bench(remove_section),
+    }
+
+    # write_file ran before any option was set, so it must be the original
+    if out_file.read_text() != content:
+        raise AssertionError(f"Round trip of the {lines} lines config failed")
+
+    return results
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """Print the results next to the baseline and return all regressions"""
+    regressions: List[str] = []
+    print(f"{'lines':>8}  {'benchmark':<28} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for size, timings in results.items():
+        for name, ms in timings.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                print(f"{size:>8}  {name:<28} {ms:>10.2f} {'-':>10} {'-':>8}")
+                continue
+            change = (ms - base) / base if base else 0.0
+            mark = ""
+            if change > threshold:
+                mark = " REGRESSION"
+                regressions.append(f"{name} ({size} lines): {change:+.0%}")
+            print(
+                f"{size:>8}  {name:<28} {ms:>10.2f} {base:>10.2f} {change:>+8.0%}{mark}"
+            )
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    arg_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    arg_parser.add_argument("--update-baseline", action="store_true")
+    args = arg_parser.parse_args()
+
+    baseline: Results = {}
+    history: List[Dict[str, Any]] = []
+    if args.baseline.exists():
+        data = json.loads(args.baseline.read_text())
+        baseline, history = data["baseline"], data["history"]
+
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            results[str(size)] = run_size(size, Path(tmp_dir))
+
+    regressions = compare(results, baseline, args.threshold)
+
+    history = [*history, {"time": time.time(), "results": results}]
+    history = history[-HISTORY_SIZE:]
+    if args.update_baseline or not baseline:
+        baseline = {**baseline, **results}
+        print(f"\nbaseline updated: {args.baseline}")
+    data = {"baseline": baseline, "history": history}
+    args.baseline.write_text(json.dumps(data, indent=2))
+
+    if regressions and not args.update_baseline:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
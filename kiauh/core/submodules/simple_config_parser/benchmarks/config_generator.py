@@ -0,0 +1,155 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+"""
+Generators for synthetic Klipper and Moonraker configs, used by the benchmark
+suite and the round trip fuzz tests.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Callable, List
+
+INDENT = " " * 4
+
+
+def _stepper(rnd: random.Random, n: int) -> List[str]:
+    return [
+        f"[stepper_{n}]\n",
+        f"step_pin: PF{rnd.randrange(16)}\n",
+        f"dir_pin: !PF{rnd.randrange(16)} # inverted\n",
+        "enable_pin: !PD7\n",
+        f"microsteps: {rnd.choice([16, 32, 64])}\n",
+        f"rotation_distance: {rnd.choice([8, 32, 40])}\n",
+        f"position_max: {rnd.randrange(200, 400)} ; max travel\n",
+    ]
+
+
+def _macro(rnd: random.Random, n: int) -> List[str]:
+    lines = [
+        f"[gcode_macro MACRO_{n}]\n",
+        "# generated macro\n",
+        f"description: macro number {n}\n",
+        "gcode:\n",
+        f"{INDENT}{{% if printer.toolhead.homed_axes != 'xyz' %}}\n",
+        f"{INDENT}G28\n",
+        f"{INDENT}{{% endif %}}\n",
+    ]
+    lines += [
+        f"{INDENT}G1 X{rnd.randrange(300)} Y{rnd.randrange(300)} F6000\n"
+        for _ in range(rnd.randrange(2, 20))
+    ]
+    # an option after the block ends it, a blank line would become part of it
+    lines.append(f"variable_count: {rnd.randrange(10)}\n")
+    return lines
+
+
+def _update_manager(rnd: random.Random, n: int) -> List[str]:
+    return [
+        f"[update_manager client_{n}]\n",
+        "type: git_repo\n",
+        f"path: ~/client_{n}\n",
+        f"origin: https://github.com/example/client_{n}.git\n",
+        "managed_services: klipper moonraker\n",
+    ]
+
+
+def _include(rnd: random.Random, n: int) -> List[str]:
+    return [f"[include {rnd.choice(['macros', 'printers', 'extras'])}/{n}.cfg]\n"]
+
+
+def _authorization(rnd: random.Random, n: int) -> List[str]:
+    return [
+        f"[authorization client_{n}]\n",
+        "cors_domains:\n",
+        f"{INDENT}*.local\n",
+        f"{INDENT}*://app.example.com\n",
+        "trusted_clients:\n",
+        f"{INDENT}10.0.0.0/8\n",
+        f"{INDENT}192.168.{rnd.randrange(256)}.0/24\n",
+        "force_logins: False\n",
+    ]
+
+
+SECTION_GENERATORS: List[Callable[[random.Random, int], List[str]]] = [
+    _stepper,
+    _macro,
+    _update_manager,
+    _include,
+    _authorization,
+]
+
+
+def generate_config(lines: int, seed: int = 0) -> str:
+    """
+    Generate a Klipper/Moonraker style config with about the given number of
+    lines. The config is in the canonical form written by the parser, so
+    reading and writing it must reproduce the exact same content.
+    """
+    rnd = random.Random(seed)
+    result: List[str] = ["# generated config\n", "\n"]
+    n = 0
+    while len(result) < lines:
+        result += rnd.choice(SECTION_GENERATORS)(rnd, n)
+        if rnd.random() < 0.2:
+            result.append(f"# comment after section {n}\n")
+        result.append("\n")
+        n += 1
+    return "".join(result)
+
+
+FUZZ_LINES = [
+    "[section]",
+    "[ section ]",
+    "[section] # comment",
+    "[section]: value",
+    "option: value",
+    "option:value",
+    "option = value",
+    "option : value",
+    "option: value # comment",
+    "option: value ; comment",
+    "option:: value",
+    "option:",
+    "option: # comment",
+    "option =",
+    ": value",
+    " indented: option",
+    "\tindented_block:",
+    "# comment",
+    "; comment",
+    "  # indented comment",
+    "",
+    " ",
+    "\t",
+    "    G28",
+    "    G1 X10 Y10",
+    "\t\tnested",
+    "    {% if x %}",
+    "value_without_separator",
+]
+
+
+def generate_fuzz_config(seed: int, lines: int = 60) -> str:
+    """
+    Generate a config from random combinations of regular lines and edge cases,
+    including malformed lines. Unlike generate_config, the result is not
+    necessarily written back unchanged by the parser.
+    """
+    rnd = random.Random(seed)
+    # options before the first section are not supported by the parser
+    result: List[str] = [rnd.choice(["# header", ""]) for _ in range(rnd.randrange(3))]
+    result.append(f"[section_{seed}]")
+    for n in range(lines):
+        line = rnd.choice(FUZZ_LINES)
+        if line.startswith("[section"):
+            line = line.replace("section", f"section_{n}")
+        result.append(line)
+    # the last line might be missing its newline
+    end = rnd.choice(["\n", ""])
+    return "\n".join(result) + end
@@ -38,6 +38,15 @@ OPTION_RE = re.compile(r"^([^;#:=\s]+)\s?[:=]\s*([^;#:=\s][^;#]*?)\s*([#;].*)?$"
 #  - the inline comment MAY be of any length and character
 OPTIONS_BLOCK_START_RE = re.compile(r"^([^;#:=\s]+)\s*[:=]\s*([#;].*)?$")
 
+# option and options block start line fused into a single pattern:
+#  - the first alternative is OPTION_RE, the second one OPTIONS_BLOCK_START_RE
+#  - group 1 is the option name, group 2 the value of an option, so if
+#    group 2 is None, the line is the start of an options block
+OPTION_OR_BLOCK_START_RE = re.compile(
+    r"^([^;#:=\s]+)"
+    r"(?:\s?[:=]\s*([^;#:=\s][^;#]*?)\s*([#;].*)?|\s*[:=]\s*([#;].*)?)$"
+)
+
 # definition of comment line:
 #  - the line MAY start with any amount of whitespace characters
 #  - the line MUST contain a # or ; - it is the comment marker
@@ -0,0 +1,161 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import sys
+from typing import Any, ClassVar, Dict, Iterator, List, Tuple, Type
+
+from ..simple_config_parser.constants import LineType
+
+
+class Element:
+    """
+    Base class of the parsed lines of a section. Elements only store their
+    fields in slots, the type of the line is given by the class itself. For
+    compatibility with the former plain dict elements, the fields can still be
+    accessed by key, e.g. `element["value"]`, and elements compare equal to
+    dicts with the same keys and values.
+    """
+
+    __slots__ = ()
+
+    type: str = ""
+    fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.type
+        if key not in self.fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "type":
+            self._set_type(value)
+        elif key in self.fields:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key == "type" or key in self.fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.fields) + 1
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Element, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    # mutable, just like the dicts it replaces
+    __hash__: ClassVar[None] = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def keys(self) -> Tuple[str, ...]:
+        return ("type",) + self.fields
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the element as a plain dict"""
+        return dict(self.items())
+
+    def _set_type(self, line_type: str) -> None:
+        """Change the line type, only possible between types sharing the same fields"""
+        cls = ELEMENT_TYPES.get(line_type)
+        if cls is None or cls.fields != self.fields:
+            raise ValueError(f"Cannot change type '{self.type}' to '{line_type}'")
+        # the classes share their slots, so the instance can simply be retyped
+        self.__class__ = cls
+
+
+class _OptionBase(Element):
+    __slots__ = ("name", "value", "raw")
+
+    fields = ("name", "value", "raw")
+
+    def __init__(self, name: str, value: str | List[str], raw: str) -> None:
+        # option names repeat across sections and printers, so all elements
+        # share a single instance of each name
+        self.name: str = sys.intern(name)
+        self.value: str | List[str] = value
+        self.raw: str = raw
+
+
+class OptionElement(_OptionBase):
+    """A single line option, e.g. `option: value`"""
+
+    __slots__ = ()
+
+    type = LineType.OPTION.value
+    value: str
+
+
+class OptionBlockElement(_OptionBase):
+    """A multiline option, its value is the list of the indented lines"""
+
+    __slots__ = ()
+
+    type = LineType.OPTION_BLOCK.value
+    value: List[str]
+
+
+class _ContentBase(Element):
+    __slots__ = ("content",)
+
+    fields = ("content",)
+
+    def __init__(self, content: str) -> None:
+        self.content: str = content
+
+
+class CommentElement(_ContentBase):
+    """A comment line"""
+
+    __slots__ = ()
+
+    type = LineType.COMMENT.value
+
+
+class BlankElement(_ContentBase):
+    """A line containing only whitespace characters"""
+
+    __slots__ = ()
+
+    type = LineType.BLANK.value
+
+
+ELEMENT_TYPES: Dict[str, Type[Element]] = {
+    cls.type: cls
+    for cls in (OptionElement, OptionBlockElement, CommentElement, BlankElement)
+}
+
+
+def element_from_dict(data: Dict[str, Any]) -> Element:
+    """Create an element from its plain dict form, as returned by to_dict()"""
+    line_type = data["type"]
+    if line_type == OptionElement.type:
+        return OptionElement(data["name"], data["value"], data["raw"])
+    if line_type == OptionBlockElement.type:
+        return OptionBlockElement(data["name"], data["value"], data["raw"])
+    if line_type == CommentElement.type:
+        return CommentElement(data["content"])
+    if line_type == BlankElement.type:
+        return BlankElement(data["content"])
+    raise ValueError(f"Unknown line type '{line_type}'")
@@ -0,0 +1,89 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from ..simple_config_parser.constants import SECTION_RE
+
+
+class LazySource:
+    """
+    Read-only view of the raw bytes of a config file. Only the section headers
+    are decoded up front to build an index of the byte range of each section,
+    the lines of a section are decoded when they are requested. The file is
+    read at once and not memory mapped, a mapping would be kept open as long
+    as the parser lives and reading it fails if the file is truncated.
+    """
+
+    def __init__(self, data: bytes, encoding: str) -> None:
+        self._data = data
+        self._encoding = encoding
+        # maps section name -> (start of the header line, end of the section)
+        self.sections: Dict[str, Tuple[int, int]] = self._index_sections()
+
+    @classmethod
+    def open(cls, file: Path) -> LazySource | None:
+        """
+        Read the given file. Returns None for files which can't be split into
+        lines the same way as a file opened in text mode, which are files
+        containing carriage returns, and for empty files.
+        """
+        with open(file, "rb") as f:
+            data = f.read()
+
+        # text mode translates all kinds of newlines, only "\n" is supported here
+        if not data or b"\r" in data:
+            return None
+
+        # same encoding as used by read_file() and write_file() of the parser
+        return cls(data, "utf-8")
+
+    def _index_sections(self) -> Dict[str, Tuple[int, int]]:
+        """Find all section headers, which are lines starting with '['"""
+        data = self._data
+        candidates: List[int] = [0] if data[:1] == b"[" else []
+        pos = data.find(b"\n[")
+        while pos != -1:
+            candidates.append(pos + 1)
+            pos = data.find(b"\n[", pos + 1)
+
+        starts: List[Tuple[str, int]] = []
+        for start in candidates:
+            line_end = data.find(b"\n", start)
+            line_end = len(data) if line_end == -1 else line_end + 1
+            match = SECTION_RE.match(data[start:line_end].decode(self._encoding))
+            if match is not None:
+                starts.append((match.group(1), start))
+
+        sections: Dict[str, Tuple[int, int]] = {}
+        for i, (name, start) in enumerate(starts):
+            end = starts[i + 1][1] if i + 1 < len(starts) else len(data)
+            # like the full parse, a section defined twice keeps the position
+            # of its first definition but the content of the last one
+            sections[name] = (start, end)
+        return sections
+
+    def has_section(self, section: str) -> bool:
+        return section in self.sections
+
+    def read_section(self, section: str) -> List[str]:
+        """Return the lines of a section, including its header"""
+        start, end = self.sections[section]
+        return self._read_lines(start, end)
+
+    def read_all(self) -> List[str]:
+        """Return all lines of the file"""
+        return self._read_lines(0, len(self._data))
+
+    def _read_lines(self, start: int, end: int) -> List[str]:
+        # StringIO splits at "\n" only, just like iterating over a text file
+        return list(io.StringIO(self._data[start:end].decode(self._encoding)))
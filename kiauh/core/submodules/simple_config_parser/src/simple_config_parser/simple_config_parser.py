@@ -8,18 +8,29 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, TextIO
 
 from ..simple_config_parser.constants import (
     BOOLEAN_STATES,
     EMPTY_LINE_RE,
     HEADER_IDENT,
     LINE_COMMENT_RE,
+    OPTION_OR_BLOCK_START_RE,
     OPTION_RE,
     OPTIONS_BLOCK_START_RE,
     SECTION_RE, LineType, INDENT,
 )
+from ..simple_config_parser.elements import (
+    BlankElement,
+    CommentElement,
+    Element,
+    OptionBlockElement,
+    OptionElement,
+    element_from_dict,
+)
+from ..simple_config_parser.lazy_source import LazySource
 
 _UNSET = object()
 
@@ -61,10 +72,21 @@ class SimpleConfigParser:
 
     def __init__(self) -> None:
         self.header: List[str] = []
-        self.config: Dict = {}
+        self._config: Dict = {}
+        # source of a lazily read file, as long as it isn't fully parsed
+        self._lazy: LazySource | None = None
+        # parsers of the sections of the lazy source parsed so far
+        self._lazy_sections: Dict[str, SimpleConfigParser] = {}
         self.current_section: str | None = None
         self.current_opt_block: str | None = None
+        self.current_opt_block_element: OptionBlockElement | None = None
         self.in_option_block: bool = False
+        # maps section -> option name -> the first element defining the option.
+        # it is kept up to date by all methods modifying the config, so lookups
+        # don't need to scan the elements of a section.
+        self._option_index: Dict[
+            str, Dict[str, OptionElement | OptionBlockElement]
+        ] = {}
 
     def _match_section(self, line: str) -> bool:
         """Wheter or not the given line matches the definition of a section"""
@@ -88,133 +110,248 @@ class SimpleConfigParser:
 
     def _parse_line(self, line: str) -> None:
         """Parses a line and determines its type"""
-        if self._match_section(line):
-            self.current_opt_block = None
-            self.current_section = SECTION_RE.match(line).group(1)
-            self.config[self.current_section] = {
-                "header": line,
-                "elements": []
-            }
+        # sections, options and options block starts must begin with a
+        # character other than whitespace or a comment marker, so for all other
+        # lines there is no need to try any of the patterns
+        first_char = line[:1]
+        if first_char and not first_char.isspace() and first_char not in "#;":
+            section_match = SECTION_RE.match(line) if first_char == "[" else None
+            if section_match is not None:
+                self.current_opt_block = None
+                self.current_opt_block_element = None
+                self.current_section = section_match.group(1)
+                self._config[self.current_section] = {
+                    "header": line,
+                    "elements": []
+                }
+                self._option_index[self.current_section] = {}
+                return
 
-        elif self._match_option(line):
-            self.current_opt_block = None
-            option = OPTION_RE.match(line).group(1)
-            value = OPTION_RE.match(line).group(2)
-            self.config[self.current_section]["elements"].append({
-                "type": LineType.OPTION.value,
-                "name": option,
-                "value": value,
-                "raw": line
-            })
-
-        elif self._match_options_block_start(line):
-            option = OPTIONS_BLOCK_START_RE.match(line).group(1)
-            self.current_opt_block = option
-            self.config[self.current_section]["elements"].append({
-                "type": LineType.OPTION_BLOCK.value,
-                "name": option,
-                "value": [],
-                "raw": line
-            })
-
-        elif self.current_opt_block is not None:
+            option_match = OPTION_OR_BLOCK_START_RE.match(line)
+            if option_match is not None and option_match.group(2) is not None:
+                self.current_opt_block = None
+                self.current_opt_block_element = None
+                self._append_option(
+                    self.current_section,
+                    OptionElement(option_match.group(1), option_match.group(2), line),
+                )
+                return
+
+            if option_match is not None:
+                self.current_opt_block = option_match.group(1)
+                self.current_opt_block_element = OptionBlockElement(
+                    option_match.group(1), [], line
+                )
+                self._append_option(
+                    self.current_section, self.current_opt_block_element
+                )
+                return
+
+        if self.current_opt_block_element is not None:
             # we are in an option block, so we add the line to the option's value
-            for element in reversed(self.config[self.current_section]["elements"]):
-                if element["type"] == LineType.OPTION_BLOCK.value and element["name"] == self.current_opt_block:
-                    element["value"].append(line.strip()) # indentation is removed
-                    break
+            self.current_opt_block_element.value.append(line.strip()) # indentation is removed
+            return
 
-        elif self._match_empty_line(line) or self._match_line_comment(line):
+        stripped_line = line.lstrip()
+        if not stripped_line or stripped_line[0] in "#;":
             self.current_opt_block = None
 
             # if current_section is None, we are at the beginning of the file,
             # so we consider the part up to the first section as the file header
             if not self.current_section:
-                self.config.setdefault(HEADER_IDENT, []).append(line)
+                self._config.setdefault(HEADER_IDENT, []).append(line)
             else:
-                element_type = LineType.BLANK.value if self._match_empty_line(line) else LineType.COMMENT.value
-                self.config[self.current_section]["elements"].append({
-                    "type": element_type,
-                    "content": line
-                })
-
-    def read_file(self, file: Path) -> None:
-        """Read and parse a config file"""
-        with open(file, "r") as file:
-            for line in file:
+                element_cls = BlankElement if not stripped_line else CommentElement
+                self._config[self.current_section]["elements"].append(element_cls(line))
+
+    @property
+    def config(self) -> Dict:
+        """The parsed config, a lazily read file is parsed completely on access"""
+        self._load()
+        return self._config
+
+    @config.setter
+    def config(self, config: Dict) -> None:
+        """Replace the parsed config, plain dict elements are converted to elements"""
+        self._lazy = None
+        self._lazy_sections = {}
+        self._config = config
+        self._option_index = {}
+        for section, content in config.items():
+            if section == HEADER_IDENT:
+                continue
+            content["elements"] = [
+                e if isinstance(e, Element) else element_from_dict(e)
+                for e in content["elements"]
+            ]
+            self._rebuild_option_index(section)
+
+    def read_file(self, file: Path, lazy: bool = False) -> None:
+        """
+        Read and parse a config file
+
+        With lazy=True only the section headers of the file are indexed.
+        Sections are parsed when one of their options is queried, the full
+        parse is deferred until the config is modified, written or accessed
+        directly. This only applies to a parser without any content.
+        """
+        self._load()
+        if lazy and not self._config:
+            self._lazy = LazySource.open(file)
+            if self._lazy is not None:
+                return
+
+        # the same encoding as used by write_file()
+        with open(file, "r", encoding="utf-8") as f:
+            for line in f:
                 self._parse_line(line)
 
+    def read_string(self, content: str) -> None:
+        """Parse a config from a string"""
+        self._load()
+        # universal newlines, just like a file opened in text mode
+        for line in io.StringIO(content, newline=None):
+            self._parse_line(line)
+
+    def _load(self) -> None:
+        """Fully parse a lazily read file"""
+        if self._lazy is None:
+            return
+        source, self._lazy = self._lazy, None
+        self._lazy_sections = {}
+        for line in source.read_all():
+            self._parse_line(line)
+
+    def _get_lazy_section(
+        self, source: LazySource, section: str
+    ) -> SimpleConfigParser:
+        """Return a parser containing only the given section of the lazy source"""
+        parser = self._lazy_sections.get(section)
+        if parser is None:
+            parser = self._lazy_sections[section] = SimpleConfigParser()
+            for line in source.read_section(section):
+                parser._parse_line(line)
+        return parser
+
     def write_file(self, path: str | Path) -> None:
         """Write the config to a file"""
         if path is None:
             raise ValueError("File path cannot be None")
 
+        # a lazily read file must be parsed before it is truncated for writing
+        self._load()
         with open(path, "w", encoding="utf-8") as f:
-            if HEADER_IDENT in self.config:
-                for line in self.config[HEADER_IDENT]:
-                    f.write(line)
-
-            sections = self.get_sections()
-            for i, section in enumerate(sections):
-                f.write(self.config[section]["header"])
-
-                for element in self.config[section]["elements"]:
-                    if element["type"] == LineType.OPTION.value:
-                        f.write(element["raw"])
-                    elif element["type"] == LineType.OPTION_BLOCK.value:
-                        f.write(element["raw"])
-                        for line in element["value"]:
-                            f.write(INDENT + line.strip() + "\n")
-                    elif element["type"] in [LineType.COMMENT.value, LineType.BLANK.value]:
-                        f.write(element["content"])
-                    else:
-                        raise UnknownLineError(element["raw"])
-
-            # Ensure file ends with a single newline
-            if sections:  # Only if we have any sections
-                last_section = sections[-1]
-                last_elements = self.config[last_section]["elements"]
-
-                if last_elements:
-                    last_element = last_elements[-1]
-                    if "raw" in last_element:
-                        last_line = last_element["raw"]
-                    else:  # comment or blank line
-                        last_line = last_element["content"]
-
-                    if not last_line.endswith("\n"):
-                        f.write("\n")
+            self.write(f)
+
+    def write(self, f: TextIO) -> None:
+        """Write the config to a file object"""
+        self._load()
+
+        if HEADER_IDENT in self._config:
+            for line in self._config[HEADER_IDENT]:
+                f.write(line)
+
+        sections = self.get_sections()
+        for i, section in enumerate(sections):
+            f.write(self._config[section]["header"])
+
+            for element in self._config[section]["elements"]:
+                if isinstance(element, OptionElement):
+                    f.write(element.raw)
+                elif isinstance(element, OptionBlockElement):
+                    f.write(element.raw)
+                    for line in element.value:
+                        f.write(INDENT + line.strip() + "\n")
+                elif isinstance(element, (CommentElement, BlankElement)):
+                    f.write(element.content)
+                else:
+                    raise UnknownLineError(element["raw"])
+
+        # Ensure file ends with a single newline
+        if sections:  # Only if we have any sections
+            last_section = sections[-1]
+            last_elements = self._config[last_section]["elements"]
+
+            if last_elements:
+                last_element = last_elements[-1]
+                if "raw" in last_element:
+                    last_line = last_element["raw"]
+                else:  # comment or blank line
+                    last_line = last_element["content"]
+
+                if not last_line.endswith("\n"):
+                    f.write("\n")
 
     def get_sections(self) -> List[str]:
         """Return a list of all section names, but exclude any section starting with '#_'"""
+        sections = self._lazy.sections if self._lazy is not None else self._config
         return list(
             filter(
                 lambda section: not section.startswith("#_"),
-                self.config.keys(),
+                sections.keys(),
             )
         )
 
     def has_section(self, section: str) -> bool:
         """Check if a section exists"""
-        return section in self.get_sections()
+        if section.startswith("#_"):
+            return False
+        if self._lazy is not None:
+            return self._lazy.has_section(section)
+        return section in self._config
 
-    def add_section(self, section: str) -> None:
-        """Add a new section to the config"""
-        if section in self.get_sections():
+    def add_section(self, section: str, at_top: bool = False) -> None:
+        """
+        Add a new section to the config. By default, it is appended after the
+        last section, with at_top=True it is inserted before the first section.
+        """
+        self._load()
+        if self.has_section(section):
             raise DuplicateSectionError(section)
 
-        if len(self.get_sections()) >= 1:
-            self._check_set_section_spacing()
+        if at_top:
+            self._prepend_section(section)
+            return
+
+        prev_section_name = self._get_last_section()
+        if prev_section_name is not None:
+            self._check_set_section_spacing(prev_section_name)
 
-        self.config[section] = {
+        self._config[section] = {
             "header": f"[{section}]\n",
             "elements": []
         }
-
-    def _check_set_section_spacing(self):
+        self._option_index[section] = {}
+
+    def _prepend_section(self, section: str) -> None:
+        """Insert a new section after the file header but before all other sections"""
+        new_section: Dict = {"header": f"[{section}]\n", "elements": []}
+        if self.get_sections():
+            new_section["elements"].append(BlankElement("\n"))
+
+        # the order of the sections is the insertion order of the dict
+        config: Dict = {}
+        header = self._config.get(HEADER_IDENT)
+        if header is not None:
+            if not header[-1].endswith("\n"):
+                header[-1] += "\n"
+            config[HEADER_IDENT] = header
+        config[section] = new_section
+        config.update(self._config)
+        self._config = config
+        self._option_index[section] = {}
+
+    def _get_last_section(self) -> str | None:
+        """Return the name of the last section or None if there are no sections"""
+        sections: List[str] = list(self._config)
+        for section in reversed(sections):
+            if not section.startswith("#_"):
+                return section
+        return None
+
+    def _check_set_section_spacing(self, prev_section_name: str):
         """Check if there is a blank line between the last section and the new section"""
-        prev_section_name: str = self.get_sections()[-1]
-        prev_section = self.config[prev_section_name]
+        prev_section = self._config[prev_section_name]
         prev_elements = prev_section["elements"]
 
         if prev_elements:
@@ -230,89 +367,125 @@ class SimpleConfigParser:
 
                 # If the last element is not a blank line, add a blank line
                 if last_content.strip() != "":
-                    prev_elements.append({
-                        "type": "blank",
-                        "content": "\n"
-                    })
+                    prev_elements.append(BlankElement("\n"))
             else:
                 # If the last element is an option, add a blank line
-                prev_elements.append({
-                    "type": LineType.BLANK.value,
-                    "content": "\n"
-                })
+                prev_elements.append(BlankElement("\n"))
 
     def remove_section(self, section: str) -> None:
         """Remove a section from the config"""
-        self.config.pop(section, None)
+        self._load()
+        self._config.pop(section, None)
+        self._option_index.pop(section, None)
+
+    def _append_option(
+        self, section: str | None, element: OptionElement | OptionBlockElement
+    ) -> None:
+        """Append an option element to a section and add it to the option index"""
+        if section is None:
+            # an option in front of the first section, which has no section to
+            # be added to, raises a KeyError just like the former parser did
+            raise KeyError(section)
+        self._config[section]["elements"].append(element)
+        self._option_index[section].setdefault(element.name, element)
+
+    def _get_option_element(
+        self, section: str, option: str
+    ) -> OptionElement | OptionBlockElement | None:
+        """Return the element defining the given option or None if there is none"""
+        if not self.has_section(section):
+            return None
+        if self._lazy is not None:
+            lazy_section = self._get_lazy_section(self._lazy, section)
+            return lazy_section._get_option_element(section, option)
+        return self._option_index[section].get(option)
+
+    def _rebuild_option_index(self, section: str) -> None:
+        """Rebuild the option index of a section from its elements"""
+        index: Dict[str, OptionElement | OptionBlockElement] = {}
+        for element in self._config[section]["elements"]:
+            if isinstance(element, (OptionElement, OptionBlockElement)):
+                index.setdefault(element.name, element)
+        self._option_index[section] = index
 
     def get_options(self, section: str) -> List[str]:
         """Return a list of all option names for a given section"""
+        if self._lazy is not None and self.has_section(section):
+            return self._get_lazy_section(self._lazy, section).get_options(section)
+
         options = []
         if self.has_section(section):
-            for element in self.config[section]["elements"]:
-                if element["type"] in [LineType.OPTION.value, LineType.OPTION_BLOCK.value]:
-                    options.append(element["name"])
+            for element in self._config[section]["elements"]:
+                if isinstance(element, (OptionElement, OptionBlockElement)):
+                    options.append(element.name)
         return options
 
     def has_option(self, section: str, option: str) -> bool:
         """Check if an option exists in a section"""
-        return self.has_section(section) and option in self.get_options(section)
+        return self._get_option_element(section, option) is not None
 
     def set_option(self, section: str, option: str, value: str | List[str]) -> None:
         """
         Set the value of an option in a section. If the section does not exist,
         it is created. If the option does not exist, it is created.
         """
+        self._load()
         if not self.has_section(section):
             self.add_section(section)
 
         # Check if option already exists
-        for element in self.config[section]["elements"]:
-            if element["type"] in [LineType.OPTION.value, LineType.OPTION_BLOCK.value] and element["name"] == option:
-                # Update existing option
-                if isinstance(value, list):
-                    element["type"] = LineType.OPTION_BLOCK.value
-                    element["value"] = value
-                    element["raw"] = f"{option}:\n"
-                else:
-                    element["type"] = LineType.OPTION.value
-                    element["value"] = value
-                    element["raw"] = f"{option}: {value}\n"
-                return
+        element = self._get_option_element(section, option)
+        if element is not None:
+            # Update existing option
+            if isinstance(value, list):
+                element["type"] = LineType.OPTION_BLOCK.value
+                element["value"] = value
+                element["raw"] = f"{option}:\n"
+            else:
+                element["type"] = LineType.OPTION.value
+                element["value"] = value
+                element["raw"] = f"{option}: {value}\n"
+            return
 
         # Option doesn't exist, create new one
+        new_element: OptionElement | OptionBlockElement
         if isinstance(value, list):
-            new_element = {
-                "type": LineType.OPTION_BLOCK.value,
-                "name": option,
-                "value": value,
-                "raw": f"{option}:\n"
-            }
+            new_element = OptionBlockElement(option, value, f"{option}:\n")
         else:
-            new_element = {
-                "type": LineType.OPTION.value,
-                "name": option,
-                "value": value,
-                "raw": f"{option}: {value}\n"
-            }
-
-        # scan through elements to find the last option, after which we insert the new option
+            new_element = OptionElement(option, value, f"{option}: {value}\n")
+
+        # scan backwards through elements to find the last option, after which
+        # we insert the new option. usually only a few trailing comments and
+        # blank lines have to be skipped.
         insert_pos = 0
-        elements = self.config[section]["elements"]
-        for i, element in enumerate(elements):
-            if element["type"] in [LineType.OPTION.value, LineType.OPTION_BLOCK.value]:
+        elements = self._config[section]["elements"]
+        for i in range(len(elements) - 1, -1, -1):
+            if isinstance(elements[i], (OptionElement, OptionBlockElement)):
                 insert_pos = i + 1
+                break
+
+        # the last line of a file might not end with a newline, which would
+        # join it with the new option when written
+        if insert_pos > 0 and not elements[insert_pos - 1].raw.endswith("\n"):
+            elements[insert_pos - 1].raw += "\n"
 
         elements.insert(insert_pos, new_element)
+        self._option_index[section][option] = new_element
 
     def remove_option(self, section: str, option: str) -> None:
         """Remove an option from a section"""
-        if self.has_section(section):
-            elements = self.config[section]["elements"]
-            for i, element in enumerate(elements):
-                if element["type"] in [LineType.OPTION.value, LineType.OPTION_BLOCK.value] and element["name"] == option:
-                    elements.pop(i)
-                    break
+        self._load()
+        element = self._get_option_element(section, option)
+        if element is None:
+            return
+
+        elements = self._config[section]["elements"]
+        for i, e in enumerate(elements):
+            if e is element:
+                elements.pop(i)
+                break
+        # another element might define the same option
+        self._rebuild_option_index(section)
 
     def getval(
         self, section: str, option: str, fallback: str | _UNSET = _UNSET
@@ -324,27 +497,24 @@ class SimpleConfigParser:
         a fallback value.
         """
         try:
-            if section not in self.get_sections():
+            if not self.has_section(section):
                 raise NoSectionError(section)
-            if option not in self.get_options(section):
+            element = self._get_option_element(section, option)
+            if element is None:
                 raise NoOptionError(option, section)
 
-            # Find the option in the elements list
-            for element in self.config[section]["elements"]:
-                if element["type"] in [LineType.OPTION.value, LineType.OPTION_BLOCK.value] and element["name"] == option:
-                    raw_value = element["value"]
-                    if isinstance(raw_value, str) and raw_value.endswith("\n"):
-                        return raw_value[:-1].strip()
-                    elif isinstance(raw_value, list):
-                        values: List[str] = []
-                        for i, val in enumerate(raw_value):
-                            val = val.strip().strip("\n")
-                            if len(val) < 1:
-                                continue
-                            values.append(val.strip())
-                        return values
-                    return str(raw_value)
-            raise NoOptionError(option, section)
+            raw_value = element.value
+            if isinstance(raw_value, str) and raw_value.endswith("\n"):
+                return raw_value[:-1].strip()
+            elif isinstance(raw_value, list):
+                values: List[str] = []
+                for i, val in enumerate(raw_value):
+                    val = val.strip().strip("\n")
+                    if len(val) < 1:
+                        continue
+                    values.append(val.strip())
+                return values
+            return str(raw_value)
         except (NoSectionError, NoOptionError):
             if fallback is _UNSET:
                 raise
@@ -7,10 +7,17 @@
 # ======================================================================= #
 import json
 from pathlib import Path
+from typing import Dict
 
 import pytest
 
-from src.simple_config_parser.constants import HEADER_IDENT, LineType
+from src.simple_config_parser.constants import (
+    HEADER_IDENT,
+    OPTION_RE,
+    OPTIONS_BLOCK_START_RE,
+    SECTION_RE,
+    LineType,
+)
 from src.simple_config_parser.simple_config_parser import SimpleConfigParser
 from tests.utils import load_testdata_from_file
 
@@ -77,3 +84,102 @@ def test_option_block_parsing(parser):
         f"Expected values: {expected_values}, "
         f"got: {option_block['value']}"
     )
+
+
+def parse_with_single_patterns(lines):
+    """
+    Reference implementation of the line classification, trying the pattern of
+    every line type one after another, as the parser originally did
+    """
+    parser = SimpleConfigParser()
+    config: Dict = {}
+    section, opt_block = None, None
+    for line in lines:
+        if parser._match_section(line):  # noqa
+            opt_block = None
+            section = SECTION_RE.match(line).group(1)
+            config[section] = {"header": line, "elements": []}
+        elif parser._match_option(line):  # noqa
+            opt_block = None
+            match = OPTION_RE.match(line)
+            config[section]["elements"].append({
+                "type": LineType.OPTION.value,
+                "name": match.group(1),
+                "value": match.group(2),
+                "raw": line,
+            })
+        elif parser._match_options_block_start(line):  # noqa
+            opt_block = {
+                "type": LineType.OPTION_BLOCK.value,
+                "name": OPTIONS_BLOCK_START_RE.match(line).group(1),
+                "value": [],
+                "raw": line,
+            }
+            config[section]["elements"].append(opt_block)
+        elif opt_block is not None:
+            opt_block["value"].append(line.strip())
+        elif parser._match_empty_line(line) or parser._match_line_comment(line):  # noqa
+            if not section:
+                config.setdefault(HEADER_IDENT, []).append(line)
+            else:
+                is_empty = parser._match_empty_line(line)  # noqa
+                config[section]["elements"].append({
+                    "type": LineType.BLANK.value if is_empty else LineType.COMMENT.value,
+                    "content": line,
+                })
+    return config
+
+
+# all config assets and the line matching test data
+TEST_ROOT = BASE_DIR.parent
+ASSET_FILES = sorted(p for p in TEST_ROOT.rglob("*") if p.suffix in (".cfg", ".txt"))
+EDGE_CASE_LINES = [
+    "[section]",
+    "[section]: value",
+    "[ section ]",
+    "option:value",
+    "option :value",
+    "option  : value",
+    "option  :",
+    "option =",
+    ": value",
+    "= value",
+    "option:: value",
+    " indented: option",
+    "\tindented_block:",
+    "  # indented comment",
+    "; comment",
+    " ",
+    "\x0c",
+    "gcode: # comment",
+    "    G28",
+    "",
+    "   ",
+]
+
+
+@pytest.mark.parametrize(
+    "file", ASSET_FILES, ids=lambda p: str(p.relative_to(TEST_ROOT))
+)
+def test_parse_tree_matches_single_patterns(file):
+    with open(file, "r") as f:
+        lines = f.readlines()
+    lines = ["[start]\n"] + lines
+
+    parser = SimpleConfigParser()
+    for line in lines:
+        parser._parse_line(line)  # noqa
+
+    assert parser.config == parse_with_single_patterns(lines)
+
+
+def test_parse_tree_matches_single_patterns_edge_cases():
+    lines = ["[start]"]
+    for line in EDGE_CASE_LINES:
+        lines += [line, "block:", line, line + "\n"]
+
+    parser = SimpleConfigParser()
+    for line in lines:
+        parser._parse_line(line)  # noqa
+
+    assert parser.config == parse_with_single_patterns(lines)
@@ -0,0 +1,156 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from pathlib import Path
+
+import pytest
+
+from src.simple_config_parser.simple_config_parser import (
+    NoOptionError,
+    NoSectionError,
+    SimpleConfigParser,
+)
+
+BASE_DIR = Path(__file__).parent.parent.joinpath("assets")
+CONFIG_FILES = [
+    "test_config_1.cfg",
+    "test_config_2.cfg",
+    "test_config_3.cfg",
+    "klipper_config.txt",
+]
+
+
+def read(path: Path, lazy: bool) -> SimpleConfigParser:
+    parser = SimpleConfigParser()
+    parser.read_file(path, lazy=lazy)
+    return parser
+
+
+@pytest.fixture(params=CONFIG_FILES)
+def cfg_file(request):
+    return BASE_DIR.joinpath(request.param)
+
+
+def test_lazy_read_defers_parsing(cfg_file):
+    parser = read(cfg_file, lazy=True)
+
+    assert parser._lazy is not None  # noqa
+    assert parser._config == {}  # noqa
+
+
+def test_lazy_queries_match_full_parse(cfg_file):
+    eager = read(cfg_file, lazy=False)
+    lazy = read(cfg_file, lazy=True)
+
+    assert lazy.get_sections() == eager.get_sections()
+    for section in eager.get_sections():
+        assert lazy.has_section(section)
+        assert lazy.get_options(section) == eager.get_options(section)
+        for option in eager.get_options(section):
+            assert lazy.has_option(section, option)
+            assert lazy.getval(section, option) == eager.getval(section, option)
+
+    # only queries were made, so the file is still not parsed completely
+    assert lazy._lazy is not None  # noqa
+
+
+def test_lazy_missing_section_and_option(cfg_file):
+    parser = read(cfg_file, lazy=True)
+
+    assert not parser.has_section("not_a_section")
+    assert parser.get_options("not_a_section") == []
+    assert parser.getval("not_a_section", "option", fallback=None) is None
+    with pytest.raises(NoSectionError):
+        parser.getval("not_a_section", "option")
+
+    section = parser.get_sections()[0]
+    assert not parser.has_option(section, "not_an_option")
+    with pytest.raises(NoOptionError):
+        parser.getval(section, "not_an_option")
+
+
+def test_lazy_config_access_parses_file(cfg_file):
+    eager = read(cfg_file, lazy=False)
+    lazy = read(cfg_file, lazy=True)
+
+    assert lazy.config == eager.config
+    assert lazy._lazy is None  # noqa
+
+
+def test_lazy_mutation_parses_file(tmp_path, cfg_file):
+    eager = read(cfg_file, lazy=False)
+    lazy = read(cfg_file, lazy=True)
+    first_section, last_section = eager.get_sections()[0], eager.get_sections()[-1]
+
+    for parser in (eager, lazy):
+        parser.set_option(first_section, "new_option", "value")
+        parser.remove_section(last_section)
+        parser.add_section("new_section")
+
+    assert lazy._lazy is None  # noqa
+    assert lazy.config == eager.config
+
+    eager.write_file(tmp_path.joinpath("eager.cfg"))
+    lazy.write_file(tmp_path.joinpath("lazy.cfg"))
+    assert (
+        tmp_path.joinpath("lazy.cfg").read_text()
+        == tmp_path.joinpath("eager.cfg").read_text()
+    )
+
+
+def test_lazy_write_file_is_unchanged(tmp_path, cfg_file):
+    out_file = tmp_path.joinpath("written.cfg")
+    eager_file = tmp_path.joinpath("eager.cfg")
+
+    read(cfg_file, lazy=True).write_file(out_file)
+    read(cfg_file, lazy=False).write_file(eager_file)
+
+    assert out_file.read_text() == eager_file.read_text()
+
+
+@pytest.mark.parametrize("content", ["", "[section]\r\noption: value\r\n"])
+def test_lazy_read_falls_back_to_full_parse(tmp_path, content):
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    cfg_file.write_bytes(content.encode())
+
+    parser = read(cfg_file, lazy=True)
+
+    assert parser._lazy is None  # noqa
+    assert parser.config == read(cfg_file, lazy=False).config
+
+
+def test_lazy_write_to_source_file(tmp_path, cfg_file):
+    tmp_file = tmp_path.joinpath("printer.cfg")
+    tmp_file.write_text(cfg_file.read_text())
+    expected_file = tmp_path.joinpath("expected.cfg")
+    read(cfg_file, lazy=False).write_file(expected_file)
+
+    read(tmp_file, lazy=True).write_file(tmp_file)
+
+    assert tmp_file.read_text() == expected_file.read_text()
+
+
+def test_lazy_hides_internal_sections(tmp_path):
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    cfg_file.write_text("[#_internal]\noption: value\n\n[section]\noption: value\n")
+    eager = read(cfg_file, lazy=False)
+    lazy = read(cfg_file, lazy=True)
+
+    assert lazy.get_sections() == eager.get_sections() == ["section"]
+    assert not lazy.has_section("#_internal")
+    assert lazy.getval("#_internal", "option", "fallback") == "fallback"
+
+
+def test_lazy_source_is_not_affected_by_truncation(tmp_path, cfg_file):
+    tmp_file = tmp_path.joinpath("printer.cfg")
+    tmp_file.write_text(cfg_file.read_text())
+    eager = read(tmp_file, lazy=False)
+    lazy = read(tmp_file, lazy=True)
+
+    tmp_file.write_text("")
+    for section in eager.get_sections():
+        assert lazy.get_options(section) == eager.get_options(section)
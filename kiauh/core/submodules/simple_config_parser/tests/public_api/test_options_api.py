@@ -12,6 +12,7 @@ from src.simple_config_parser.constants import LineType
 from src.simple_config_parser.simple_config_parser import (
     NoOptionError,
     NoSectionError,
+    SimpleConfigParser,
 )
 
 
@@ -184,3 +185,53 @@ def test_set_new_option(parser):
 def test_remove_option(parser):
     parser.remove_option("section_1", "option_1")
     assert parser.has_option("section_1", "option_1") is False
+
+
+def test_remove_duplicate_option():
+    parser = SimpleConfigParser()
+    for line in ["[section]", "option: first", "option: second"]:
+        parser._parse_line(line)  # noqa
+
+    assert parser.getval("section", "option") == "first"
+    parser.remove_option("section", "option")
+    assert parser.getval("section", "option") == "second"
+    parser.remove_option("section", "option")
+    assert parser.has_option("section", "option") is False
+
+
+def test_set_option_after_remove_section(parser):
+    parser.remove_section("section_1")
+    assert parser.has_option("section_1", "option_1") is False
+    with pytest.raises(NoSectionError):
+        parser.getval("section_1", "option_1")
+
+    parser.set_option("section_1", "option_1", "new_value")
+    assert parser.getval("section_1", "option_1") == "new_value"
+    assert parser.get_options("section_1") == ["option_1"]
+
+
+def test_set_option_updates_existing_element(parser):
+    elements = parser.config["section_1"]["elements"]
+    pre_set_count = len(elements)
+    parser.set_option("section_1", "option_1", ["value_1", "value_2"])
+    assert len(elements) == pre_set_count
+    assert parser.getval("section_1", "option_1") == ["value_1", "value_2"]
+
+
+def test_assign_config(parser):
+    # former versions exposed the config as a plain attribute of dicts
+    config = {
+        "section": {
+            "header": "[section]\n",
+            "elements": [
+                {"type": "option", "name": "option", "value": "value", "raw": ""},
+                {"type": "blank", "content": "\n"},
+            ],
+        }
+    }
+    parser.config = config
+
+    assert parser.get_sections() == ["section"]
+    assert parser.getval("section", "option") == "value"
+    parser.set_option("section", "option", "new value")
+    assert parser.getval("section", "option") == "new value"
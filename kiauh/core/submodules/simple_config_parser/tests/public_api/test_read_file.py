@@ -20,3 +20,20 @@ def test_read_file():
     parser.read_file(TEST_DATA_PATH)
     assert parser.config is not None
     assert parser.config.keys() is not None
+
+
+def test_read_file_is_utf8(tmp_path):
+    # read with the same encoding write_file uses, regardless of the locale
+    content = '[gcode_macro GRÜßE]\ngcode:\n    RESPOND MSG="Hallo Welt – ✓"\n'
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    cfg_file.write_bytes(content.encode("utf-8"))
+
+    for lazy in (False, True):
+        parser = SimpleConfigParser()
+        parser.read_file(cfg_file, lazy=lazy)
+        assert parser.getval("gcode_macro GRÜßE", "gcode") == [
+            'RESPOND MSG="Hallo Welt – ✓"'
+        ]
+        out_file = tmp_path.joinpath(f"written_{lazy}.cfg")
+        parser.write_file(out_file)
+        assert out_file.read_bytes() == content.encode("utf-8")
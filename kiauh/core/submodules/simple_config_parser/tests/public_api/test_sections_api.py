@@ -63,3 +63,21 @@ def test_remove_section(parser):
     assert parser.has_section("section_1") is False
     assert len(parser.get_sections()) == pre_remove_count - 1
     assert "section_1" not in parser.config
+
+
+def test_add_section_at_top(parser):
+    first_section = parser.get_sections()[0]
+    parser.add_section("new_section", at_top=True)
+
+    assert parser.get_sections()[0] == "new_section"
+    assert parser.get_sections()[1] == first_section
+    assert parser.config["new_section"]["elements"] == [
+        {"type": "blank", "content": "\n"}
+    ]
+    # the file header stays in front of all sections
+    assert next(iter(parser.config)) == "#_header"
+
+
+def test_add_section_at_top_duplicate(parser):
+    with pytest.raises(DuplicateSectionError):
+        parser.add_section("section_1", at_top=True)
@@ -5,6 +5,7 @@
 #                                                                         #
 #  This file may be distributed under the terms of the GNU GPLv3 license  #
 # ======================================================================= #
+import io
 from pathlib import Path
 
 import pytest
@@ -117,3 +118,51 @@ def test_add_option_and_write(tmp_path):
     parser2.read_file(output_file)
     assert parser2.has_option("section_1", "new_option")
     assert parser2.getval("section_1", "new_option") == "new_value"
+
+
+def test_write_matches_write_file(tmp_path):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    parser = SimpleConfigParser()
+    parser.read_file(TEST_DATA_PATH)
+    parser.write_file(tmp_file)
+
+    buffer = io.StringIO()
+    parser.write(buffer)
+
+    assert buffer.getvalue() == tmp_file.read_text()
+
+
+def test_read_string_and_write():
+    content = TEST_DATA_PATH.read_text()
+    parser = SimpleConfigParser()
+    parser.read_string(content.replace("\n", "\r\n"))
+
+    buffer = io.StringIO()
+    parser.write(buffer)
+
+    assert buffer.getvalue() == content
+
+
+def test_add_section_at_top_and_write(tmp_path):
+    tmp_file = Path(tmp_path).joinpath("tmp_config.cfg")
+    tmp_file.write_text("# header\n\n[section_1]\noption_1: value_1\n")
+
+    parser = SimpleConfigParser()
+    parser.read_file(tmp_file)
+    parser.add_section("include extra.cfg", at_top=True)
+    parser.write_file(tmp_file)
+
+    assert tmp_file.read_text() == (
+        "# header\n\n[include extra.cfg]\n\n[section_1]\noption_1: value_1\n"
+    )
+
+
+def test_set_option_after_last_line_without_newline():
+    parser = SimpleConfigParser()
+    parser.read_string("[section_1]\noption_1: value_1")
+    parser.set_option("section_1", "option_2", "value_2")
+
+    buffer = io.StringIO()
+    parser.write(buffer)
+
+    assert buffer.getvalue() == "[section_1]\noption_1: value_1\noption_2: value_2\n"
@@ -0,0 +1,91 @@
+# ======================================================================= #
+#  Copyright (C) 2024 Dominik Willner <th33xitus@gmail.com>               #
+#                                                                         #
+#  https://github.com/dw-0/simple-config-parser                           #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import io
+import os
+
+import pytest
+
+from benchmarks.config_generator import generate_config, generate_fuzz_config
+from src.simple_config_parser.simple_config_parser import SimpleConfigParser
+from tests.line_parsing.test_line_parsing import parse_with_single_patterns
+
+# the seeds are the fuzz corpus, set FUZZ_SEEDS to run with more of them
+FUZZ_SEEDS = range(int(os.environ.get("FUZZ_SEEDS", 300)))
+GENERATED_SEEDS = range(20)
+
+
+def write(parser: SimpleConfigParser) -> str:
+    buffer = io.StringIO()
+    parser.write(buffer)
+    return buffer.getvalue()
+
+
+def read(content: str) -> SimpleConfigParser:
+    parser = SimpleConfigParser()
+    parser.read_string(content)
+    return parser
+
+
+@pytest.mark.parametrize("seed", GENERATED_SEEDS)
+def test_generated_config_round_trip(tmp_path, seed):
+    content = generate_config(500, seed)
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    cfg_file.write_text(content)
+
+    assert write(read(content)) == content
+
+    for lazy in (False, True):
+        parser = SimpleConfigParser()
+        parser.read_file(cfg_file, lazy=lazy)
+        out_file = tmp_path.joinpath(f"written_{lazy}.cfg")
+        parser.write_file(out_file)
+        assert out_file.read_text() == content
+
+
+@pytest.mark.parametrize("seed", FUZZ_SEEDS)
+def test_fuzz_round_trip(tmp_path, seed):
+    content = generate_fuzz_config(seed)
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    cfg_file.write_text(content)
+
+    parser = read(content)
+    written = write(parser)
+
+    # the parse tree is the one of the reference implementation
+    assert parser.config == parse_with_single_patterns(io.StringIO(content))
+    # writing is stable, a written config is written back unchanged
+    assert write(read(written)) == written
+    # all ways of reading a file result in the same output
+    for lazy in (False, True):
+        file_parser = SimpleConfigParser()
+        file_parser.read_file(cfg_file, lazy=lazy)
+        assert write(file_parser) == written
+
+
+@pytest.mark.parametrize("seed", FUZZ_SEEDS[:50])
+def test_fuzz_modifications(seed):
+    parser = read(generate_fuzz_config(seed))
+    sections = parser.get_sections()
+    for i, section in enumerate(sections):
+        if i % 3 == 0:
+            parser.set_option(section, "new_option", "value")
+        elif i % 3 == 1:
+            parser.set_option(section, "new_block", ["line_1", "line_2"])
+        else:
+            parser.remove_section(section)
+
+    reparsed = read(write(parser))
+
+    # comments following a new option block become part of the block when the
+    # config is read again, apart from that the modifications must persist
+    for section in parser.get_sections():
+        assert reparsed.get_options(section) == parser.get_options(section)
+        if "new_option" in parser.get_options(section):
+            assert reparsed.getval(section, "new_option") == "value"
+    written = write(reparsed)
+    assert write(read(written)) == written
@@ -0,0 +1,180 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+import os
+from dataclasses import asdict, dataclass
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any, Dict
+
+from core.constants import KIAUH_CACHE_DIR
+from extensions import EXTENSION_ROOT
+from extensions.base_extension import BaseExtension
+from utils.fs_utils import write_json_cache
+
+EXTENSION_INDEX_FILE = KIAUH_CACHE_DIR.joinpath("extension_index.json")
+# must be increased whenever the format of the index changes
+EXTENSION_INDEX_VERSION = 1
+
+
+@dataclass
+class ExtensionEntry:
+    """
+    Represents a discovered extension which is not necessarily imported yet.
+    :param name: Name of the extension directory
+    :param metadata: Metadata of the extension read from its metadata.json
+    :param module_path: Import path of the extension module
+    :param class_name: Name of the BaseExtension subclass in the module
+    """
+
+    name: str
+    metadata: Dict[str, Any]
+    module_path: str = ""
+    class_name: str = ""
+
+
+def get_extension_index() -> Dict[str, ExtensionEntry]:
+    """
+    Get all extensions from the extension index. The index is stored in the
+    KIAUH cache directory together with the mtime of the extension root and a
+    hash of every metadata.json. It is only rebuilt if an extension directory
+    was added or removed, or if the metadata of an extension changed.
+    :return: Dict of the extensions, keyed and sorted by their index
+    """
+    index = _load_index()
+    entries: Dict[str, Dict[str, Any]] = index.get("extensions", {})
+    try:
+        root_mtime = os.stat(EXTENSION_ROOT).st_mtime_ns
+    except OSError:
+        return {}
+
+    changed = index.get("root_mtime") != root_mtime
+    if changed:
+        names = sorted(p.name for p in EXTENSION_ROOT.iterdir() if p.is_dir())
+    else:
+        names = list(entries)
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        metadata_hash = _hash_metadata(EXTENSION_ROOT.joinpath(name))
+        cached = entries.get(name)
+        if cached is not None and cached["hash"] == metadata_hash:
+            result[name] = cached
+            continue
+
+        # directories without a valid metadata.json are indexed as well, so
+        # they aren't checked again on every start
+        changed = True
+        entry = _build_entry(name) if metadata_hash is not None else None
+        result[name] = {
+            "hash": metadata_hash,
+            "entry": asdict(entry) if entry is not None else None,
+        }
+
+    if changed:
+        _save_index({"root_mtime": root_mtime, "extensions": result})
+
+    ext_dict = {}
+    for cached in result.values():
+        if cached["entry"] is None:
+            continue
+        entry = ExtensionEntry(**cached["entry"])
+        ext_dict[f"{entry.metadata.get('index')}"] = entry
+    return dict(sorted(ext_dict.items(), key=lambda x: int(x[0])))
+
+
+def load_extension(entry: ExtensionEntry) -> BaseExtension:
+    """
+    Import the module of an extension and instantiate the extension
+    :param entry: The extension to load
+    :return: The instance of the extension
+    """
+    module = importlib.import_module(entry.module_path)
+    ext_class = getattr(module, entry.class_name, None)
+
+    # the module changed since the index was built, search the class again
+    if ext_class is None or not _is_extension_class(ext_class):
+        ext_class = inspect.getmembers(module, _is_extension_class)[0][1]
+
+    # instantiate the extension with its metadata
+    extension: BaseExtension = ext_class(entry.metadata)
+    return extension
+
+
+def _is_extension_class(o: Any) -> bool:
+    return inspect.isclass(o) and issubclass(o, BaseExtension) and o != BaseExtension
+
+
+def _hash_metadata(ext_dir: Path) -> str | None:
+    try:
+        with open(ext_dir.joinpath("metadata.json"), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _build_entry(name: str) -> ExtensionEntry | None:
+    ext_dir = EXTENSION_ROOT.joinpath(name)
+    try:
+        with open(ext_dir.joinpath("metadata.json"), "r") as m:
+            # read extension metadata from json
+            metadata = json.load(m).get("metadata")
+    except (IOError, JSONDecodeError) as e:
+        print(f"Failed loading extension {ext_dir}: {e}")
+        return None
+
+    module_name = metadata.get("module")
+    module_path = f"kiauh.extensions.{name}.{module_name}"
+    class_name = _find_extension_class(ext_dir.joinpath(f"{module_name}.py"))
+    return ExtensionEntry(name, metadata, module_path, class_name)
+
+
+def _find_extension_class(module_file: Path) -> str:
+    # the module is parsed instead of imported, importing is deferred until the
+    # extension is selected in the menu
+    try:
+        tree = ast.parse(module_file.read_bytes())
+    except (OSError, SyntaxError, ValueError):
+        return ""
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            base_name = base.attr if isinstance(base, ast.Attribute) else None
+            base_name = base.id if isinstance(base, ast.Name) else base_name
+            if base_name == BaseExtension.__name__:
+                return node.name
+    return ""
+
+
+def _load_index() -> Dict[str, Any]:
+    try:
+        with open(EXTENSION_INDEX_FILE, "r") as f:
+            index = json.load(f)
+    except (OSError, JSONDecodeError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != EXTENSION_INDEX_VERSION:
+        return {}
+    # the index is only valid for the installation it was built for
+    if index.get("root") != EXTENSION_ROOT.as_posix():
+        return {}
+    return index
+
+
+def _save_index(index: Dict[str, Any]) -> None:
+    root = EXTENSION_ROOT.as_posix()
+    index = {"version": EXTENSION_INDEX_VERSION, "root": root, **index}
+    write_json_cache(EXTENSION_INDEX_FILE, index)
@@ -8,19 +8,19 @@
 # ======================================================================= #
 from __future__ import annotations
 
-import importlib
-import inspect
-import json
 import textwrap
-from pathlib import Path
 from typing import Dict, List, Type
 
 from core.logger import Logger
 from core.menus import Option
 from core.menus.base_menu import BaseMenu
 from core.types.color import Color
-from extensions import EXTENSION_ROOT
 from extensions.base_extension import BaseExtension
+from extensions.extension_index import (
+    ExtensionEntry,
+    get_extension_index,
+    load_extension,
+)
 
 
 # noinspection PyUnusedLocal
@@ -31,7 +31,7 @@ class ExtensionsMenu(BaseMenu):
         self.title = "Extensions Menu"
         self.title_color = Color.CYAN
         self.previous_menu: Type[BaseMenu] | None = previous_menu
-        self.extensions: Dict[str, BaseExtension] = self.discover_extensions()
+        self.extensions: Dict[str, ExtensionEntry] = self.discover_extensions()
 
     def set_previous_menu(self, previous_menu: Type[BaseMenu] | None) -> None:
         from core.menus.main_menu import MainMenu
@@ -44,44 +44,23 @@ class ExtensionsMenu(BaseMenu):
             for i in self.extensions
         }
 
-    def discover_extensions(self) -> Dict[str, BaseExtension]:
-        ext_dict = {}
-
-        for ext in EXTENSION_ROOT.iterdir():
-            metadata_json = Path(ext).joinpath("metadata.json")
-            if not metadata_json.exists():
-                continue
-
-            try:
-                with open(metadata_json, "r") as m:
-                    # read extension metadata from json
-                    metadata = json.load(m).get("metadata")
-                    module_name = metadata.get("module")
-                    module_path = f"kiauh.extensions.{ext.name}.{module_name}"
-
-                    # get the class name of the extension
-                    module = importlib.import_module(module_path)
-
-                    def predicate(o):
-                        return (
-                            inspect.isclass(o)
-                            and issubclass(o, BaseExtension)
-                            and o != BaseExtension
-                        )
-
-                    ext_class: type = inspect.getmembers(module, predicate)[0][1]
-
-                    # instantiate the extension with its metadata and add to dict
-                    ext_instance: BaseExtension = ext_class(metadata)
-                    ext_dict[f"{metadata.get('index')}"] = ext_instance
-
-            except (IOError, json.JSONDecodeError, ImportError) as e:
-                print(f"Failed loading extension {ext}: {e}")
-
-        return dict(sorted(ext_dict.items(), key=lambda x: int(x[0])))
+    def discover_extensions(self) -> Dict[str, ExtensionEntry]:
+        """
+        Get all extensions from the extension index. The extension modules
+        themselves are only imported once an extension is selected.
+        :return: Dict of the extensions, keyed and sorted by their index
+        """
+        extensions: Dict[str, ExtensionEntry] = get_extension_index()
+        return extensions
 
     def extension_submenu(self, **kwargs):
-        ExtensionSubmenu(kwargs.get("opt_data"), self.__class__).run()
+        entry: ExtensionEntry = kwargs.get("opt_data")
+        try:
+            extension = load_extension(entry)
+        except ImportError as e:
+            Logger.print_error(f"Failed loading extension {entry.name}: {e}")
+            return
+        ExtensionSubmenu(extension, self.__class__).run()
 
     def print_menu(self) -> None:
         line1 = Color.apply("Available Extensions:", Color.YELLOW)
@@ -94,9 +73,9 @@ class ExtensionsMenu(BaseMenu):
         )[1:]
         print(menu, end="")
 
-        for extension in self.extensions.values():
-            index = extension.metadata.get("index")
-            name = extension.metadata.get("display_name")
+        for entry in self.extensions.values():
+            index = entry.metadata.get("index")
+            name = entry.metadata.get("display_name")
             row = f"{index}) {name}"
             print(f"║ {row:<53} ║")
         print("╟───────────────────────────────────────────────────────╢")
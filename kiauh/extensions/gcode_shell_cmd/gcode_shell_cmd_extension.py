@@ -122,7 +122,7 @@ class GcodeShellCmdExtension(BaseExtension):
         for cfg_file in cfg_files:
             Logger.print_status(f"Include shell_command.cfg in '{cfg_file}' ...")
             scp = SimpleConfigParser()
-            scp.read_file(cfg_file)
+            scp.read_file(cfg_file, lazy=True)
             if scp.has_section(section):
                 Logger.print_info("Section already defined! Skipping ...")
                 continue
@@ -141,5 +141,5 @@ class MoonrakerObico:
             return False
 
         scp = SimpleConfigParser()
-        scp.read_file(self.cfg_file)
+        scp.read_file(self.cfg_file, lazy=True)
         return scp.getval("server", "auth_token", None) is not None
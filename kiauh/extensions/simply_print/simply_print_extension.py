@@ -97,7 +97,7 @@ class SimplyPrintExtension(BaseExtension):
                 f"{_type} section 'simplyprint' {_ft} {moonraker.cfg_file} ..."
             )
             scp = SimpleConfigParser()
-            scp.read_file(moonraker.cfg_file)
+            scp.read_file(moonraker.cfg_file, lazy=True)
 
             install_and_has_section = is_install and scp.has_section(section)
             uninstall_and_has_no_section = not is_install and not scp.has_section(
@@ -0,0 +1,154 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from components.crowsnest import CROWSNEST_DIR, CROWSNEST_REPO
+from components.crowsnest.crowsnest import install_crowsnest
+from components.klipper import KLIPPER_DIR, KLIPPER_REPO_URL
+from components.klipper.services.klipper_setup_service import KlipperSetupService
+from components.klipperscreen import KLIPPERSCREEN_DIR, KLIPPERSCREEN_REPO
+from components.klipperscreen.klipperscreen import install_klipperscreen
+from components.moonraker import MOONRAKER_DIR, MOONRAKER_REPO_URL
+from components.moonraker.services.moonraker_setup_service import MoonrakerSetupService
+from components.webui_client.base_data import BaseWebClient
+from components.webui_client.client_config.client_config_setup import (
+    install_client_config,
+)
+from components.webui_client.client_setup import install_client
+from components.webui_client.fluidd_data import FluiddData
+from components.webui_client.mainsail_data import MainsailData
+from core.logger import Logger
+from core.settings.kiauh_settings import KiauhSettings, Repository
+from translate.i18n import _
+from utils.git_utils import CloneTask, discard_prepared_repos, git_clone_parallel
+
+
+@dataclass
+class InstallStep:
+    """
+    A single component of an install plan
+    :param name: Display name of the component
+    :param install: The regular installation routine of the component
+    :param clone_task: The repository the routine clones, if any
+    """
+
+    name: str
+    install: Callable[[], None]
+    clone_task: CloneTask | None = None
+
+
+def get_install_steps() -> Dict[str, InstallStep]:
+    """
+    Returns all components which can be part of an install plan, keyed by the
+    option of the install menu and in the order they have to be installed in
+    :return: Dict of install steps
+    """
+    settings = KiauhSettings()
+    klipper_repo, klipper_branch = _get_repo(
+        settings.klipper.repositories, KLIPPER_REPO_URL
+    )
+    moonraker_repo, moonraker_branch = _get_repo(
+        settings.moonraker.repositories, MOONRAKER_REPO_URL
+    )
+    mainsail, fluidd = MainsailData(), FluiddData()
+
+    return {
+        "1": InstallStep(
+            "Klipper",
+            KlipperSetupService().install,
+            CloneTask(
+                "Klipper", klipper_repo, KLIPPER_DIR, klipper_branch, use_cache=True
+            ),
+        ),
+        "2": InstallStep(
+            "Moonraker",
+            MoonrakerSetupService().install,
+            CloneTask(
+                "Moonraker",
+                moonraker_repo,
+                MOONRAKER_DIR,
+                moonraker_branch,
+                use_cache=True,
+            ),
+        ),
+        "3": InstallStep("Mainsail", lambda: _install_client(mainsail, settings)),
+        "4": InstallStep("Fluidd", lambda: _install_client(fluidd, settings)),
+        "5": _get_client_config_step(mainsail),
+        "6": _get_client_config_step(fluidd),
+        "7": InstallStep(
+            "KlipperScreen",
+            install_klipperscreen,
+            CloneTask("KlipperScreen", KLIPPERSCREEN_REPO, KLIPPERSCREEN_DIR),
+        ),
+        "8": InstallStep(
+            "Crowsnest",
+            install_crowsnest,
+            CloneTask("Crowsnest", CROWSNEST_REPO, CROWSNEST_DIR, "master"),
+        ),
+    }
+
+
+def run_install_plan(selection: List[str]) -> None:
+    """
+    Installs the selected components. The repositories of all selected
+    components are cloned concurrently first, afterwards the regular
+    installation routines run one after another and use those clones.
+    :param selection: Install menu options of the components to install
+    :return: None
+    """
+    steps = [step for key, step in get_install_steps().items() if key in selection]
+    if not steps:
+        return
+
+    names = ", ".join(step.name for step in steps)
+    Logger.print_status(_("Installing {} ...").format(names))
+
+    git_clone_parallel([s.clone_task for s in steps if s.clone_task is not None])
+
+    try:
+        for step in steps:
+            step.install()
+    finally:
+        # clones of aborted or failed installations must not be left behind
+        discard_prepared_repos()
+
+
+def _get_repo(
+    repositories: List[Repository] | None, default_url: str
+) -> Tuple[str, str]:
+    # same fallback as the setup services, the first repo defined in kiauh.cfg
+    # or the official repository
+    if repositories:
+        return repositories[0].url, repositories[0].branch
+    return default_url, "master"
+
+
+def _get_client_config_step(client: BaseWebClient) -> InstallStep:
+    client_config = client.client_config
+    return InstallStep(
+        client_config.display_name,
+        lambda: install_client_config(client),
+        CloneTask(
+            client_config.display_name,
+            client_config.repo_url,
+            client_config.config_dir,
+        ),
+    )
+
+
+def _install_client(client: BaseWebClient, settings: KiauhSettings) -> None:
+    if client.client_dir.exists():
+        Logger.print_info(
+            _("{} is already installed! Skipped ...").format(client.display_name)
+        )
+        return
+    install_client(client, settings=settings)
@@ -31,6 +31,7 @@ from components.moonraker.services.moonraker_setup_service import (
     install_moonraker_packages,
 )
 from core.backup_manager.backup_manager import BackupManager, BackupManagerException
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import Logger
 from utils.git_utils import GitException, get_repo_name, git_clone_wrapper
@@ -46,6 +47,7 @@ class RepoSwitchFailedException(Exception):
     pass
 
 
+@invalidates_status
 def run_switch_repo_routine(
     name: Literal["klipper", "moonraker"], repo_url: str, branch: str
 ) -> None:
@@ -84,7 +86,7 @@ def run_switch_repo_routine(
             raise ValueError(error)
 
         # step 4: clone new repo
-        git_clone_wrapper(repo_url, repo_dir, branch, force=True)
+        git_clone_wrapper(repo_url, repo_dir, branch, force=True, use_cache=True)
 
         # step 5: install os dependencies
         if name == "klipper":
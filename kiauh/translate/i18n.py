@@ -1,17 +1,25 @@
-import locale
-import os
-from pathlib import Path
-from babel.support import Translations
-
-# Configurar Babel
-localedir: str = os.path.join(Path(__file__).parent.parent, 'locale')
-lang: str = locale.getdefaultlocale()[0] or 'en'
-
-# Cargar traducciones con gettext
-try:
-    trans = Translations.load(localedir, locales=[lang])
-except FileNotFoundError:
-    trans = Translations.load(localedir, locales=['en'])
-
-# Crear el alias _ para la función de traducción
-_ = trans.gettext
\ No newline at end of file
+import locale
+import os
+from functools import lru_cache
+from pathlib import Path
+
+# Configurar Babel
+localedir: str = os.path.join(Path(__file__).parent.parent, 'locale')
+lang: str = locale.getdefaultlocale()[0] or 'en'
+
+
+# Cargar traducciones con gettext, Babel solo se importa con el primer mensaje
+@lru_cache(maxsize=None)
+def _get_translations():
+    from babel.support import Translations
+
+    try:
+        return Translations.load(localedir, locales=[lang])
+    except FileNotFoundError:
+        return Translations.load(localedir, locales=['en'])
+
+
+# Crear el alias _ para la función de traducción
+def _(message: str) -> str:
+    translation: str = _get_translations().gettext(message)
+    return translation
\ No newline at end of file
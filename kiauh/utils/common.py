@@ -15,17 +15,16 @@ from typing import Dict, List, Literal, Set
 
 from components.klipper.klipper import Klipper
 from components.moonraker.moonraker import Moonraker
-from core.constants import GLOBAL_DEPS, PRINTER_DATA_BACKUP_DIR
+from core.constants import GLOBAL_DEPS, PRINTER_DATA_BACKUP_DIR, SYSTEMD
 from core.logger import DialogType, Logger
+from core.services.status_cache import StatusCache
 from core.types.color import Color
 from core.types.component_status import ComponentStatus, StatusCode
 from utils.git_utils import (
-    get_current_branch,
-    get_local_commit,
+    GitRepoInfo,
+    get_git_state_files,
     get_local_tags,
-    get_remote_commit,
-    get_repo_name,
-    get_repo_url,
+    get_repo_info,
 )
 from utils.instance_utils import get_instances
 from utils.sys_utils import (
@@ -101,14 +100,38 @@ def get_install_status(
     :param files: List of optional files to check for existence
     :return: Dictionary with status string, statuscode and instance count
     """
+    paths: List[Path] = [repo_dir, *get_git_state_files(repo_dir)]
+    if env_dir is not None:
+        paths.append(env_dir)
+    if instance_type is not None:
+        paths.append(SYSTEMD)
+    if files is not None:
+        paths.extend(files)
+
+    key = f"install_status:{repo_dir}:{env_dir}:{instance_type}:{files}"
+    return StatusCache().get_or_compute(
+        key,
+        paths,
+        lambda: _get_install_status(repo_dir, env_dir, instance_type, files),
+    )
+
+
+def _get_install_status(
+    repo_dir: Path,
+    env_dir: Path | None = None,
+    instance_type: type | None = None,
+    files: List[Path] | None = None,
+) -> ComponentStatus:
     from utils.instance_utils import get_instances
 
     checks = []
     branch: str = ""
+    repo_info = GitRepoInfo(repo_dir=repo_dir)
 
     if repo_dir.exists():
         checks.append(True)
-        branch = get_current_branch(repo_dir)
+        repo_info = get_repo_info(repo_dir)
+        branch = repo_info.branch
 
     if env_dir is not None:
         checks.append(env_dir.exists())
@@ -130,18 +153,15 @@ def get_install_status(
     else:
         status = 1  # incomplete
 
-    org, repo = get_repo_name(repo_dir)
-    repo_url = get_repo_url(repo_dir) if repo_dir.exists() else None
-
     return ComponentStatus(
         status=status,
         instances=instances,
-        owner=org,
-        repo=repo,
-        repo_url=repo_url,
+        owner=repo_info.owner,
+        repo=repo_info.name,
+        repo_url=repo_info.url,
         branch=branch,
-        local=get_local_commit(repo_dir),
-        remote=get_remote_commit(repo_dir),
+        local=repo_info.local_commit,
+        remote=repo_info.remote_commit,
     )
 
 
@@ -0,0 +1,166 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import glob
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from core.submodules.simple_config_parser.src.simple_config_parser.simple_config_parser import (
+    SimpleConfigParser,
+)
+
+INCLUDE_PREFIX = "include "
+
+# max. number of parsed config files kept in memory, the least recently used
+# ones are dropped first, e.g. files which were deleted or renamed meanwhile
+MAX_PARSED_CONFIGS = 64
+
+# parsed config files, keyed by path and validated by mtime and size
+_parsed_configs: OrderedDict[Path, Tuple[Tuple[int, int], SimpleConfigParser]] = (
+    OrderedDict()
+)
+_parsed_configs_lock = Lock()
+
+
+class MergedConfig:
+    """
+    Read-only view of a config file and all files it includes, directly or
+    through other included files. Includes are resolved the way Klipper does
+    it, relative to the including file and with support for glob patterns.
+    Every section and option is attributed to the file defining it, options
+    defined more than once resolve to the last definition in include order.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root: Path = Path(root)
+        # all files of the include graph in the order they are processed
+        self.files: List[Path] = []
+        # maps each file to the files it includes
+        self.includes: Dict[Path, List[Path]] = {}
+        # maps each section to the files defining it, in include order
+        self.__sections: Dict[str, List[Path]] = {}
+        self.__walk(self.root.resolve(), [])
+
+    def has_section(self, section: str) -> bool:
+        return section in self.__sections
+
+    def get_sections(self) -> List[str]:
+        return list(self.__sections)
+
+    def get_section_sources(self, section: str) -> List[Path]:
+        """
+        Get all files defining the given section
+        :param section: The section name
+        :return: List of files in include order, empty if it is not defined
+        """
+        return list(self.__sections.get(section, []))
+
+    def get_option_source(self, section: str, option: str) -> Path | None:
+        """
+        Get the file containing the effective definition of an option
+        :param section: The section name
+        :param option: The option name
+        :return: The file or None if the option is not defined
+        """
+        for file in reversed(self.__sections.get(section, [])):
+            scp = get_parsed_config(file)
+            if scp is not None and scp.has_option(section, option):
+                return file
+        return None
+
+    def getval(
+        self,
+        section: str,
+        option: str,
+        fallback: str | List[str] | None = None,
+    ) -> str | List[str] | None:
+        """
+        Get the effective value of an option
+        :param section: The section name
+        :param option: The option name
+        :param fallback: Value returned if the option is not defined
+        :return: The value of the last definition of the option or the fallback
+        """
+        source = self.get_option_source(section, option)
+        scp = get_parsed_config(source) if source is not None else None
+        if scp is None:
+            return fallback
+        # the source is known to define the option
+        value: str | List[str] = scp.getval(section, option)
+        return value
+
+    def __walk(self, file: Path, stack: List[Path]) -> None:
+        scp = get_parsed_config(file)
+        if scp is None:
+            return
+
+        self.files.append(file)
+        includes = self.includes.setdefault(file, [])
+        for section in scp.get_sections():
+            self.__sections.setdefault(section, []).append(file)
+            if not section.startswith(INCLUDE_PREFIX):
+                continue
+
+            pattern = section[len(INCLUDE_PREFIX) :].strip()
+            for include in resolve_include(file, pattern):
+                includes.append(include)
+                # Klipper rejects recursive includes, they are skipped here
+                if include != file and include not in stack:
+                    self.__walk(include, [*stack, file])
+
+
+def resolve_include(file: Path, pattern: str) -> List[Path]:
+    """
+    Resolve the path pattern of an include section
+    :param file: The file containing the include section
+    :param pattern: The path or glob pattern of the include, relative to file
+    :return: Sorted list of the existing files matching the pattern
+    """
+    path = os.path.join(file.parent, os.path.expanduser(pattern))
+    return sorted(Path(p).resolve() for p in glob.glob(path) if os.path.isfile(p))
+
+
+def get_parsed_config(file: Path) -> SimpleConfigParser | None:
+    """
+    Get the parsed config of a file. Each file is only parsed again if its
+    mtime or size changed since it was parsed the last time. The returned
+    parser is shared and must not be modified.
+    :param file: The config file
+    :return: The parsed config or None if the file can't be read
+    """
+    file = Path(file)
+    try:
+        stat = file.stat()
+    except OSError:
+        return None
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _parsed_configs_lock:
+        cached = _parsed_configs.get(file)
+        if cached is not None:
+            _parsed_configs.move_to_end(file)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    scp = SimpleConfigParser()
+    try:
+        scp.read_file(file)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    with _parsed_configs_lock:
+        _parsed_configs[file] = (key, scp)
+        _parsed_configs.move_to_end(file)
+        while len(_parsed_configs) > MAX_PARSED_CONFIGS:
+            _parsed_configs.popitem(last=False)
+    return scp
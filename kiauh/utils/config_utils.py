@@ -8,22 +8,100 @@
 # ======================================================================= #
 from __future__ import annotations
 
-import shutil
-import tempfile
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from core.logger import Logger
 from core.submodules.simple_config_parser.src.simple_config_parser.simple_config_parser import (
     SimpleConfigParser,
 )
+from utils.fs_utils import write_atomic
 from utils.instance_type import InstanceType
 
 from translate.i18n import _
 
+MAX_CONFIG_WORKERS = 8
+
 ConfigOption = Tuple[str, str]
 
 
+class ConfigBatch:
+    """
+    Edits several config files as a single unit. All files are parsed up front,
+    the parsers are modified by the caller and commit() writes all files which
+    actually changed. Every file is written to a temporary file, synced to disk
+    and atomically renamed, so a file is either completely old or completely
+    new. If writing any of the files fails, the files already written are
+    restored and the whole batch is rolled back.
+    """
+
+    def __init__(self, files: List[Path]) -> None:
+        # original content of each file, used to roll back
+        self.__originals: Dict[Path, bytes] = {}
+        # each file rendered before any edit, used to detect changes, as
+        # rendering alone may e.g. change line endings or add a final newline
+        self.__unedited: Dict[Path, bytes] = {}
+        self.__parsers: Dict[Path, SimpleConfigParser] = {}
+        self.__written: List[Path] = []
+
+        existing = list(dict.fromkeys(Path(f) for f in files if Path(f).is_file()))
+        with ThreadPoolExecutor(max_workers=MAX_CONFIG_WORKERS) as executor:
+            for file, parsed in zip(existing, executor.map(_parse, existing)):
+                self.__originals[file], self.__unedited[file], scp = parsed
+                self.__parsers[file] = scp
+
+    def get(self, file: Path) -> SimpleConfigParser | None:
+        """
+        Get the parser of a file of the batch
+        :param file: The config file
+        :return: The parser or None if the file does not exist
+        """
+        return self.__parsers.get(Path(file))
+
+    def commit(self) -> List[Path]:
+        """
+        Write all changed files of the batch
+        :return: List of the files written
+        :raises OSError: If a file could not be written, after the batch was
+            rolled back
+        """
+        try:
+            for file, scp in self.__parsers.items():
+                content = _render(scp)
+                if content == self.__unedited[file]:
+                    continue
+                write_atomic(file, content)
+                self.__written.append(file)
+        except OSError:
+            self.rollback()
+            raise
+        return list(self.__written)
+
+    def rollback(self) -> None:
+        """Restore the original content of all files written by the batch"""
+        for file in reversed(self.__written):
+            try:
+                write_atomic(file, self.__originals[file])
+            except OSError as e:
+                Logger.print_error(_("Unable to restore '{}': {}").format(file, e))
+        self.__written = []
+
+
+def _parse(file: Path) -> Tuple[bytes, bytes, SimpleConfigParser]:
+    content = file.read_bytes()
+    scp = SimpleConfigParser()
+    scp.read_string(content.decode("utf-8"))
+    return content, _render(scp), scp
+
+
+def _render(scp: SimpleConfigParser) -> bytes:
+    buffer = io.StringIO()
+    scp.write(buffer)
+    return buffer.getvalue().encode("utf-8")
+
+
 def add_config_section(
     section: str,
     instances: List[InstanceType],
@@ -32,16 +110,16 @@ def add_config_section(
     if not instances:
         return
 
+    batch = ConfigBatch([instance.cfg_file for instance in instances])
     for instance in instances:
         cfg_file = instance.cfg_file
         Logger.print_status(_("Add section '[{}]' to '{}' ...").format(section, cfg_file))
 
-        if not Path(cfg_file).exists():
+        scp = batch.get(cfg_file)
+        if scp is None:
             Logger.print_warn(_("'{}' not found!").format(cfg_file))
             continue
 
-        scp = SimpleConfigParser()
-        scp.read_file(cfg_file)
         if scp.has_section(section):
             Logger.print_info(_("Section already exist. Skipped ..."))
             continue
@@ -52,56 +130,54 @@ def add_config_section(
             for option in reversed(options):
                 scp.set_option(section, option[0], option[1])
 
-        scp.write_file(cfg_file)
-
         Logger.print_ok("OK!")
 
+    batch.commit()
+
 
 def add_config_section_at_top(section: str, instances: List[InstanceType]) -> None:
-    # TODO: this could be implemented natively in SimpleConfigParser
+    batch = ConfigBatch([instance.cfg_file for instance in instances])
     for instance in instances:
-        tmp_cfg = tempfile.NamedTemporaryFile(mode="w", delete=False)
-        tmp_cfg_path = Path(tmp_cfg.name)
-        scp = SimpleConfigParser()
-        scp.read_file(tmp_cfg_path)
-        scp.add_section(section)
-        scp.write_file(tmp_cfg_path)
-        tmp_cfg.close()
-
         cfg_file = instance.cfg_file
-        with open(cfg_file, "r") as org:
-            org_content = org.readlines()
-        with open(tmp_cfg_path, "a") as tmp:
-            tmp.writelines(org_content)
+        scp = batch.get(cfg_file)
+        if scp is None:
+            Logger.print_warn(_("'{}' not found!").format(cfg_file))
+            continue
 
-        cfg_file.unlink()
-        shutil.move(tmp_cfg_path, cfg_file)
+        if scp.has_section(section):
+            Logger.print_info(_("Section already exist. Skipped ..."))
+            continue
+
+        scp.add_section(section, at_top=True)
 
         Logger.print_ok("OK!")
 
+    batch.commit()
+
 
 def remove_config_section(
     section: str, instances: List[InstanceType]
 ) -> List[InstanceType]:
     removed_from: List[InstanceType] = []
+    batch = ConfigBatch([instance.cfg_file for instance in instances])
     for instance in instances:
         cfg_file = instance.cfg_file
         Logger.print_status(_("Remove section '[{}]' from '{}' ...").format(section, cfg_file))
 
-        if not Path(cfg_file).exists():
+        scp = batch.get(cfg_file)
+        if scp is None:
             Logger.print_warn(_("'{}' not found!").format(cfg_file))
             continue
 
-        scp = SimpleConfigParser()
-        scp.read_file(cfg_file)
         if not scp.has_section(section):
             Logger.print_info(_("Section does not exist. Skipped ..."))
             continue
 
         scp.remove_section(section)
-        scp.write_file(cfg_file)
 
         removed_from.append(instance)
         Logger.print_ok("OK!")
 
+    batch.commit()
+
     return removed_from
@@ -10,19 +10,28 @@
 # ======================================================================= #
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
 import shutil
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, CalledProcessError, call, check_output, run
-from typing import List
-from zipfile import ZipFile
+from json import JSONDecodeError
+from typing import IO, Any, Dict, List, Tuple
+from zipfile import ZipFile, ZipInfo
 
+from core.constants import KIAUH_CACHE_DIR
 from core.decorators import deprecated
 from core.logger import Logger
 
 from translate.i18n import _
 
+# manifests recording crc32 and size of every file extracted by unzip_update,
+# kept outside of the updated directories, which are served by the webserver
+ZIP_MANIFEST_DIR: Path = KIAUH_CACHE_DIR.joinpath("zip-manifests")
+
+
 def check_file_exist(file_path: Path, sudo=False) -> bool:
     """
     Helper function for checking the existence of a file |
@@ -129,6 +138,217 @@ def unzip(filepath: Path, target_dir: Path) -> None:
         _zip.extractall(target_dir)
 
 
+def unzip_replace(archive: Path | IO[bytes], target_dir: Path) -> None:
+    """
+    Helper function to replace a directory with the content of a zip-archive |
+    The archive is extracted into a staging directory next to the target first,
+    which then takes the place of the target. If extracting fails, the target
+    directory is left untouched.
+    :param archive: the path to the zip-file or a file object containing it
+    :param target_dir: the directory to replace
+    :return: None
+    """
+    staging_dir = target_dir.with_name(f".{target_dir.name}.staging")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    try:
+        with ZipFile(archive, "r") as _zip:
+            _zip.extractall(staging_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    _swap_staging_dir(staging_dir, target_dir)
+
+
+def unzip_update(archive: Path | IO[bytes], target_dir: Path) -> Tuple[int, int]:
+    """
+    Helper function to update a directory with the content of a zip-archive |
+    The CRC32 and size of every entry in the central directory of the archive
+    are compared against the manifest of the previous extraction. The target is
+    hard linked into a staging directory next to it, only new and changed files
+    are extracted into it and files no longer part of the archive are deleted
+    from it, then the staging directory takes the place of the target. Without
+    a manifest, or if staging the update fails, the whole directory is replaced.
+    :param archive: the path to the zip-file or a file object containing it
+    :param target_dir: the directory to update
+    :return: the number of written and the number of deleted files
+    """
+    manifest_file = _get_zip_manifest_file(target_dir)
+    manifest = _read_zip_manifest(manifest_file)
+
+    with ZipFile(archive, "r") as _zip:
+        entries = {i.filename: i for i in _zip.infolist() if not i.is_dir()}
+
+    staging_dir = target_dir.with_name(f".{target_dir.name}.staging")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    written, removed = len(entries), 0
+    staged = False
+    if manifest is not None and target_dir.exists():
+        try:
+            written, removed = _stage_zip_update(
+                archive, target_dir, staging_dir, entries, manifest
+            )
+            staged = True
+        except Exception:
+            # e.g. hard links not being supported, replacing works regardless
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            written, removed = len(entries), 0
+
+    if staged:
+        _swap_staging_dir(staging_dir, target_dir)
+    else:
+        unzip_replace(archive, target_dir)
+
+    _write_zip_manifest(manifest_file, entries)
+    return written, removed
+
+
+def _stage_zip_update(
+    archive: Path | IO[bytes],
+    target_dir: Path,
+    staging_dir: Path,
+    entries: Dict[str, ZipInfo],
+    manifest: Dict[str, List[int]],
+) -> Tuple[int, int]:
+    # unchanged files are hard linked, so none of their data is copied
+    shutil.copytree(target_dir, staging_dir, symlinks=True, copy_function=os.link)
+
+    root = staging_dir.resolve()
+    written = 0
+    with ZipFile(archive, "r") as _zip:
+        for name, info in entries.items():
+            path = root.joinpath(name).resolve()
+            if root not in path.parents:
+                raise ValueError(_("Invalid path in archive: {}").format(name))
+            if not _is_zip_entry_changed(path, info, manifest.get(name)):
+                continue
+            # the file is a hard link to the one in the target directory, so it
+            # must be replaced, writing to it would change the served file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.unlink(missing_ok=True)
+            with _zip.open(info) as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            written += 1
+
+    stale = [name for name in manifest if name not in entries]
+    for name in stale:
+        path = root.joinpath(name)
+        path.unlink(missing_ok=True)
+        # drop directories left empty, up to the staging directory itself
+        for parent in path.parents:
+            if parent == root or not parent.is_dir() or any(parent.iterdir()):
+                break
+            parent.rmdir()
+
+    return written, len(stale)
+
+
+def _swap_staging_dir(staging_dir: Path, target_dir: Path) -> None:
+    old_dir = target_dir.with_name(f".{target_dir.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    if target_dir.exists():
+        target_dir.rename(old_dir)
+    try:
+        staging_dir.rename(target_dir)
+    except OSError:
+        if old_dir.exists():
+            old_dir.rename(target_dir)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _is_zip_entry_changed(path: Path, info: ZipInfo, known: List[int] | None) -> bool:
+    if known != [info.CRC, info.file_size]:
+        return True
+    # the manifest can't tell if a file was modified or removed afterwards, but
+    # a cheap size check catches most cases
+    try:
+        return path.stat().st_size != info.file_size
+    except OSError:
+        return True
+
+
+def _get_zip_manifest_file(target_dir: Path) -> Path:
+    # directories of the same name, e.g. of several instances, are told apart
+    path_hash = hashlib.sha1(target_dir.resolve().as_posix().encode()).hexdigest()
+    return ZIP_MANIFEST_DIR.joinpath(f"{target_dir.name}-{path_hash[:8]}.json")
+
+
+def _read_zip_manifest(manifest_file: Path) -> Dict[str, List[int]] | None:
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else None
+    except (OSError, JSONDecodeError):
+        return None
+
+
+def _write_zip_manifest(manifest_file: Path, entries: Dict[str, ZipInfo]) -> None:
+    manifest = {name: [i.CRC, i.file_size] for name, i in entries.items()}
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(manifest_file, json.dumps(manifest).encode("utf-8"), sync=False)
+
+
+def write_atomic(file: Path, content: bytes, sync: bool = True) -> None:
+    """
+    Replace the content of a file atomically. The new content is written to a
+    temporary file in the same directory and renamed to the target, so the
+    file is never left partially written. Symlinks are followed, the file they
+    point to is replaced instead of the link itself.
+    :param file: The file to write
+    :param content: The new content of the file
+    :param sync: Whether to sync the file and the rename to disk before
+        returning, which only files that must survive a power loss need
+    :return: None
+    """
+    target = file.resolve()
+    tmp_file = target.with_name(f".{target.name}.tmp")
+    try:
+        with open(tmp_file, "wb") as f:
+            f.write(content)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        if target.exists():
+            shutil.copymode(target, tmp_file)
+        os.replace(tmp_file, target)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    if not sync:
+        return
+    # sync the directory as well, so the rename itself is persisted
+    try:
+        dir_fd = os.open(target.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def write_json_cache(file: Path, data: Any) -> None:
+    """
+    Store a cache as JSON file, which is replaced atomically. A cache only
+    saves work, so failing to write it is ignored.
+    :param file: The cache file
+    :param data: The JSON serializable content of the cache
+    :return: None
+    """
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(file, json.dumps(data).encode("utf-8"), sync=False)
+    except OSError:
+        pass
+
+
 def create_folders(dirs: List[Path]) -> None:
     try:
         for _dir in dirs:
@@ -147,17 +367,41 @@ def get_data_dir(instance_type: type, suffix: str) -> Path:
     # if the service file exists, we read the data dir path from it
     # this also ensures compatibility with pre v6.0.0 instances
     service_file_path: Path = get_service_file_path(instance_type, suffix)
-    if service_file_path and service_file_path.exists():
-        with open(service_file_path, "r") as service_file:
-            lines = service_file.readlines()
-            for line in lines:
-                pattern = r"^EnvironmentFile=(.+)(/systemd/.+\.env)"
-                match = re.search(pattern, line)
-                if match:
-                    return Path(match.group(1))
+    data_dir = _read_service_data_dir(service_file_path)
+    if data_dir is not None:
+        return data_dir
 
     if suffix != "":
         # this is the new data dir naming scheme introduced in v6.0.0
         return Path.home().joinpath(_("printer_{}_data").format(suffix))
 
     return Path.home().joinpath("printer_data")
+
+
+# data dirs read from service files, keyed by path and validated by mtime
+_service_data_dirs: Dict[Path, Tuple[int, Path | None]] = {}
+
+
+def _read_service_data_dir(service_file_path: Path) -> Path | None:
+    # every instance construction needs the data dir, so each service file is
+    # only read again after it was modified
+    try:
+        mtime = service_file_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _service_data_dirs.get(service_file_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    data_dir: Path | None = None
+    pattern = re.compile(r"^EnvironmentFile=(.+)(/systemd/.+\.env)")
+    with open(service_file_path, "r") as service_file:
+        for line in service_file:
+            match = pattern.search(line)
+            if match:
+                data_dir = Path(match.group(1))
+                break
+
+    _service_data_dirs[service_file_path] = (mtime, data_dir)
+    return data_dir
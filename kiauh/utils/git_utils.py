@@ -1,40 +1,176 @@
 from __future__ import annotations
 
-import json
 import re
 import shutil
-import urllib.request
-from http.client import HTTPResponse
-from json import JSONDecodeError
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, CalledProcessError, check_output, run
-from typing import Any, List, Tuple, Type
+from typing import Any, Callable, Dict, List, Tuple, Type
 
+from core.constants import KIAUH_CACHE_DIR
+from core.decorators import invalidates_status
 from core.instance_manager.instance_manager import InstanceManager
 from core.logger import Logger
+from core.services.github_api import GitHubApiClient, GitHubApiError
 from utils.input_utils import get_confirm, get_number_input
 from utils.instance_type import InstanceType
 from utils.instance_utils import get_instances
 
 from translate.i18n import _
 
+# cloning is network bound, but too many parallel clones congest slow uplinks
+MAX_CLONE_WORKERS: int = 4
+
+# bare repositories holding the objects of all forks of a project ever cloned
+GIT_CACHE_DIR: Path = KIAUH_CACHE_DIR.joinpath("git-cache")
+DEFAULT_CLONE_STRATEGY = "blobless"
+CLONE_STRATEGIES: Dict[str, List[str]] = {
+    "full": [],
+    "blobless": ["--filter=blob:none"],
+    "treeless": ["--filter=tree:0"],
+    # all branch tips are fetched, otherwise checking out a branch fails
+    "shallow": ["--depth=1", "--no-single-branch"],
+}
+
+# a Logger method and its message, collected to be printed later
+LogMessage = Tuple[Callable[[str], None], str]
+
+
 class GitException(Exception):
     pass
 
 
+@dataclass
+class CloneTask:
+    """
+    A repository to clone ahead of the actual installation routine
+    :param name: Display name used for the progress lines
+    :param repo: The URL of the repository to clone
+    :param target_dir: The directory where the repository will be cloned
+    :param branch: The branch to check out, None, master or main skip the checkout
+    :param use_cache: Whether to clone with the help of the local object cache
+    """
+
+    name: str
+    repo: str
+    target_dir: Path
+    branch: str | None = None
+    use_cache: bool = False
+
+
+# repositories cloned by git_clone_parallel, which were not handed over to
+# git_clone_wrapper yet, keyed by their target directory
+_prepared_repos: Dict[Path, CloneTask] = {}
+
+
+@dataclass
+class GitRepoInfo:
+    """
+    Snapshot of the state of a local git repository. Everything except the
+    describe output is read directly from the files in the .git directory.
+    """
+
+    repo_dir: Path
+    branch: str = "-"
+    owner: str = "-"
+    name: str = "-"
+    url: str | None = None
+    head: str | None = None
+    remote_head: str | None = None
+    local_commit: str | None = None
+    remote_commit: str | None = None
+
+
+def get_repo_info(repo: Path) -> GitRepoInfo:
+    """
+    Collect branch, origin, and the described local and remote commit of a
+    repository. HEAD, refs, packed-refs and the config are read from disk, the
+    describe output of HEAD and its upstream is produced by a single git call.
+    :param repo: Path to the local Git repository
+    :return: GitRepoInfo of the repository
+    """
+    info = GitRepoInfo(repo_dir=repo)
+    git_dir = _get_git_dir(repo)
+    if git_dir is None:
+        return info
+
+    head_ref, info.head = _read_head(git_dir)
+    info.branch = head_ref[len("refs/heads/") :] if head_ref else ""
+    info.url = _read_remote_url(git_dir)
+    if info.url is not None:
+        info.owner, info.name = _split_repo_url(info.url)
+
+    if info.head is None:
+        return info
+
+    revs = ["HEAD"]
+    if info.branch:
+        info.remote_head = _resolve_ref(git_dir, f"refs/remotes/origin/{info.branch}")
+        if info.remote_head is not None:
+            revs.append(f"origin/{info.branch}")
+
+    described = _describe(repo, revs)
+    if len(described) == len(revs):
+        info.local_commit = described[0]
+        info.remote_commit = described[1] if len(described) > 1 else None
+
+    return info
+
+
+def get_git_state_files(repo: Path) -> List[Path]:
+    """
+    Get the files and directories of a repository whose mtimes change whenever
+    its branch, commits, tags or remotes change. Git updates refs by renaming
+    lock files, which also touches the mtime of the containing directory.
+    :param repo: Path to the local Git repository
+    :return: List of paths, empty if repo is not the root of a repository
+    """
+    git_dir = _get_git_dir(repo)
+    if git_dir is None:
+        return []
+
+    common_dir = _get_common_dir(git_dir)
+    head_ref, _head = _read_head(git_dir)
+    files = [
+        git_dir.joinpath("HEAD"),
+        common_dir.joinpath("config"),
+        common_dir.joinpath("packed-refs"),
+        common_dir.joinpath("refs/tags"),
+        common_dir.joinpath("refs/remotes/origin"),
+    ]
+    if head_ref is not None:
+        branch = head_ref[len("refs/heads/") :]
+        files.append(common_dir.joinpath(head_ref))
+        files.append(common_dir.joinpath(f"refs/remotes/origin/{branch}"))
+    return files
+
+
 def git_clone_wrapper(
-    repo: str, target_dir: Path, branch: str | None = None, force: bool = False
+    repo: str,
+    target_dir: Path,
+    branch: str | None = None,
+    force: bool = False,
+    use_cache: bool = False,
 ) -> None:
     """
     Clones a repository from the given URL and checks out the specified branch if given.
-    The clone will be performed with the '--filter=blob:none' flag to perform a blobless clone.
+    The clone will be performed with the clone strategy configured in kiauh.cfg,
+    by default a blobless clone with the '--filter=blob:none' flag.
 
     :param repo: The URL of the repository to clone.
     :param branch: The branch to check out. If None, master or main, no checkout will be performed.
     :param target_dir: The directory where the repository will be cloned.
     :param force: Force the cloning of the repository even if it already exists.
+    :param use_cache: Clone with the help of the local object cache, if enabled in kiauh.cfg.
     :return: None
     """
+    prepared = _prepared_repos.pop(Path(target_dir), None)
+    if prepared is not None and (prepared.repo, prepared.branch) == (repo, branch):
+        Logger.print_ok(_("Using already cloned repository '{}'").format(repo))
+        return
+
     log = _("Cloning repository from '{}'").format(repo)
     Logger.print_status(log)
     try:
@@ -45,7 +181,9 @@ def git_clone_wrapper(
                 return
             shutil.rmtree(target_dir)
 
-        git_cmd_clone(repo, target_dir, blobless=True)
+        strategy, cache_enabled = _get_clone_settings()
+        reference = update_git_cache(repo) if use_cache and cache_enabled else None
+        git_cmd_clone(repo, target_dir, strategy, reference)
 
         if branch not in ("master", "main"):
             git_cmd_checkout(branch, target_dir)
@@ -59,6 +197,108 @@ def git_clone_wrapper(
         raise GitException(_("Error removing existing repository: {}").format(e.strerror))
 
 
+def git_clone_parallel(
+    tasks: List[CloneTask], max_workers: int = MAX_CLONE_WORKERS
+) -> List[CloneTask]:
+    """
+    Clones several repositories at once and prints one progress line per
+    repository as soon as its clone is done. Repositories whose target directory
+    already exists are skipped, so the interactive handling of git_clone_wrapper
+    still applies to them. Successfully cloned repositories are picked up by
+    git_clone_wrapper instead of being cloned a second time.
+
+    :param tasks: The repositories to clone
+    :param max_workers: Max. number of concurrent clones
+    :return: List of the repositories that were cloned successfully
+    """
+    tasks = [t for t in tasks if not Path(t.target_dir).exists()]
+    if not tasks:
+        return []
+
+    Logger.print_status(_("Cloning {} repositories ...").format(len(tasks)))
+    strategy, cache_enabled = _get_clone_settings()
+    # the workers must not print, their lines would interleave, so the main
+    # thread prints the messages of each clone once it completed
+    cloned: List[CloneTask] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: Dict[Future[float], Tuple[CloneTask, List[LogMessage]]] = {}
+        for task in tasks:
+            log: List[LogMessage] = []
+            future = executor.submit(_clone_quiet, task, strategy, cache_enabled, log)
+            futures[future] = (task, log)
+
+        for future in as_completed(futures):
+            task, log = futures[future]
+            for print_message, message in log:
+                print_message(message)
+            try:
+                duration = future.result()
+            except (CalledProcessError, OSError) as e:
+                error = _get_error_output(e)
+                Logger.print_error(
+                    _("[{}] Cloning failed: {}").format(task.name, error)
+                )
+                continue
+            _prepared_repos[Path(task.target_dir)] = task
+            cloned.append(task)
+            Logger.print_ok(_("[{}] Cloned in {:.1f}s").format(task.name, duration))
+
+    return cloned
+
+
+def update_git_cache(
+    repo: str, messages: List[LogMessage] | None = None
+) -> Path | None:
+    """
+    Fetches the branches of a repository into the local object cache. All forks
+    of a project share one bare repository, so after a fork was cached once,
+    cloning another fork only downloads the objects that differ.
+
+    :param repo: The URL of the repository to cache
+    :param messages: Collects the log messages instead of printing them
+    :return: Path of the bare cache repository or None if caching failed
+    """
+
+    def log(print_message: Callable[[str], None], message: str) -> None:
+        if messages is None:
+            print_message(message)
+        else:
+            messages.append((print_message, message))
+
+    orga, name = _split_repo_url(repo)
+    if name == "-":
+        return None
+
+    cache_dir = GIT_CACHE_DIR.joinpath(f"{name.lower()}.git")
+    refspec = f"+refs/heads/*:refs/remotes/{orga.lower()}/*"
+    try:
+        if not cache_dir.exists():
+            GIT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            command = ["git", "init", "--quiet", "--bare", cache_dir.as_posix()]
+            run(command, stdout=PIPE, stderr=PIPE, check=True)
+
+        log(Logger.print_status, _("Updating git cache of '{}' ...").format(name))
+        command = ["git", "fetch", "--quiet", "--no-tags", repo, refspec]
+        run(command, cwd=cache_dir, stdout=PIPE, stderr=PIPE, check=True)
+        return cache_dir
+    except (CalledProcessError, OSError) as e:
+        # the cache only speeds up cloning, so a regular clone is done instead
+        error = _get_error_output(e)
+        log(Logger.print_warn, _("Updating git cache failed: {}").format(error))
+        return None
+
+
+def discard_prepared_repos() -> None:
+    """
+    Removes repositories cloned by git_clone_parallel which were not used by
+    any installation routine, e.g. because the user aborted it.
+    :return: None
+    """
+    while _prepared_repos:
+        target_dir, _task = _prepared_repos.popitem()
+        shutil.rmtree(target_dir, ignore_errors=True)
+
+
 def git_pull_wrapper(target_dir: Path) -> None:
     """
     A function that updates a repository using git pull.
@@ -84,19 +324,13 @@ def get_repo_name(repo: Path) -> Tuple[str, str]:
     if not repo.exists() or not repo.joinpath(".git").exists():
         return "-", "-"
 
-    try:
-        cmd = ["git", "-C", repo.as_posix(), "config", "--get", "remote.origin.url"]
-        result: str = check_output(cmd, stderr=DEVNULL).decode(encoding="utf-8")
-        substrings: List[str] = result.strip().split("/")[-2:]
-
-        orga: str = substrings[0] if substrings[0] else "-"
-        name: str = substrings[1] if substrings[1] else "-"
-
-        return orga, name.replace(".git", "")
-
-    except CalledProcessError:
+    git_dir = _get_git_dir(repo)
+    url = _read_remote_url(git_dir) if git_dir is not None else None
+    if url is None:
         return "-", "-"
 
+    return _split_repo_url(url)
+
 
 def get_current_branch(repo: Path) -> str:
     """
@@ -104,6 +338,12 @@ def get_current_branch(repo: Path) -> str:
     :param repo: Path to the local Git repository
     :return: Current branch
     """
+    git_dir = _get_git_dir(repo)
+    if git_dir is not None:
+        head_ref, _head = _read_head(git_dir)
+        return head_ref[len("refs/heads/") :] if head_ref else ""
+
+    # not the root of a repository, let git find the enclosing one
     try:
         cmd = ["git", "branch", "--show-current"]
         result: str = check_output(cmd, stderr=DEVNULL, cwd=repo).decode(
@@ -152,18 +392,12 @@ def get_remote_tags(repo_path: str) -> List[str]:
     :return: List of tags
     """
     try:
-        url = f"https://api.github.com/repos/{repo_path}/tags"
-        with urllib.request.urlopen(url) as r:
-            response: HTTPResponse = r
-            if response.getcode() != 200:
-                Logger.print_error(
-                    _("Error retrieving tags: HTTP status code {}").format(response.getcode())
-                )
-                return []
-
-            data = json.loads(response.read())
-            return [item["name"] for item in data]
-    except (JSONDecodeError, TypeError) as e:
+        data = GitHubApiClient().get_json(f"/repos/{repo_path}/tags")
+        return [item["name"] for item in data]
+    except GitHubApiError as e:
+        Logger.print_error(_("Error retrieving tags: {}").format(e))
+        return []
+    except TypeError as e:
         Logger.print_error(_("Error while processing the response: {}").format(e))
         raise
 
@@ -234,47 +468,35 @@ def get_local_commit(repo: Path) -> str | None:
     if not repo.exists() or not repo.joinpath(".git").exists():
         return None
 
-    try:
-        cmd = "git describe HEAD --always --tags | cut -d '-' -f 1,2"
-        return check_output(cmd, shell=True, text=True, cwd=repo).strip()
-    except CalledProcessError:
-        return None
+    described = _describe(repo, ["HEAD"])
+    return described[0] if described else None
 
 
 def get_remote_commit(repo: Path) -> str | None:
     if not repo.exists() or not repo.joinpath(".git").exists():
         return None
 
-    try:
-        branch = get_current_branch(repo)
-        cmd = f"git describe 'origin/{branch}' --always --tags | cut -d '-' -f 1,2"
-        return check_output(
-            cmd,
-            shell=True,
-            text=True,
-            cwd=repo,
-            stderr=DEVNULL,
-        ).strip()
-    except CalledProcessError:
-        return None
+    branch = get_current_branch(repo)
+    described = _describe(repo, [f"origin/{branch}"])
+    return described[0] if described else None
 
 
-def git_cmd_clone(repo: str, target_dir: Path, blobless: bool = False) -> None:
+def git_cmd_clone(
+    repo: str,
+    target_dir: Path,
+    strategy: str = "full",
+    reference: Path | None = None,
+) -> None:
     """
-    Clones a repository with optional blobless clone.
+    Clones a repository with the given clone strategy.
 
     :param repo: URL of the repository to clone.
     :param target_dir: Path where the repository will be cloned.
-    :param blobless: If True, perform a blobless clone by adding the '--filter=blob:none' flag.
+    :param strategy: One of 'full', 'blobless', 'treeless' or 'shallow'.
+    :param reference: Local repository to copy objects from instead of downloading them.
     """
     try:
-        command = ["git", "clone"]
-
-        if blobless:
-            command.append("--filter=blob:none")
-
-        command += [repo, target_dir.as_posix()]
-
+        command = _get_clone_command(repo, target_dir, strategy, reference)
         run(command, check=True)
         Logger.print_ok("Clone successful!")
     except CalledProcessError as e:
@@ -309,6 +531,7 @@ def git_cmd_pull(target_dir: Path) -> None:
         raise
 
 
+@invalidates_status
 def rollback_repository(repo_dir: Path, instance: Type[InstanceType]) -> None:
     q1 = "How many commits do you want to roll back"
     amount: int | None = get_number_input(question=q1, min_value=1, allow_go_back=True)
@@ -348,14 +571,208 @@ def get_repo_url(repo_dir: Path) -> str | None:
     if not repo_dir.exists():
         return None
 
+    git_dir = _get_git_dir(repo_dir)
+    if git_dir is None:
+        return None
+
+    return _read_remote_url(git_dir)
+
+
+def _get_clone_settings() -> Tuple[str, bool]:
+    # imported here, as the settings module indirectly depends on this module
+    from core.settings.kiauh_settings import KiauhSettings
+
+    settings = KiauhSettings().kiauh
+    strategy = settings.clone_strategy or DEFAULT_CLONE_STRATEGY
+    return strategy, bool(settings.use_git_cache)
+
+
+def _get_clone_command(
+    repo: str, target_dir: Path, strategy: str, reference: Path | None
+) -> List[str]:
+    command = ["git", "clone"]
+    if reference is not None:
+        # all known objects are copied from the cache, which makes a partial
+        # clone pointless, and --dissociate keeps the clone usable on its own
+        command += ["--reference-if-able", reference.as_posix(), "--dissociate"]
+    else:
+        command += CLONE_STRATEGIES[strategy]
+    return command + [repo, Path(target_dir).as_posix()]
+
+
+def _clone_quiet(
+    task: CloneTask, strategy: str, cache_enabled: bool, messages: List[LogMessage]
+) -> float:
+    # the output of concurrent clones would interleave, so it is captured
+    start = time.monotonic()
+    reference = None
+    if task.use_cache and cache_enabled:
+        reference = update_git_cache(task.repo, messages)
+    command = _get_clone_command(task.repo, task.target_dir, strategy, reference)
+    command.insert(2, "--quiet")
     try:
-        result = run(
-            ["git", "config", "--get", "remote.origin.url"],
-            cwd=repo_dir,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return result.stdout.strip()
+        run(command, stdout=PIPE, stderr=PIPE, check=True)
+        if task.branch not in (None, "master", "main"):
+            command = ["git", "checkout", "--quiet", task.branch]
+            run(command, cwd=task.target_dir, stdout=PIPE, stderr=PIPE, check=True)
     except CalledProcessError:
+        shutil.rmtree(task.target_dir, ignore_errors=True)
+        raise
+    return time.monotonic() - start
+
+
+def _get_error_output(error: Exception) -> str:
+    if isinstance(error, CalledProcessError) and error.stderr:
+        stderr: bytes = error.stderr
+        return stderr.decode().strip()
+    return str(error)
+
+
+def _get_git_dir(repo: Path) -> Path | None:
+    """
+    Locate the git directory of a repository, following the 'gitdir:' pointer
+    used by worktrees and submodules.
+    :param repo: Path to the local Git repository
+    :return: Path to the git directory or None if repo is not a repository root
+    """
+    dot_git = repo.joinpath(".git")
+    if dot_git.is_dir():
+        return dot_git
+    if not dot_git.is_file():
+        return None
+
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
         return None
+
+    git_dir = Path(content[len("gitdir:") :].strip())
+    git_dir = git_dir if git_dir.is_absolute() else repo.joinpath(git_dir)
+    return git_dir if git_dir.is_dir() else None
+
+
+def _get_common_dir(git_dir: Path) -> Path:
+    # linked worktrees keep their refs and config in a shared directory
+    commondir = git_dir.joinpath("commondir")
+    if not commondir.is_file():
+        return git_dir
+    try:
+        path = Path(commondir.read_text(encoding="utf-8").strip())
+    except OSError:
+        return git_dir
+    return path if path.is_absolute() else git_dir.joinpath(path).resolve()
+
+
+def _read_head(git_dir: Path) -> Tuple[str | None, str | None]:
+    """
+    Read HEAD of a repository
+    :param git_dir: Path to the git directory
+    :return: Tuple of the symbolic ref (None if detached) and the commit hash
+    """
+    try:
+        head = git_dir.joinpath("HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None, None
+
+    if not head.startswith("ref:"):
+        return None, head or None
+
+    ref = head[len("ref:") :].strip()
+    return ref, _resolve_ref(git_dir, ref)
+
+
+def _resolve_ref(git_dir: Path, ref: str) -> str | None:
+    """
+    Resolve a ref to a commit hash, looking at loose refs first and at the
+    packed-refs file second.
+    :param git_dir: Path to the git directory
+    :param ref: Full name of the ref, e.g. 'refs/heads/master'
+    :return: The commit hash or None if the ref does not exist
+    """
+    for base in dict.fromkeys([git_dir, _get_common_dir(git_dir)]):
+        try:
+            value = base.joinpath(ref).read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+        if value.startswith("ref:"):
+            return _resolve_ref(git_dir, value[len("ref:") :].strip())
+        return value or None
+
+    return _read_packed_refs(_get_common_dir(git_dir)).get(ref)
+
+
+def _read_packed_refs(git_dir: Path) -> Dict[str, str]:
+    refs: Dict[str, str] = {}
+    try:
+        with open(git_dir.joinpath("packed-refs"), "r", encoding="utf-8") as f:
+            for line in f:
+                # skip the header and peeled tag lines
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2:
+                    refs[parts[1]] = parts[0]
+    except OSError:
+        pass
+    return refs
+
+
+def _read_remote_url(git_dir: Path, remote: str = "origin") -> str | None:
+    """
+    Read the URL of a remote from the config file of a repository
+    :param git_dir: Path to the git directory
+    :param remote: Name of the remote
+    :return: URL of the remote or None if not configured
+    """
+    try:
+        config = _get_common_dir(git_dir).joinpath("config")
+        lines = config.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+
+    in_remote = False
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(("#", ";")):
+            continue
+        if line.startswith("["):
+            match = re.match(r'^\[\s*remote\s+"(.*)"\s*]$', line)
+            in_remote = match is not None and match.group(1) == remote
+            continue
+        if not in_remote or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        if key.strip().lower() == "url":
+            return value.strip().strip('"') or None
+
+    return None
+
+
+def _split_repo_url(url: str) -> Tuple[str, str]:
+    substrings: List[str] = url.strip().split("/")[-2:]
+    if len(substrings) < 2:
+        return "-", "-"
+
+    orga: str = substrings[0] if substrings[0] else "-"
+    name: str = substrings[1] if substrings[1] else "-"
+
+    return orga, name.replace(".git", "")
+
+
+def _describe(repo: Path, revs: List[str]) -> List[str]:
+    """
+    Describe one or more revisions with a single git call. The output is cut
+    down to '<tag>-<distance>' like `git describe | cut -d '-' -f 1,2` does.
+    :param repo: Path to the local Git repository
+    :param revs: List of revisions to describe
+    :return: List of descriptions in order of revs or empty list on error
+    """
+    try:
+        cmd = ["git", "describe", "--always", "--tags", *revs]
+        result = check_output(cmd, stderr=DEVNULL, text=True, cwd=repo)
+    except (CalledProcessError, OSError):
+        return []
+
+    return ["-".join(line.split("-")[:2]) for line in result.strip().splitlines()]
@@ -8,13 +8,18 @@
 # ======================================================================= #
 from __future__ import annotations
 
-import re
+from copy import deepcopy
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Tuple
 
-from core.constants import SYSTEMD
-from core.instance_manager.base_instance import SUFFIX_BLACKLIST
+from core.instance_manager.base_instance import SUFFIX_BLACKLIST, BaseInstance
+from core.services.status_cache import Fingerprint, get_fingerprint
 from utils.instance_type import InstanceType
+from utils.unit_index import UnitIndex
+
+# instances built by get_instances, keyed by type and suffix, together with the
+# files they were derived from and the fingerprint of these files
+_instance_registry: Dict[Tuple[type, str], Tuple[List[Path], Fingerprint, Any]] = {}
 
 
 def get_instances(
@@ -26,17 +31,15 @@ def get_instances(
         raise ValueError("instance_type must be a class")
 
     name = convert_camelcase_to_kebabcase(instance_type.__name__)
-    pattern = re.compile(f"^{name}(-[0-9a-zA-Z]+)?.service$")
-
-    service_list = [
-        Path(SYSTEMD, service)
-        for service in SYSTEMD.iterdir()
-        if pattern.search(service.name)
-        and not any(s in service.name for s in suffix_blacklist)
-    ]
+    unit_files = UnitIndex().get_unit_files(name, "service")
+    _prune_instance_registry(
+        instance_type, [get_instance_suffix(name, f) for f in unit_files]
+    )
 
     instance_list = [
-        instance_type(get_instance_suffix(name, service)) for service in service_list
+        _get_registered_instance(instance_type, get_instance_suffix(name, service))
+        for service in unit_files
+        if not any(s in service.name for s in suffix_blacklist)
     ]
 
     def _sort_instance_list(suffix: int | str | None):
@@ -56,3 +59,43 @@ def get_instance_suffix(name: str, file_path: Path) -> str:
     # otherwise there is and hyphen left, and we return the part after the hyphen
     suffix = file_path.stem[len(name) :]
     return suffix[1:] if suffix else ""
+
+
+def _get_registered_instance(instance_type: type, suffix: str) -> InstanceType:
+    # constructing an instance reads its service file and possibly its config
+    # file, so constructed instances are reused as long as none of those changed.
+    # callers get a copy, as they are free to modify the instances they get
+    key = (instance_type, suffix)
+    entry = _instance_registry.get(key)
+    if entry is not None:
+        paths, fingerprint, instance = entry
+        if get_fingerprint(paths) == fingerprint:
+            return deepcopy(instance)
+
+    instance = instance_type(suffix)
+    paths = _get_instance_source_files(instance)
+    _instance_registry[key] = (paths, get_fingerprint(paths), instance)
+    return deepcopy(instance)
+
+
+def _get_instance_source_files(instance: InstanceType) -> List[Path]:
+    from utils.sys_utils import get_service_file_path
+
+    # the data dir is read from the service file of the base instance type,
+    # e.g. Moonraker instances use the one of the Klipper instance
+    files: List[Path] = []
+    base: BaseInstance | None = getattr(instance, "base", None)
+    if base is not None:
+        files.append(get_service_file_path(base.instance_type, base.suffix))
+    for attr in ("service_file_path", "cfg_file"):
+        file = getattr(instance, attr, None)
+        if isinstance(file, Path) and file not in files:
+            files.append(file)
+    return files
+
+
+def _prune_instance_registry(instance_type: type, suffixes: List[str]) -> None:
+    # drop the instances of removed units
+    for key in list(_instance_registry):
+        if key[0] is instance_type and key[1] not in suffixes:
+            _instance_registry.pop(key, None)
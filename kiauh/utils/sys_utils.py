@@ -8,23 +8,27 @@
 # ======================================================================= #
 from __future__ import annotations
 
+import hashlib
+import http.client
 import os
-import re
 import select
 import shutil
 import socket
 import sys
+import tempfile
 import time
 import urllib.error
 import urllib.request
+from dataclasses import dataclass
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, CalledProcessError, Popen, check_output, run
-from typing import List, Literal, Set, Tuple
+from typing import IO, Any, Dict, List, Literal, Set, Tuple
 
 from core.constants import SYSTEMD
 from core.logger import Logger
 from utils.fs_utils import check_file_exist, remove_with_sudo
 from utils.input_utils import get_confirm
+from utils.unit_index import UnitIndex
 
 from translate.i18n import _
 
@@ -39,12 +43,47 @@ SysCtlServiceAction = Literal[
     "unmask",
 ]
 SysCtlManageAction = Literal["daemon-reload", "reset-failed"]
+SysCtlBatchAction = Literal["start", "stop", "restart"]
+
+# max. seconds to wait for units to reach their target state with --no-block
+SYSCTL_WAIT_TIMEOUT: float = 60.0
+SYSCTL_POLL_INTERVAL: float = 0.25
+
+DOWNLOAD_CHUNK_SIZE: int = 64 * 1024
+DOWNLOAD_CONNECT_TIMEOUT: float = 10.0
+DOWNLOAD_READ_TIMEOUT: float = 30.0
+DOWNLOAD_RETRIES: int = 5
+# seconds to wait before the first retry, doubled for every further attempt
+DOWNLOAD_BACKOFF: float = 1.0
+DOWNLOAD_BACKOFF_MAX: float = 30.0
+# min. seconds between two progress updates
+PROGRESS_INTERVAL: float = 0.2
 
 
 class VenvCreationFailedException(Exception):
     pass
 
 
+class DownloadVerificationFailedException(Exception):
+    pass
+
+
+@dataclass
+class SysCtlResult:
+    """
+    Outcome of a systemctl action for a single unit
+    :param unit: Name of the unit
+    :param success: Whether the unit reached the state the action aims for
+    :param duration: Seconds until the unit reached that state or the action failed
+    :param error: Error output of systemctl or the state of a failed unit
+    """
+
+    unit: str
+    success: bool
+    duration: float
+    error: str = ""
+
+
 def kill(opt_err_msg: str = "") -> None:
     """
     Kills the application |
@@ -231,12 +270,13 @@ def install_python_packages(target: Path, packages: List[str]) -> None:
         raise VenvCreationFailedException(log)
 
 
-def update_system_package_lists(silent: bool, rls_info_change=False) -> None:
+def update_system_package_lists(silent: bool, rls_info_change=False) -> bool:
     """
     Updates the systems package list |
     :param silent: Log info to the console or not
     :param rls_info_change: Flag for "--allow-releaseinfo-change"
-    :return: None
+    :return: True if the package lists were updated, False if they were recent
+        enough or updating them failed
     """
     cache_mtime: float = 0
     cache_files: List[Path] = [
@@ -251,7 +291,7 @@ def update_system_package_lists(silent: bool, rls_info_change=False) -> None:
     update_interval = 6 * 3600  # 48hrs
 
     if update_age <= update_interval:
-        return
+        return False
 
     if not silent:
         Logger.print_status(_("Updating package list..."))
@@ -265,9 +305,10 @@ def update_system_package_lists(silent: bool, rls_info_change=False) -> None:
         if result.returncode != 0 or result.stderr:
             Logger.print_error(f"{result.stderr}", False)
             Logger.print_error(_("Updating system package list failed!"))
-            return
+            return False
 
         Logger.print_ok(_("System package list update successful!"))
+        return True
     except CalledProcessError as e:
         Logger.print_error(_("Error updating system package list:\n{}").format(e.stderr.decode()))
         raise
@@ -298,19 +339,28 @@ def check_package_install(packages: Set[str]) -> List[str]:
     :param packages: List of strings of package names
     :return: A list containing the names of packages that are not installed
     """
-    not_installed = []
-    for package in packages:
-        command = ["dpkg-query", "-f'${Status}'", "--show", package]
-        result = run(
-            command,
-            stdout=PIPE,
-            stderr=DEVNULL,
-            text=True,
-        )
-        if "installed" not in result.stdout.strip("'").split():
-            not_installed.append(package)
+    if not packages:
+        return []
+
+    # a single dpkg-query call for the whole set instead of one fork per
+    # package, packages unknown to dpkg are reported on stderr and skipped
+    command = [
+        "dpkg-query",
+        "--show",
+        "--showformat=${Package}\t${binary:Package}\t${Status}\n",
+        *packages,
+    ]
+    result = run(command, stdout=PIPE, stderr=DEVNULL, text=True)
+
+    installed = set()
+    for line in result.stdout.splitlines():
+        fields = line.split("\t")
+        if len(fields) != 3 or "installed" not in fields[2].split():
+            continue
+        # multi-arch packages are listed as <name>:<arch> in binary:Package
+        installed.update(fields[:2])
 
-    return not_installed
+    return [package for package in packages if package not in installed]
 
 
 def install_system_packages(packages: List[str]) -> None:
@@ -369,36 +419,246 @@ def get_ipv4_addr() -> str:
         return "127.0.0.1"
 
 
-def download_file(url: str, target: Path, show_progress=True) -> None:
-    """
-    Helper method for downloading files from a provided URL |
+def download_file(
+    url: str,
+    target: Path,
+    show_progress=True,
+    expected_sha256: str | None = None,
+    connect_timeout: float = DOWNLOAD_CONNECT_TIMEOUT,
+    read_timeout: float = DOWNLOAD_READ_TIMEOUT,
+    retries: int = DOWNLOAD_RETRIES,
+) -> None:
+    """
+    Helper method for downloading files from a provided URL. Dropped
+    connections are resumed with range requests and retried with an
+    exponential backoff |
     :param url: the url to the file
     :param target: the target path incl filename
     :param show_progress: show download progress or not
+    :param expected_sha256: the expected SHA-256 hex digest, if known
+    :param connect_timeout: seconds to wait for the connection to be established
+    :param read_timeout: seconds to wait for data before the connection is dropped
+    :param retries: how often a failed download is retried
     :return: None
     """
     try:
-        if show_progress:
-            urllib.request.urlretrieve(url, target, download_progress)
-            sys.stdout.write("\n")
-        else:
-            urllib.request.urlretrieve(url, target)
-    except urllib.error.HTTPError as e:
-        Logger.print_error(_("Download failed! HTTP error occured: {}").format(e))
-        raise
-    except urllib.error.URLError as e:
-        Logger.print_error(_("Download failed! URL error occured: {}").format(e))
+        with open(target, "wb") as f:
+            _stream_download(
+                url,
+                f,
+                show_progress=show_progress,
+                expected_sha256=expected_sha256,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                retries=retries,
+            )
+    except Exception:
+        Path(target).unlink(missing_ok=True)
         raise
-    except Exception as e:
-        Logger.print_error(_("Download failed! An error occured: {}").format(e))
+
+
+def download_to_buffer(
+    url: str,
+    expected_size: int | None = None,
+    expected_sha256: str | None = None,
+    show_progress=True,
+) -> IO[bytes]:
+    """
+    Helper method for downloading files from a provided URL into an anonymous
+    temporary file. Size and checksum are verified while streaming |
+    :param url: the url to the file
+    :param expected_size: the expected size in bytes, if known
+    :param expected_sha256: the expected SHA-256 hex digest, if known
+    :param show_progress: show download progress or not
+    :return: the buffer, positioned at its start
+    """
+    # a spooled file is not seekable() before Python 3.11, which ZipFile needs
+    buffer = tempfile.TemporaryFile()
+    try:
+        size = _stream_download(
+            url, buffer, show_progress=show_progress, expected_sha256=expected_sha256
+        )
+        if expected_size is not None and size != expected_size:
+            error = _("Size mismatch: expected {} bytes, got {}").format(
+                expected_size, size
+            )
+            Logger.print_error(_("Download failed! An error occured: {}").format(error))
+            raise DownloadVerificationFailedException(error)
+    except Exception:
+        buffer.close()
         raise
 
+    buffer.seek(0)
+    return buffer
+
+
+def _stream_download(
+    url: str,
+    sink: IO[bytes],
+    show_progress=True,
+    expected_sha256: str | None = None,
+    connect_timeout: float = DOWNLOAD_CONNECT_TIMEOUT,
+    read_timeout: float = DOWNLOAD_READ_TIMEOUT,
+    retries: int = DOWNLOAD_RETRIES,
+) -> int:
+    sha256 = hashlib.sha256()
+    size, total_size = 0, -1
+    # ETag or Last-Modified of the first response, a resumed download must only
+    # continue if the file did not change in the meantime
+    validator: str | None = None
+    progress = DownloadProgress(show_progress)
+    attempt = 0
+    opener = urllib.request.build_opener(
+        _HTTPHandler(read_timeout), _HTTPSHandler(read_timeout)
+    )
+
+    while True:
+        request = urllib.request.Request(url)
+        if size > 0:
+            request.add_header("Range", f"bytes={size}-")
+            if validator is not None:
+                request.add_header("If-Range", validator)
+        try:
+            with opener.open(request, timeout=connect_timeout) as response:
+                if size > 0 and response.status != 206:
+                    # range not supported or file changed, start from scratch
+                    sink.seek(0)
+                    sink.truncate()
+                    sha256, size = hashlib.sha256(), 0
+                if size == 0:
+                    headers = response.headers
+                    validator = headers.get("ETag") or headers.get("Last-Modified")
+                    length = headers.get("Content-Length")
+                    total_size = int(length) if length else -1
+
+                while chunk := response.read(DOWNLOAD_CHUNK_SIZE):
+                    sink.write(chunk)
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    progress.update(size, total_size)
+
+            if 0 <= total_size != size:
+                raise ConnectionError(
+                    _("connection closed after {} of {} bytes").format(size, total_size)
+                )
+            break
+
+        except urllib.error.HTTPError as e:
+            if e.code < 500 and e.code != 429:
+                progress.finish()
+                Logger.print_error(
+                    _("Download failed! HTTP error occured: {}").format(e)
+                )
+                raise
+            error: Exception = e
+        except (OSError, http.client.HTTPException) as e:
+            error = e
+
+        attempt += 1
+        if attempt > retries:
+            progress.finish()
+            Logger.print_error(_("Download failed! An error occured: {}").format(error))
+            raise error
+        delay = min(DOWNLOAD_BACKOFF * 2 ** (attempt - 1), DOWNLOAD_BACKOFF_MAX)
+        progress.finish()
+        Logger.print_warn(
+            _("Download interrupted ({}), retrying in {}s ...").format(error, delay)
+        )
+        time.sleep(delay)
+
+    progress.finish()
+
+    if expected_sha256 is not None and sha256.hexdigest() != expected_sha256:
+        error_msg = _("Checksum mismatch: expected {}, got {}").format(
+            expected_sha256, sha256.hexdigest()
+        )
+        Logger.print_error(_("Download failed! An error occured: {}").format(error_msg))
+        raise DownloadVerificationFailedException(error_msg)
+
+    return size
+
+
+class _HTTPConnection(http.client.HTTPConnection):
+    """HTTP connection which waits for data at most read_timeout seconds"""
+
+    def __init__(
+        self, host: str, *, read_timeout: float = DOWNLOAD_READ_TIMEOUT, **kwargs: Any
+    ) -> None:
+        super().__init__(host, **kwargs)
+        self.read_timeout = read_timeout
+
+    def connect(self) -> None:
+        # urlopen() applies its timeout to connecting and reading alike, so
+        # the socket of the established connection gets its own read timeout
+        super().connect()
+        self.sock.settimeout(self.read_timeout)
+
+
+class _HTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS connection which waits for data at most read_timeout seconds"""
+
+    def __init__(
+        self, host: str, *, read_timeout: float = DOWNLOAD_READ_TIMEOUT, **kwargs: Any
+    ) -> None:
+        super().__init__(host, **kwargs)
+        self.read_timeout = read_timeout
+
+    def connect(self) -> None:
+        super().connect()
+        self.sock.settimeout(self.read_timeout)
+
+
+class _HTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, read_timeout: float) -> None:
+        super().__init__()
+        self.read_timeout = read_timeout
+
+    def http_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self.do_open(_HTTPConnection, req, read_timeout=self.read_timeout)
+
+
+class _HTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, read_timeout: float) -> None:
+        super().__init__()
+        self.read_timeout = read_timeout
+
+    def https_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self.do_open(_HTTPSConnection, req, read_timeout=self.read_timeout)
+
+
+class DownloadProgress:
+    """
+    Throttled download progress output. Writing to stdout for every received
+    block slows down downloads on slow terminals, e.g. serial consoles or SSH
+    sessions over a weak connection.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.last_update: float = 0.0
+        self.visible = False
+
+    def update(self, downloaded: int, total_size: int) -> None:
+        if not self.enabled or total_size <= 0:
+            return
+        now = time.monotonic()
+        if downloaded < total_size and now - self.last_update < PROGRESS_INTERVAL:
+            return
+        self.last_update = now
+        self.visible = True
+        download_progress(downloaded, 1, total_size)
+
+    def finish(self) -> None:
+        if self.visible:
+            sys.stdout.write("\n")
+            self.visible = False
+
 
 def download_progress(block_num, block_size, total_size) -> None:
     """
-    Reporthook method for urllib.request.urlretrieve() method call in download_file() |
-    :param block_num:
-    :param block_size:
+    Prints the download progress |
+    :param block_num: number of blocks downloaded so far
+    :param block_size: size of a block in bytes
     :param total_size: total filesize in bytes
     :return: None
     """
@@ -447,6 +707,104 @@ def cmd_sysctl_service(name: str, action: SysCtlServiceAction) -> None:
         raise
 
 
+def cmd_sysctl_services(
+    names: List[str],
+    action: SysCtlBatchAction,
+    no_block: bool = False,
+    timeout: float = SYSCTL_WAIT_TIMEOUT,
+) -> List[SysCtlResult]:
+    """
+    Helper method to start, stop or restart several systemd services with a
+    single systemctl call, so systemd runs the jobs in parallel. Every service
+    receives the action, even if the action fails for another one of them.
+    With no_block, systemctl only enqueues the jobs and each service is polled
+    until it reached its target state, which reports the duration per service. |
+    :param names: the service names
+    :param action: Either "start", "stop" or "restart"
+    :param no_block: Whether to enqueue the jobs and wait for the services
+    :param timeout: Max. seconds to wait for the services with no_block
+    :return: List of the results of all services, in the order of names
+    """
+    if not names:
+        return []
+
+    Logger.print_status(f"{action.capitalize()} {', '.join(names)} ...")
+    target = "inactive" if action == "stop" else "active"
+    start = time.monotonic()
+    cmd = ["sudo", "systemctl", action, *(["--no-block"] if no_block else []), *names]
+    result = run(cmd, stderr=PIPE, check=False)
+    error = result.stderr.decode().strip()
+
+    if no_block:
+        states, durations = _wait_for_unit_states(names, start, timeout)
+    else:
+        duration = time.monotonic() - start
+        durations = {name: duration for name in names}
+        if result.returncode == 0:
+            # systemctl waited for all jobs, and all of them succeeded
+            states = {name: target for name in names}
+        else:
+            states = _get_unit_states(names)
+
+    results: List[SysCtlResult] = []
+    for name in names:
+        state = states.get(name, "unknown")
+        success = _is_target_state(state, target)
+        unit_error = "" if success else error or _("unit is {}").format(state)
+        results.append(SysCtlResult(name, success, durations[name], unit_error))
+        if success:
+            Logger.print_ok(_("{} ({:.1f}s)").format(name, durations[name]))
+        else:
+            Logger.print_error(_("Failed to {} {}: {}").format(action, name, unit_error))
+    return results
+
+
+def _get_unit_states(names: List[str]) -> Dict[str, str]:
+    # is-active prints one state per unit, in the order of the given units
+    result = run(["systemctl", "is-active", *names], stdout=PIPE, check=False)
+    return dict(zip(names, result.stdout.decode().split()))
+
+
+def _is_target_state(state: str, target: str) -> bool:
+    # a stopped unit might be reported as failed if it exited with an error
+    return state == target or (target == "inactive" and state == "failed")
+
+
+def _get_job_units() -> Set[str]:
+    # units with a queued or running job, e.g. a restart which didn't finish
+    result = run(
+        ["systemctl", "list-jobs", "--no-legend", "--plain"], stdout=PIPE, check=False
+    )
+    lines = result.stdout.decode().splitlines()
+    return {columns[1] for columns in map(str.split, lines) if len(columns) > 1}
+
+
+def _wait_for_unit_states(
+    names: List[str], start: float, timeout: float
+) -> Tuple[Dict[str, str], Dict[str, float]]:
+    states: Dict[str, str] = {}
+    durations: Dict[str, float] = {}
+    pending = list(names)
+    while pending:
+        jobs = _get_job_units()
+        states.update(_get_unit_states(pending))
+        elapsed = time.monotonic() - start
+        for name in pending:
+            # a unit is settled once its job is done and it is not in transition
+            state = states.get(name, "unknown")
+            if name not in jobs and not state.endswith("ing"):
+                durations[name] = elapsed
+        pending = [name for name in pending if name not in durations]
+        if not pending or elapsed > timeout:
+            break
+        time.sleep(SYSCTL_POLL_INTERVAL)
+
+    elapsed = time.monotonic() - start
+    for name in pending:
+        durations[name] = elapsed
+    return states, durations
+
+
 def cmd_sysctl_manage(action: SysCtlManageAction) -> None:
     try:
         run(["sudo", "systemctl", action], stderr=PIPE, check=True)
@@ -466,13 +824,10 @@ def unit_file_exists(
     :return: True if the unit file exists, False otherwise
     """
     exclude = exclude or []
-    pattern = re.compile(f"^{name}(-[0-9a-zA-Z]+)?.{suffix}$")
-    service_list = [
-        Path(SYSTEMD, service)
-        for service in SYSTEMD.iterdir()
-        if pattern.search(service.name) and not any(s in service.name for s in exclude)
-    ]
-    return any(service_list)
+    return any(
+        not any(s in unit_file.name for s in exclude)
+        for unit_file in UnitIndex().get_unit_files(name, suffix)
+    )
 
 
 def log_process(process: Popen) -> None:
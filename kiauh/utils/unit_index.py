@@ -0,0 +1,83 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Literal, Tuple
+
+from core.constants import SYSTEMD
+from core.singleton import Singleton
+
+UnitType = Literal["service", "timer"]
+
+# suffixes of instances are alphanumeric, e.g. 'klipper-printer_1' is not valid
+SUFFIX_RE = re.compile(r"^[0-9a-zA-Z]+$")
+
+
+class UnitIndex(metaclass=Singleton):
+    """
+    Snapshot of the service and timer files in the systemd unit directory. The
+    directory is listed once and every unit file is indexed under its full name
+    and, if it has an instance suffix, under the name without the suffix. The
+    snapshot is rebuilt as soon as the mtime of the directory changes, which
+    happens whenever a unit file is created, renamed or deleted.
+    """
+
+    def __init__(self) -> None:
+        self.directory: Path = SYSTEMD
+        self.__lock = Lock()
+        self.__mtime: int | None = None
+        # maps (name, unit type) -> names of the matching unit files
+        self.__units: Dict[Tuple[str, str], List[str]] = {}
+
+    def get_unit_files(self, name: str, unit_type: UnitType) -> List[Path]:
+        """
+        Get all unit files of the given name and type, with or without an
+        instance suffix, e.g. 'klipper.service' and 'klipper-1.service'
+        :param name: The kebab-case name of the unit
+        :param unit_type: The type of the unit, either "service" or "timer"
+        :return: List of the unit files, sorted by file name
+        """
+        return [
+            self.directory.joinpath(f)
+            for f in self.__get_units().get((name, unit_type), [])
+        ]
+
+    def __get_units(self) -> Dict[Tuple[str, str], List[str]]:
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return {}
+
+        with self.__lock:
+            if mtime != self.__mtime:
+                self.__units = self.__scan()
+                self.__mtime = mtime
+            return self.__units
+
+    def __scan(self) -> Dict[Tuple[str, str], List[str]]:
+        units: Dict[Tuple[str, str], List[str]] = {}
+        try:
+            file_names = sorted(os.listdir(self.directory))
+        except OSError:
+            return units
+
+        for file_name in file_names:
+            stem, _, unit_type = file_name.rpartition(".")
+            if unit_type not in ("service", "timer") or not stem:
+                continue
+            units.setdefault((stem, unit_type), []).append(file_name)
+            # 'moonraker-2' is an instance of 'moonraker' as well
+            name, sep, suffix = stem.rpartition("-")
+            if sep and name and SUFFIX_RE.match(suffix):
+                units.setdefault((name, unit_type), []).append(file_name)
+        return units
@@ -0,0 +1,131 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from utils import config_includes
+from utils.config_includes import MergedConfig, get_parsed_config
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    config_dir = tmp_path.joinpath("printer_data", "config")
+    config_dir.mkdir(parents=True)
+    return config_dir
+
+
+def write(config_dir: Path, name: str, content: str) -> Path:
+    file = config_dir.joinpath(name)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(content)
+    return file.resolve()
+
+
+def test_include(config_dir):
+    root = write(config_dir, "printer.cfg", "[include mainsail.cfg]\n[printer]\n")
+    mainsail = write(config_dir, "mainsail.cfg", "[pause_resume]\n")
+
+    merged = MergedConfig(root)
+
+    assert merged.files == [root, mainsail]
+    assert merged.includes[root] == [mainsail]
+    assert merged.has_section("pause_resume")
+    assert merged.get_section_sources("pause_resume") == [mainsail]
+    # included sections take the place of the include section
+    assert merged.get_sections() == ["include mainsail.cfg", "pause_resume", "printer"]
+
+
+def test_include_relative_to_including_file(config_dir):
+    root = write(config_dir, "printer.cfg", "[include macros/all.cfg]\n")
+    write(config_dir, "macros/all.cfg", "[include homing.cfg]\n")
+    homing = write(config_dir, "macros/homing.cfg", "[homing_override]\n")
+
+    merged = MergedConfig(root)
+
+    assert merged.get_section_sources("homing_override") == [homing]
+
+
+def test_include_glob(config_dir):
+    root = write(config_dir, "printer.cfg", "[include macros/*.cfg]\n")
+    b = write(config_dir, "macros/b.cfg", "[gcode_macro B]\n")
+    a = write(config_dir, "macros/a.cfg", "[gcode_macro A]\n")
+    write(config_dir, "macros/readme.txt", "[gcode_macro C]\n")
+
+    merged = MergedConfig(root)
+
+    assert merged.includes[root] == [a, b]
+    assert not merged.has_section("gcode_macro C")
+
+
+def test_missing_include(config_dir):
+    root = write(config_dir, "printer.cfg", "[include missing.cfg]\n[printer]\n")
+
+    merged = MergedConfig(root)
+
+    assert merged.files == [root]
+    assert merged.includes[root] == []
+
+
+def test_include_cycle(config_dir):
+    root = write(config_dir, "printer.cfg", "[include a.cfg]\n")
+    a = write(config_dir, "a.cfg", "[include b.cfg]\n[section_a]\n")
+    b = write(config_dir, "b.cfg", "[include a.cfg]\n[include b.cfg]\n")
+
+    merged = MergedConfig(root)
+
+    assert merged.files == [root, a, b]
+    assert merged.includes[b] == [a, b]
+
+
+def test_last_definition_wins(config_dir):
+    root = write(
+        config_dir,
+        "printer.cfg",
+        "[include base.cfg]\n[printer]\nmax_velocity: 300\n",
+    )
+    base = write(config_dir, "base.cfg", "[printer]\nmax_velocity: 200\nmax_z: 5\n")
+
+    merged = MergedConfig(root)
+
+    assert merged.get_section_sources("printer") == [base, root]
+    assert merged.get_option_source("printer", "max_velocity") == root
+    assert merged.getval("printer", "max_velocity") == "300"
+    assert merged.get_option_source("printer", "max_z") == base
+    assert merged.getval("printer", "max_accel", "1000") == "1000"
+    assert merged.get_option_source("printer", "max_accel") is None
+
+
+def test_parsed_config_is_reparsed_on_change(config_dir):
+    file = write(config_dir, "printer.cfg", "[printer]\n")
+    scp = get_parsed_config(file)
+    assert get_parsed_config(file) is scp
+
+    file.write_text("[printer]\nkinematics: corexy\n")
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    changed = get_parsed_config(file)
+
+    assert changed is not scp
+    assert changed is not None and changed.has_option("printer", "kinematics")
+
+
+def test_parsed_configs_are_bounded(config_dir, monkeypatch):
+    monkeypatch.setattr(config_includes, "MAX_PARSED_CONFIGS", 2)
+    files = [write(config_dir, f"{i}.cfg", "[printer]\n") for i in range(3)]
+
+    first = get_parsed_config(files[0])
+    for file in files[1:]:
+        get_parsed_config(file)
+
+    assert files[0] not in config_includes._parsed_configs
+    assert len(config_includes._parsed_configs) == 2
+    assert get_parsed_config(files[0]) is not first
@@ -0,0 +1,79 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from utils import config_utils
+from utils.config_utils import ConfigBatch
+
+CONFIGS = [
+    b"[printer]\nkinematics: corexy\n",
+    # line endings and a missing final newline are not preserved by a render
+    b"[printer]\r\nkinematics: corexy\r\n",
+    b"[printer]\nkinematics: corexy",
+]
+
+
+@pytest.fixture
+def cfg_files(tmp_path: Path) -> List[Path]:
+    files = []
+    for i, content in enumerate(CONFIGS):
+        cfg_file = tmp_path.joinpath(f"printer_{i}.cfg")
+        cfg_file.write_bytes(content)
+        # an mtime in the past, so any write changes it
+        os.utime(cfg_file, (1_000_000, 1_000_000))
+        files.append(cfg_file)
+    return files
+
+
+def test_unchanged_files_are_not_written(cfg_files):
+    assert ConfigBatch(cfg_files).commit() == []
+    for cfg_file, content in zip(cfg_files, CONFIGS):
+        assert cfg_file.read_bytes() == content
+        assert cfg_file.stat().st_mtime == 1_000_000
+
+
+def test_only_edited_files_are_written(cfg_files):
+    batch = ConfigBatch(cfg_files)
+    batch.get(cfg_files[1]).add_section("stepper_x")
+
+    assert batch.commit() == [cfg_files[1]]
+    assert b"[stepper_x]" in cfg_files[1].read_bytes()
+    for cfg_file in (cfg_files[0], cfg_files[2]):
+        assert cfg_file.stat().st_mtime == 1_000_000
+
+
+def test_failed_write_rolls_back_the_batch(cfg_files, monkeypatch):
+    write_atomic = config_utils.write_atomic
+    writes: List[Path] = []
+
+    def fail_third_write(file: Path, content: bytes) -> None:
+        writes.append(file)
+        if len(writes) == 3:
+            raise OSError("No space left on device")
+        write_atomic(file, content)
+
+    monkeypatch.setattr(config_utils, "write_atomic", fail_third_write)
+    batch = ConfigBatch(cfg_files)
+    for cfg_file in cfg_files:
+        batch.get(cfg_file).add_section("stepper_x")
+
+    with pytest.raises(OSError):
+        batch.commit()
+    # the first two files are restored in reverse order
+    assert writes[3:] == [cfg_files[1], cfg_files[0]]
+    for cfg_file, content in zip(cfg_files, CONFIGS):
+        assert cfg_file.read_bytes() == content
+    assert sorted(p.name for p in cfg_files[0].parent.iterdir()) == [
+        f.name for f in cfg_files
+    ]
@@ -0,0 +1,69 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Type, TypeVar
+
+import pytest
+
+# puts the application root on the path, so `core`, `utils` and the other
+# packages of KIAUH are importable the same way KIAUH itself imports them
+import kiauh  # noqa: F401
+
+S = TypeVar("S", bound="StubServer")
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local HTTP server for tests, recording the headers of every request"""
+
+    daemon_threads = True
+
+    def __init__(self, handler: Type[StubRequestHandler]) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.requests: List[Dict[str, str]] = []
+
+    def url_for(self, path: str) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}{path}"
+
+    def handle_error(self, request, client_address) -> None:
+        # clients hanging up on purpose, e.g. on a timeout, are expected
+        pass
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def record_request(self) -> None:
+        self.server.requests.append({k.lower(): v for k, v in self.headers.items()})
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def start_stub_server() -> Iterator[Callable[[S], S]]:
+    """Serves the given stub servers in the background until the test ends"""
+    servers: List[StubServer] = []
+
+    def start(server: S) -> S:
+        thread = threading.Thread(
+            target=server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
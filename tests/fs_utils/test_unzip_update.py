@@ -0,0 +1,117 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from typing import Dict
+from zipfile import ZipFile
+
+import pytest
+from utils import fs_utils
+from utils.fs_utils import unzip_update
+from utils.sys_utils import download_to_buffer
+
+from tests.sys_utils.conftest import StubFileServer
+
+V1 = {
+    "index.html": b"<html>v1</html>",
+    "assets/app.js": b"app v1",
+    "assets/old.js": b"old",
+    "img/logo.svg": b"<svg/>",
+}
+V2 = {
+    "index.html": b"<html>v2</html>",
+    "assets/app.js": b"app v1",
+    "assets/new.js": b"new",
+}
+
+
+def create_zip(files: Dict[str, bytes]) -> io.BytesIO:
+    archive = io.BytesIO()
+    with ZipFile(archive, "w") as _zip:
+        for name, data in files.items():
+            _zip.writestr(name, data)
+    archive.seek(0)
+    return archive
+
+
+def read_tree(root: Path) -> Dict[str, bytes]:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in root.rglob("*")
+        if p.is_file()
+    }
+
+
+@pytest.fixture(autouse=True)
+def manifest_dir(tmp_path: Path, monkeypatch) -> Path:
+    manifest_dir = tmp_path.joinpath("manifests")
+    monkeypatch.setattr(fs_utils, "ZIP_MANIFEST_DIR", manifest_dir)
+    return manifest_dir
+
+
+@pytest.fixture
+def web_root(tmp_path: Path) -> Path:
+    web_root = tmp_path.joinpath("mainsail")
+    assert unzip_update(create_zip(V1), web_root) == (len(V1), 0)
+    return web_root
+
+
+def test_first_extraction_replaces_directory(web_root, manifest_dir):
+    assert read_tree(web_root) == V1
+    # the manifest is not served along with the web client
+    assert len(list(manifest_dir.iterdir())) == 1
+
+
+def test_update_writes_changed_files_only(web_root, tmp_path):
+    unchanged = web_root.joinpath("assets/app.js").stat().st_ino
+    web_root.joinpath("config.json").write_text("{}")
+
+    assert unzip_update(create_zip(V2), web_root) == (2, 2)
+    assert read_tree(web_root) == {**V2, "config.json": b"{}"}
+    assert web_root.joinpath("assets/app.js").stat().st_ino == unchanged
+    assert not web_root.joinpath("img").exists()
+    # no staging or backup directory is left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mainsail", "manifests"]
+
+
+def test_update_leaves_served_files_untouched(web_root):
+    # a file opened by the webserver keeps its content
+    with open(web_root.joinpath("index.html"), "rb") as served:
+        unzip_update(create_zip(V2), web_root)
+        assert served.read() == V1["index.html"]
+
+
+def test_update_without_manifest_replaces_directory(web_root, manifest_dir):
+    for manifest in manifest_dir.iterdir():
+        manifest.unlink()
+    assert unzip_update(create_zip(V2), web_root) == (len(V2), 0)
+    assert read_tree(web_root) == V2
+
+
+def test_failed_update_replaces_directory(web_root, monkeypatch):
+    def no_links(src: str, dst: str) -> None:
+        raise OSError("hard links are not supported")
+
+    monkeypatch.setattr(os, "link", no_links)
+    assert unzip_update(create_zip(V2), web_root) == (len(V2), 0)
+    assert read_tree(web_root) == V2
+
+
+def test_update_from_downloaded_buffer(tmp_path, start_stub_server):
+    # the web clients are extracted from the buffer they are downloaded into
+    server = start_stub_server(StubFileServer())
+    web_root = tmp_path.joinpath("fluidd")
+    for files, result in ((V1, (len(V1), 0)), (V2, (2, 2))):
+        server.content = create_zip(files).getvalue()
+        with download_to_buffer(server.url, show_progress=False) as archive:
+            assert unzip_update(archive, web_root) == result
+        assert read_tree(web_root) == files
@@ -0,0 +1,60 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import json
+import stat
+
+from utils.fs_utils import write_atomic, write_json_cache
+
+
+def test_write_atomic(tmp_path):
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    cfg_file.write_bytes(b"[printer]\n")
+    cfg_file.chmod(0o600)
+
+    write_atomic(cfg_file, b"[printer]\nkinematics: corexy\n")
+
+    assert cfg_file.read_bytes() == b"[printer]\nkinematics: corexy\n"
+    assert stat.S_IMODE(cfg_file.stat().st_mode) == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["printer.cfg"]
+
+
+def test_write_atomic_new_file(tmp_path):
+    cfg_file = tmp_path.joinpath("printer.cfg")
+    write_atomic(cfg_file, b"[printer]\n")
+    assert cfg_file.read_bytes() == b"[printer]\n"
+
+
+def test_write_atomic_follows_symlinks(tmp_path):
+    # e.g. a printer.cfg shared by several instances
+    shared_dir = tmp_path.joinpath("shared")
+    shared_dir.mkdir()
+    shared_file = shared_dir.joinpath("printer.cfg")
+    shared_file.write_bytes(b"[printer]\n")
+    link = tmp_path.joinpath("printer.cfg")
+    link.symlink_to(shared_file)
+
+    write_atomic(link, b"[printer]\nkinematics: corexy\n")
+
+    assert link.is_symlink()
+    assert shared_file.read_bytes() == b"[printer]\nkinematics: corexy\n"
+    assert [p.name for p in shared_dir.iterdir()] == ["printer.cfg"]
+
+
+def test_write_json_cache(tmp_path):
+    cache_file = tmp_path.joinpath("cache", "status.json")
+    write_json_cache(cache_file, {"klipper": [1, 2]})
+
+    assert json.loads(cache_file.read_text()) == {"klipper": [1, 2]}
+    assert [p.name for p in cache_file.parent.iterdir()] == ["status.json"]
+
+
+def test_unwritable_json_cache_is_skipped(tmp_path):
+    # the parent of the cache file is a file, so it can't be created
+    tmp_path.joinpath("cache").write_text("")
+    write_json_cache(tmp_path.joinpath("cache", "status.json"), {})
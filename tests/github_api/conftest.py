@@ -0,0 +1,79 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+from core.services.github_api import GitHubApiClient
+
+from tests.conftest import StubRequestHandler, StubServer
+
+TAGS_PATH = "/repos/owner/repo/tags"
+TAGS = [{"name": "v1.1.0"}, {"name": "v1.0.0"}]
+ETAG = '"tags-v1"'
+
+
+class StubGitHub(StubServer):
+    """Local stand-in for the GitHub API serving a single tags endpoint"""
+
+    def __init__(self) -> None:
+        super().__init__(StubHandler)
+        self.status = 200
+        self.rate_limit_remaining = 60
+        self.rate_limit_reset = time.time() + 3600
+        # answer the next request and close the connection without telling
+        self.drop_connection = False
+        self.delay = 0.0
+
+
+class StubHandler(StubRequestHandler):
+    server: StubGitHub
+
+    def do_GET(self) -> None:
+        stub = self.server
+        self.record_request()
+        time.sleep(stub.delay)
+
+        status = stub.status
+        if status == 200 and self.headers.get("If-None-Match") == ETAG:
+            status = 304
+        body = json.dumps(TAGS).encode() if status == 200 else b""
+
+        self.send_response(status)
+        self.send_header("ETag", ETAG)
+        self.send_header("X-RateLimit-Remaining", str(stub.rate_limit_remaining))
+        self.send_header("X-RateLimit-Reset", str(int(stub.rate_limit_reset)))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        if stub.drop_connection:
+            stub.drop_connection = False
+            self.close_connection = True
+
+
+@pytest.fixture
+def stub_github(start_stub_server) -> StubGitHub:
+    server: StubGitHub = start_stub_server(StubGitHub())
+    return server
+
+
+@pytest.fixture
+def client(stub_github: StubGitHub, tmp_path) -> GitHubApiClient:
+    client = GitHubApiClient()
+    client.host, client.port = stub_github.server_address[:2]
+    client.use_tls = False
+    client.cache_file = tmp_path.joinpath("github_api_cache.json")
+    # the client is a singleton, drop the state of previous tests
+    client._GitHubApiClient__cache = None
+    client._GitHubApiClient__local = threading.local()
+    return client
@@ -0,0 +1,108 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import time
+
+import pytest
+from core.services import github_api
+from core.services.github_api import GitHubApiError
+
+from tests.github_api.conftest import ETAG, TAGS, TAGS_PATH
+
+
+def test_get_json(client, stub_github):
+    assert client.get_json(TAGS_PATH) == TAGS
+    assert len(stub_github.requests) == 1
+    assert "if-none-match" not in stub_github.requests[0]
+
+
+def test_fresh_response_is_served_from_cache(client, stub_github):
+    client.get_json(TAGS_PATH)
+    assert client.get_json(TAGS_PATH) == TAGS
+    assert len(stub_github.requests) == 1
+
+
+def test_conditional_request(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "MAX_AGE", 0)
+    client.get_json(TAGS_PATH)
+    assert client.get_json(TAGS_PATH) == TAGS
+    assert len(stub_github.requests) == 2
+    assert stub_github.requests[1]["if-none-match"] == ETAG
+
+
+def test_cache_is_persisted(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "MAX_AGE", 0)
+    client.get_json(TAGS_PATH)
+    assert client.cache_file.exists()
+
+    # a new session revalidates the response stored on disk
+    client._GitHubApiClient__cache = None
+    assert client.get_json(TAGS_PATH) == TAGS
+    assert stub_github.requests[-1]["if-none-match"] == ETAG
+
+
+def test_rate_limit_serves_cached_response(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "MAX_AGE", 0)
+    stub_github.rate_limit_remaining = 0
+    client.get_json(TAGS_PATH)
+
+    assert client.get_json(TAGS_PATH) == TAGS
+    assert len(stub_github.requests) == 1
+
+
+def test_rate_limit_without_cached_response(client, stub_github):
+    stub_github.rate_limit_remaining = 0
+    client.get_json(TAGS_PATH)
+
+    with pytest.raises(GitHubApiError, match="rate limit"):
+        client.get_json("/repos/owner/other/tags")
+
+
+def test_rate_limit_reset(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "MAX_AGE", 0)
+    stub_github.rate_limit_remaining = 0
+    stub_github.rate_limit_reset = time.time() - 1
+    client.get_json(TAGS_PATH)
+
+    client.get_json(TAGS_PATH)
+    assert len(stub_github.requests) == 2
+
+
+def test_server_error_serves_cached_response(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "MAX_AGE", 0)
+    client.get_json(TAGS_PATH)
+    stub_github.status = 500
+
+    assert client.get_json(TAGS_PATH) == TAGS
+
+
+def test_server_error_without_cached_response(client, stub_github):
+    stub_github.status = 500
+    with pytest.raises(GitHubApiError, match="500"):
+        client.get_json(TAGS_PATH)
+
+
+def test_closed_connection_is_retried(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "MAX_AGE", 0)
+    stub_github.drop_connection = True
+    client.get_json(TAGS_PATH)
+
+    # the kept-alive connection was closed by the server in the meantime
+    assert client.get_json(TAGS_PATH) == TAGS
+    assert len(stub_github.requests) == 2
+
+
+def test_timeout_is_not_retried(client, stub_github, monkeypatch):
+    monkeypatch.setattr(github_api, "REQUEST_TIMEOUT", 0.2)
+    stub_github.delay = 0.5
+
+    start = time.monotonic()
+    with pytest.raises(GitHubApiError):
+        client.get_json(TAGS_PATH)
+    assert time.monotonic() - start < 0.4
+    assert len(stub_github.requests) == 1
@@ -0,0 +1,82 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, List
+
+import pytest
+from utils import instance_utils
+from utils.instance_utils import _get_registered_instance
+
+
+@dataclass
+class Dummy:
+    suffix: str
+    service_file_path: Path = field(init=False)
+    cfg_file: Path = field(init=False)
+    folders: List[Path] = field(init=False)
+
+    # set by the service_dir fixture
+    service_dir: ClassVar[Path] = Path()
+    constructed: ClassVar[int] = 0
+
+    def __post_init__(self) -> None:
+        Dummy.constructed += 1
+        self.service_file_path = self.service_dir.joinpath(
+            f"dummy-{self.suffix}.service"
+        )
+        self.cfg_file = self.service_dir.joinpath(f"dummy-{self.suffix}.cfg")
+        self.folders = [self.service_dir]
+
+
+@pytest.fixture(autouse=True)
+def service_dir(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(instance_utils, "_instance_registry", {})
+    monkeypatch.setattr(Dummy, "service_dir", tmp_path)
+    monkeypatch.setattr(Dummy, "constructed", 0)
+    tmp_path.joinpath("dummy-1.service").write_text("[Service]\n")
+    return tmp_path
+
+
+def touch(file: Path) -> None:
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+
+def test_instance_is_reused(service_dir):
+    first = _get_registered_instance(Dummy, "1")
+    second = _get_registered_instance(Dummy, "1")
+
+    assert Dummy.constructed == 1
+    assert first == second
+
+
+def test_instance_is_rebuilt_on_change(service_dir):
+    _get_registered_instance(Dummy, "1")
+    touch(service_dir.joinpath("dummy-1.service"))
+    _get_registered_instance(Dummy, "1")
+    service_dir.joinpath("dummy-1.cfg").write_text("[server]\n")
+    _get_registered_instance(Dummy, "1")
+
+    assert Dummy.constructed == 3
+
+
+def test_instances_are_not_shared(service_dir):
+    first = _get_registered_instance(Dummy, "1")
+    first.cfg_file = Path("/modified.cfg")
+    first.folders.append(Path("/modified"))
+    second = _get_registered_instance(Dummy, "1")
+
+    assert Dummy.constructed == 1
+    assert second is not first
+    assert second.cfg_file == service_dir.joinpath("dummy-1.cfg")
+    assert second.folders == [service_dir]
@@ -0,0 +1,29 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import gc
+
+from benchmarks.bench_navigation import MAX_STACK_DEPTH, BenchMenu, navigate
+
+KEYS = 3000
+
+
+def test_navigation_stays_flat():
+    resumes = BenchMenu.resumes
+    navigation = navigate(KEYS)
+
+    assert navigation.keys == KEYS
+    # going back, failing options and resumed menus are part of the run
+    assert navigation.failures > 0
+    assert BenchMenu.resumes > resumes
+    assert max(navigation.stack_depths) <= MAX_STACK_DEPTH
+    assert min(navigation.call_depths) == max(navigation.call_depths)
+
+    # menus closed during the run are not kept alive by anything
+    gc.collect()
+    assert not any(isinstance(o, BenchMenu) for o in gc.get_objects())
@@ -0,0 +1,91 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import io
+import subprocess
+import sys
+import threading
+from contextlib import redirect_stdout
+
+from core.menus.renderer import CLEAR_SCREEN, ScreenRenderer
+
+
+class Terminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def draw_frame() -> None:
+    print("frame")
+
+
+def draw_next_frame() -> None:
+    print("next frame")
+
+
+def test_changed_frame_clears_screen():
+    renderer, terminal = ScreenRenderer(), Terminal()
+    with redirect_stdout(terminal):
+        renderer.render(renderer.compose(draw_frame))
+        assert renderer.render(renderer.compose(draw_next_frame))
+
+    assert terminal.getvalue() == f"frame\n{CLEAR_SCREEN}next frame\n"
+
+
+def test_unchanged_frame_is_skipped():
+    renderer, terminal = ScreenRenderer(), Terminal()
+    with redirect_stdout(terminal):
+        # the first frame doesn't start at the top of the screen
+        renderer.render(renderer.compose(draw_frame))
+        renderer.render(renderer.compose(draw_frame))
+        assert not renderer.render(renderer.compose(draw_frame))
+
+    assert terminal.getvalue().count("frame") == 2
+
+
+def test_compose_ignores_other_threads():
+    renderer, terminal = ScreenRenderer(), Terminal()
+
+    def draw() -> None:
+        thread = threading.Thread(target=print, args=("probe",))
+        thread.start()
+        thread.join()
+        draw_next_frame()
+
+    with redirect_stdout(terminal):
+        renderer.render(renderer.compose(draw_frame))
+        frame = renderer.compose(draw)
+        renderer.render(frame)
+
+    assert frame == "next frame\n"
+    # the output of the other thread must stay on the screen
+    assert terminal.getvalue() == "frame\nprobe\nnext frame\n"
+
+
+def test_output_of_option_keeps_screen():
+    renderer, terminal = ScreenRenderer(), Terminal()
+    with redirect_stdout(terminal):
+        renderer.render(renderer.compose(draw_frame))
+        with renderer.track_output():
+            print("installing ...")
+        renderer.render(renderer.compose(draw_frame))
+
+    assert terminal.getvalue() == "frame\ninstalling ...\nframe\n"
+
+
+def test_process_of_option_keeps_screen():
+    renderer, terminal = ScreenRenderer(), Terminal()
+    with redirect_stdout(terminal):
+        renderer.render(renderer.compose(draw_frame))
+        with renderer.track_output():
+            subprocess.run([sys.executable, "-c", ""], check=True)
+        renderer.render(renderer.compose(draw_frame))
+
+    assert terminal.getvalue() == "frame\nframe\n"
@@ -0,0 +1,85 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import io
+import threading
+import time
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterator
+
+import pytest
+from core.logger import Logger
+from core.services.status_collector import StatusCollector
+
+
+@pytest.fixture
+def hung() -> Iterator[threading.Event]:
+    # probes waiting for the event hang until the test ends
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def test_results_are_passed_to_callback():
+    collector = StatusCollector()
+    results: Dict[str, Any] = {}
+    assert collector.submit("a", lambda: 1)
+    assert collector.submit("b", lambda x: x, 2)
+
+    assert collector.collect(results.__setitem__, timeout=5)
+    assert results == {"a": 1, "b": 2}
+    assert collector.get("b") == 2
+
+
+def test_probe_messages_are_discarded():
+    def probe() -> int:
+        Logger.print_error("Error retrieving tags")
+        return 1
+
+    collector = StatusCollector()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        assert collector.submit("a", probe)
+        assert collector.collect(lambda name, result: None, timeout=5)
+        Logger.print_ok("menu output")
+
+    assert collector.get("a") == 1
+    assert "Error retrieving tags" not in output.getvalue()
+    assert "menu output" in output.getvalue()
+
+
+def test_pending_probe_is_not_submitted_twice(hung):
+    collector = StatusCollector()
+    assert collector.submit("a", hung.wait)
+    assert not collector.submit("a", hung.wait)
+
+
+def test_hung_probe_is_not_submitted_again(hung):
+    collector = StatusCollector(probe_timeout=0.05)
+    started = threading.Semaphore(0)
+
+    def probe() -> None:
+        started.release()
+        hung.wait()
+
+    assert collector.submit("a", probe)
+    assert started.acquire(timeout=5)
+    # the hung probe is dropped, but still blocks its worker
+    assert collector.collect(lambda name, result: None, timeout=5)
+    assert collector.is_abandoned("a")
+    assert not collector.submit("a", probe)
+    assert not started.acquire(timeout=0.1)
+
+    hung.set()
+    while collector.is_abandoned("a"):
+        time.sleep(0.01)
+    assert collector.submit("a", lambda: 2)
+    assert collector.collect(lambda name, result: None, timeout=5)
+    assert collector.get("a") == 2
@@ -0,0 +1,106 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from typing import Iterator
+
+import pytest
+from core.services import status_refresher
+from core.services.status_refresher import StatusRefresher
+
+# the refresher is a singleton, every test registers probes under new names
+_probe_ids = itertools.count()
+
+
+class BlockingProbe:
+    """Status probe returning the number of its run, which blocks until released"""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self) -> int:
+        self.runs += 1
+        run = self.runs
+        self.started.release()
+        self.release.wait()
+        return run
+
+
+@pytest.fixture
+def name() -> str:
+    return f"probe-{next(_probe_ids)}"
+
+
+@pytest.fixture
+def probe() -> Iterator[BlockingProbe]:
+    probe = BlockingProbe()
+    yield probe
+    probe.release.set()
+
+
+def test_probe_result_is_stored(name, probe):
+    refresher = StatusRefresher()
+    refresher.register(name, probe)
+
+    assert refresher.wait([name], timeout=5)
+    snapshot = refresher.get(name)
+    assert snapshot is not None and snapshot.value == 1 and not snapshot.stale
+
+
+def test_refresh_during_run_is_not_lost(name, probe, monkeypatch):
+    # the refresher thread must check for due probes while the probe runs
+    monkeypatch.setattr(status_refresher, "MAX_WAIT", 0.01)
+    refresher = StatusRefresher()
+    refresher.register(name, probe)
+    assert refresher.wait([name], timeout=5)
+    assert probe.started.acquire(timeout=5)
+
+    # the probe is started for the first refresh, the second refresh is
+    # requested while it is still running
+    probe.release.clear()
+    refresher.refresh()
+    assert probe.started.acquire(timeout=5)
+    refresher.refresh()
+    time.sleep(0.1)
+    probe.release.set()
+
+    # the result of the run started before the second refresh is discarded
+    assert refresher.wait([name], timeout=5, fresh=True)
+    snapshot = refresher.get(name)
+    assert snapshot is not None and snapshot.value == 3
+
+
+def test_wait_times_out(name, probe):
+    refresher = StatusRefresher()
+    probe.release.clear()
+    refresher.register(name, probe)
+
+    assert not refresher.wait([name], timeout=0.1)
+    assert refresher.get(name) is None
+
+
+def test_refresh_of_given_probes(name, probe):
+    refresher = StatusRefresher()
+    other = BlockingProbe()
+    refresher.register(name, probe, interval=status_refresher.REMOTE_INTERVAL)
+    refresher.register(f"{name}-other", other)
+    assert refresher.wait([name, f"{name}-other"], timeout=5)
+
+    # the probe with the remote interval is refreshed, although it is given alone
+    refresher.refresh(names=[name])
+    assert refresher.wait([name], timeout=5, fresh=True)
+    snapshot, other_snapshot = refresher.get(name), refresher.get(f"{name}-other")
+    assert snapshot is not None and snapshot.value == 2
+    assert other_snapshot is not None and not other_snapshot.stale
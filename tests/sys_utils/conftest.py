@@ -0,0 +1,89 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+import re
+import time
+from typing import Tuple
+
+import pytest
+from utils import sys_utils
+
+from tests.conftest import StubRequestHandler, StubServer
+
+CONTENT = bytes(range(256)) * 1024
+FILE_PATH = "/file.zip"
+
+
+class StubFileServer(StubServer):
+    """Local file server supporting range requests, which can fail on purpose"""
+
+    def __init__(self) -> None:
+        super().__init__(StubHandler)
+        self.content = CONTENT
+        self.etag = '"file-v1"'
+        self.supports_range = True
+        # close the connection of the next response after this many body bytes
+        self.drop_after: int | None = None
+        # content and ETag the file is replaced with once the connection dropped
+        self.replacement: Tuple[bytes, str] | None = None
+        # delay the body of the next response by this many seconds
+        self.stall = 0.0
+
+    @property
+    def url(self) -> str:
+        return self.url_for(FILE_PATH)
+
+
+class StubHandler(StubRequestHandler):
+    server: StubFileServer
+
+    def do_GET(self) -> None:
+        stub = self.server
+        self.record_request()
+        if self.path != FILE_PATH:
+            self.send_error(404)
+            return
+
+        start = 0
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if match and stub.supports_range and if_range in (None, stub.etag):
+            start = int(match.group(1))
+
+        body = stub.content[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", stub.etag)
+        self.send_header("Content-Length", str(len(body)))
+        if start:
+            total = len(stub.content)
+            self.send_header("Content-Range", f"bytes {start}-{total - 1}/{total}")
+        self.end_headers()
+
+        stall, stub.stall = stub.stall, 0.0
+        time.sleep(stall)
+        drop_after, stub.drop_after = stub.drop_after, None
+        if drop_after is not None:
+            self.wfile.write(body[:drop_after])
+            self.close_connection = True
+            if stub.replacement is not None:
+                stub.content, stub.etag = stub.replacement
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def file_server(start_stub_server) -> StubFileServer:
+    server: StubFileServer = start_stub_server(StubFileServer())
+    return server
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch) -> None:
+    monkeypatch.setattr(sys_utils, "DOWNLOAD_BACKOFF", 0.0)
@@ -0,0 +1,113 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+import hashlib
+import io
+import time
+import urllib.error
+from zipfile import ZipFile
+
+import pytest
+from utils.sys_utils import (
+    DownloadVerificationFailedException,
+    download_file,
+    download_to_buffer,
+)
+
+from tests.sys_utils.conftest import CONTENT
+
+
+def test_download(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    download_file(file_server.url, target, show_progress=False, expected_sha256=sha256)
+
+    assert target.read_bytes() == CONTENT
+    assert len(file_server.requests) == 1
+
+
+def test_dropped_connection_is_resumed(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    file_server.drop_after = 100_000
+    download_file(file_server.url, target, show_progress=False)
+
+    assert target.read_bytes() == CONTENT
+    assert len(file_server.requests) == 2
+    resumed = file_server.requests[1]
+    assert resumed["range"] == "bytes=100000-"
+    assert resumed["if-range"] == file_server.etag
+
+
+def test_download_restarts_without_range_support(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    file_server.supports_range = False
+    file_server.drop_after = 100_000
+    download_file(file_server.url, target, show_progress=False)
+
+    assert target.read_bytes() == CONTENT
+    assert len(file_server.requests) == 2
+
+
+def test_download_restarts_if_file_changed(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    file_server.drop_after = 100_000
+    file_server.replacement = (CONTENT[::-1], '"file-v2"')
+    download_file(file_server.url, target, show_progress=False)
+
+    assert target.read_bytes() == CONTENT[::-1]
+    assert len(file_server.requests) == 2
+
+
+def test_read_timeout_is_retried(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    file_server.stall = 2.0
+
+    start = time.monotonic()
+    download_file(file_server.url, target, show_progress=False, read_timeout=0.2)
+    assert time.monotonic() - start < 1.0
+    assert target.read_bytes() == CONTENT
+    assert len(file_server.requests) == 2
+
+
+def test_failed_download_is_removed(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    file_server.stall = 2.0
+
+    with pytest.raises(OSError):
+        download_file(
+            file_server.url, target, show_progress=False, read_timeout=0.1, retries=0
+        )
+    assert not target.exists()
+
+
+def test_checksum_mismatch(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    with pytest.raises(DownloadVerificationFailedException):
+        download_file(
+            file_server.url, target, show_progress=False, expected_sha256="0" * 64
+        )
+    assert not target.exists()
+
+
+def test_client_error_is_not_retried(file_server, tmp_path):
+    target = tmp_path.joinpath("file.zip")
+    with pytest.raises(urllib.error.HTTPError):
+        download_file(f"{file_server.url}.missing", target, show_progress=False)
+    assert len(file_server.requests) == 1
+
+
+def test_download_to_buffer_is_a_zip_file(file_server):
+    archive = io.BytesIO()
+    with ZipFile(archive, "w") as _zip:
+        _zip.writestr("index.html", b"<html></html>")
+    file_server.content = archive.getvalue()
+
+    with download_to_buffer(file_server.url, show_progress=False) as buffer:
+        with ZipFile(buffer) as _zip:
+            assert _zip.namelist() == ["index.html"]
+            assert _zip.read("index.html") == b"<html></html>"
@@ -0,0 +1,116 @@
+# ======================================================================= #
+#  Copyright (C) 2020 - 2025 Dominik Willner <th33xitus@gmail.com>        #
+#                                                                         #
+#  This file is part of KIAUH - Klipper Installation And Update Helper    #
+#  https://github.com/dw-0/kiauh                                          #
+#                                                                         #
+#  This file may be distributed under the terms of the GNU GPLv3 license  #
+# ======================================================================= #
+from __future__ import annotations
+
+from pathlib import Path
+from subprocess import CalledProcessError, CompletedProcess
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+from core.instance_manager.instance_manager import InstanceManager
+from utils import sys_utils
+from utils.sys_utils import cmd_sysctl_services
+
+UNITS = ["klipper-1.service", "klipper-2.service"]
+
+
+class FakeSystemctl:
+    """Stand-in for systemctl, units settle after a number of list-jobs calls"""
+
+    def __init__(self) -> None:
+        self.commands: List[List[str]] = []
+        self.states: Dict[str, str] = {}
+        self.returncode = 0
+        self.stderr = b""
+        # remaining list-jobs calls until the job of a unit is done
+        self.jobs: Dict[str, int] = {}
+        # state of a unit once its job is done
+        self.settled: Dict[str, str] = {}
+
+    def __call__(self, cmd: List[str], **kwargs) -> CompletedProcess:
+        self.commands.append(cmd)
+        stdout = b""
+        if cmd[:2] == ["sudo", "systemctl"]:
+            for unit in cmd[3:]:
+                if unit == "--no-block":
+                    continue
+                self.states[unit] = self.settled.get(unit, "active")
+                if "--no-block" in cmd and self.jobs.get(unit):
+                    self.states[unit] = "activating"
+            return CompletedProcess(cmd, self.returncode, b"", self.stderr)
+        if cmd[1] == "list-jobs":
+            lines = []
+            for unit, remaining in self.jobs.items():
+                if remaining:
+                    lines.append(f"1 {unit} start running")
+                    self.jobs[unit] -= 1
+                else:
+                    self.states[unit] = self.settled.get(unit, "active")
+            stdout = "\n".join(lines).encode()
+        elif cmd[1] == "is-active":
+            stdout = "\n".join(self.states[unit] for unit in cmd[2:]).encode()
+        return CompletedProcess(cmd, 0, stdout, b"")
+
+    def count(self, command: str) -> int:
+        return sum(command in cmd for cmd in self.commands)
+
+
+@pytest.fixture
+def systemctl(monkeypatch) -> FakeSystemctl:
+    systemctl = FakeSystemctl()
+    monkeypatch.setattr(sys_utils, "run", systemctl)
+    monkeypatch.setattr(sys_utils, "SYSCTL_POLL_INTERVAL", 0.0)
+    return systemctl
+
+
+def test_single_call_for_all_units(systemctl):
+    results = cmd_sysctl_services(UNITS, "restart")
+
+    assert systemctl.commands == [["sudo", "systemctl", "restart", *UNITS]]
+    assert [(r.unit, r.success, r.error) for r in results] == [
+        (UNITS[0], True, ""),
+        (UNITS[1], True, ""),
+    ]
+
+
+def test_partial_failure(systemctl):
+    systemctl.returncode = 1
+    systemctl.stderr = b"Job for klipper-2.service failed."
+    systemctl.settled[UNITS[1]] = "failed"
+    instances = [SimpleNamespace(service_file_path=Path(unit)) for unit in UNITS]
+
+    with pytest.raises(CalledProcessError) as e:
+        InstanceManager.restart_all(instances)
+
+    # every unit received the action, only the failed one is reported
+    assert systemctl.count("restart") == 1
+    assert e.value.cmd == ["systemctl", "restart", UNITS[1]]
+    assert e.value.stderr == "Job for klipper-2.service failed."
+
+
+def test_no_block_waits_for_units(systemctl):
+    systemctl.jobs = {UNITS[0]: 1, UNITS[1]: 3}
+    results = cmd_sysctl_services(UNITS, "start", no_block=True)
+
+    assert systemctl.commands[0] == ["sudo", "systemctl", "start", "--no-block", *UNITS]
+    # polled until the job of the slower unit was done
+    assert systemctl.count("list-jobs") == 4
+    assert all(r.success for r in results)
+    assert results[0].duration <= results[1].duration
+
+
+def test_no_block_times_out(systemctl):
+    systemctl.jobs = {UNITS[0]: 0, UNITS[1]: 1000}
+    results = cmd_sysctl_services(UNITS, "start", no_block=True, timeout=0.0)
+
+    assert systemctl.count("list-jobs") == 1
+    assert results[0].success
+    assert not results[1].success
+    assert results[1].error == "unit is activating"